@@ -0,0 +1,63 @@
+"""Short-lived cache of read results."""
+
+import asyncio
+import time
+
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class ReadCache:
+    """Caches awaited results for a fixed time and deduplicates concurrent reads of the same key.
+
+    Results of reads which started before an eviction are not cached, as they may be stale."""
+
+    def __init__(self, ttl: float, max_size: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__entries: dict[Hashable, tuple[float, Any]] = {}
+        self.__pending: dict[tuple[Hashable, int], asyncio.Future[Any]] = {}
+        # Incremented on every eviction
+        self.__generation = 0
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result for the key, fetching it if it is missing or expired."""
+        entry = self.__entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        generation = self.__generation
+        pending_key = (key, generation)
+        pending = self.__pending.get(pending_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[pending_key] = future
+        try:
+            result = await fetch()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Prevent 'exception was never retrieved' warnings when nobody else waited
+                _ = future.exception()
+            raise
+        finally:
+            del self.__pending[pending_key]
+
+        if generation != self.__generation:
+            future.set_result(result)
+            return result
+        if len(self.__entries) >= self.max_size:
+            # Drop the oldest entry, dictionaries preserve insertion order
+            self.__entries.pop(next(iter(self.__entries)))
+        self.__entries[key] = (time.monotonic() + self.ttl, result)
+        future.set_result(result)
+        return result
+
+    def evict(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove every cached result whose key matches the predicate."""
+        self.__generation += 1
+        for key in [key for key in self.__entries if predicate(key)]:
+            del self.__entries[key]
@@ -0,0 +1,60 @@
+"""Health of the bot clusters, pushed by every cluster."""
+
+import time
+import uuid
+
+from faststream.rabbit import ExchangeType, RabbitBroker, RabbitExchange, RabbitQueue
+from typing import Any
+
+# Fanout exchange over which every bot cluster periodically pushes its health
+CLUSTER_HEALTH_EXCHANGE = RabbitExchange("bot.clusters", type=ExchangeType.FANOUT)
+
+
+class ClusterRegistry:
+    """Latest health of every bot cluster.
+
+    A cluster which has not pushed its health for longer than the stale interval is reported as stale."""
+
+    def __init__(self, cluster_count: int = 1, stale_after: float = 45.0) -> None:
+        self.cluster_count = cluster_count
+        self.stale_after = stale_after
+        # Latest health of a cluster with the monotonic time it was received at
+        self.__health: dict[int, tuple[float, dict[str, Any]]] = {}
+
+    def apply(self, payload: dict[str, Any]) -> None:
+        """Store the health pushed by a cluster."""
+        self.__health[payload["cluster_id"]] = (time.monotonic(), payload)
+
+    def get_status(self, cluster_id: int) -> str:
+        """Return the status of the cluster."""
+        entry = self.__health.get(cluster_id)
+        if entry is None:
+            return "missing"
+        received_at, health = entry
+        if health["stopping"]:
+            return "stopped"
+        if time.monotonic() - received_at > self.stale_after:
+            return "stale"
+        if not health["ready"]:
+            return "starting"
+        return "ok"
+
+    def get_clusters(self) -> list[dict[str, Any]]:
+        """Return the latest health of every expected cluster and of every cluster that has reported."""
+        cluster_ids = sorted(set(range(self.cluster_count)) | self.__health.keys())
+        clusters: list[dict[str, Any]] = []
+        for cluster_id in cluster_ids:
+            entry = self.__health.get(cluster_id)
+            health = entry[1] if entry is not None else {"cluster_id": cluster_id}
+            clusters.append({**health, "status": self.get_status(cluster_id)})
+        return clusters
+
+
+def subscribe_cluster_health(broker: RabbitBroker, registry: ClusterRegistry) -> None:
+    """Keep the registry up to date with the health pushed by the bot clusters."""
+    # Every API process needs its own queue to receive every message
+    queue = RabbitQueue(f"api.clusters.{uuid.uuid4().hex}", exclusive=True, auto_delete=True)
+
+    @broker.subscriber(queue, CLUSTER_HEALTH_EXCHANGE)
+    async def handle_cluster_health(payload: dict[str, Any]) -> None:
+        registry.apply(payload)
@@ -0,0 +1,174 @@
+"""Read-only PostgreSQL access to the bot database."""
+
+import base64
+import json
+
+from sqlalchemy import ARRAY, BigInteger, Boolean, Column, MetaData, Table, Text, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from typing import Any
+
+from .config import settings
+
+metadata = MetaData()
+
+# Subsets of the tables managed by the bot migrations, only the columns served by the API are declared
+user_levels = Table(
+    "UserLevels",
+    metadata,
+    Column("id", BigInteger, primary_key=True),
+    Column("guild_id", BigInteger),
+    Column("user_id", BigInteger),
+    Column("total_xp", BigInteger),
+    Column("current_xp", BigInteger),
+    Column("xp_to_next_level", BigInteger),
+    Column("level", BigInteger),
+)
+
+tags = Table(
+    "Tags",
+    metadata,
+    Column("id", BigInteger, primary_key=True),
+    Column("guild_id", BigInteger),
+    Column("name", Text),
+    Column("aliases", ARRAY(Text)),
+    Column("locked", Boolean),
+)
+
+punishments = Table(
+    "Punishments",
+    metadata,
+    Column("id", BigInteger, primary_key=True),
+    Column("type", Text),
+    Column("guild_id", BigInteger),
+    Column("moderator_id", BigInteger),
+    Column("visible", Boolean),
+)
+
+_engine: AsyncEngine | None = None
+
+
+class DatabaseNotConfigured(Exception):
+    """Raised when no database DSN is configured."""
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor was not issued by the API."""
+
+
+def get_engine() -> AsyncEngine:
+    """Get the engine of the read-only connection pool, creating it on first use."""
+    global _engine
+    if _engine is None:
+        dsn = settings.POSTGRES_REPLICA_DSN or settings.POSTGRES_DSN
+        if not dsn:
+            raise DatabaseNotConfigured("Database access is not configured")
+        _engine = create_async_engine(
+            dsn,
+            pool_size=settings.POSTGRES_POOL_SIZE,
+            pool_pre_ping=True,
+            # Every transaction of the pool is read-only, even against the primary
+            connect_args={"server_settings": {"default_transaction_read_only": "on"}},
+        )
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Close every connection of the pool."""
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset pagination values into an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, *types: type) -> list[Any]:
+    """Decode an opaque cursor into keyset pagination values of the specified types."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except ValueError:
+        raise InvalidCursor("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursor("Invalid cursor")
+    for value, expected in zip(values, types):
+        # Booleans are integers as far as isinstance is concerned
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise InvalidCursor("Invalid cursor")
+        # Keys are compared against BIGINT columns
+        if isinstance(value, int) and not -2**63 <= value < 2**63:
+            raise InvalidCursor("Invalid cursor")
+    return values
+
+
+async def fetch_leaderboard(guild_id: int, limit: int, cursor: str | None) -> dict[str, Any]:
+    """Fetch a page of the guild level leaderboard, ordered by total XP like the bot does."""
+    query = (
+        select(
+            user_levels.c.id, user_levels.c.user_id, user_levels.c.total_xp,
+            user_levels.c.current_xp, user_levels.c.xp_to_next_level, user_levels.c.level,
+        )
+        .where(user_levels.c.guild_id == guild_id)
+        # ID breaks ties between equal XP so that pages never overlap
+        .order_by(user_levels.c.total_xp.desc(), user_levels.c.id.asc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        total_xp, row_id = decode_cursor(cursor, int, int)
+        query = query.where(
+            (user_levels.c.total_xp < total_xp)
+            | ((user_levels.c.total_xp == total_xp) & (user_levels.c.id > row_id))
+        )
+
+    async with get_engine().connect() as connection:
+        rows = (await connection.execute(query)).mappings().all()
+
+    page = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1]["total_xp"], page[-1]["id"])
+    return {"data": page, "next_cursor": next_cursor}
+
+
+async def fetch_guild_tags(guild_id: int, limit: int, cursor: str | None) -> dict[str, Any]:
+    """Fetch a page of guild tags, ordered by case-insensitive name like the bot does."""
+    lower_name = func.lower(tags.c.name)
+    query = (
+        select(tags.c.id, tags.c.name, tags.c.aliases, tags.c.locked, lower_name.label("sort_name"))
+        .where(tags.c.guild_id == guild_id)
+        .order_by(lower_name.asc(), tags.c.id.asc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        sort_name, row_id = decode_cursor(cursor, str, int)
+        query = query.where(tuple_(lower_name, tags.c.id) > tuple_(sort_name, row_id))
+
+    async with get_engine().connect() as connection:
+        rows = (await connection.execute(query)).mappings().all()
+
+    page = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1]["sort_name"], page[-1]["id"])
+    for tag in page:
+        del tag["sort_name"]
+    return {"data": page, "next_cursor": next_cursor}
+
+
+async def fetch_moderation_statistics(guild_id: int, moderator_id: int | None) -> dict[str, Any]:
+    """Fetch visible punishment counts of the guild by type, optionally only for a single moderator."""
+    query = (
+        select(punishments.c.type, func.count())
+        .where(punishments.c.guild_id == guild_id, punishments.c.visible.is_(True))
+        .group_by(punishments.c.type)
+    )
+    if moderator_id is not None:
+        query = query.where(punishments.c.moderator_id == moderator_id)
+
+    async with get_engine().connect() as connection:
+        rows = (await connection.execute(query)).all()
+
+    counts = {punishment_type: count for punishment_type, count in rows}
+    return {"total": sum(counts.values()), "types": counts}
@@ -2,12 +2,48 @@
 
 from faststream.rabbit import RabbitBroker
 
+from .cache import ReadCache
+from .clusters import ClusterRegistry, subscribe_cluster_health
 from .config import settings
+from .events import EventHub, subscribe_bot_events
+from .invalidations import subscribe_invalidations
+from .snapshot import GuildSnapshot, subscribe_guild_events
 
 # Initialize RabbitMQ broker
 broker = RabbitBroker(url=settings.RABBITMQ_URL)
 
+# Guild snapshot pushed by the bot clusters
+guild_snapshot = GuildSnapshot(settings.BOT_CLUSTER_COUNT)
+subscribe_guild_events(broker, guild_snapshot)
+
+# Health pushed by the bot clusters
+cluster_registry = ClusterRegistry(settings.BOT_CLUSTER_COUNT)
+subscribe_cluster_health(broker, cluster_registry)
+
+# Live bot events, fanned out to stream clients
+event_hub = EventHub()
+subscribe_bot_events(broker, event_hub)
+
+# Results of the guild data routes, evicted when the bot writes the data
+read_cache = ReadCache(ttl=settings.READ_CACHE_TTL)
+subscribe_invalidations(broker, read_cache)
+
 
 async def get_broker() -> RabbitBroker:
     """Get the RabbitMQ broker instance."""
     return broker
+
+
+async def get_guild_snapshot() -> GuildSnapshot:
+    """Get the local guild snapshot."""
+    return guild_snapshot
+
+
+async def get_cluster_registry() -> ClusterRegistry:
+    """Get the bot cluster health registry."""
+    return cluster_registry
+
+
+async def get_event_hub() -> EventHub:
+    """Get the bot event hub."""
+    return event_hub
@@ -0,0 +1,74 @@
+"""Fan-out of bot events to connected stream clients."""
+
+import asyncio
+import logging
+import uuid
+
+from faststream.rabbit import ExchangeType, RabbitBroker, RabbitExchange, RabbitQueue
+from typing import Any
+
+logger = logging.getLogger("api.events")
+
+# Fanout exchange over which the bot pushes batches of events
+EVENTS_EXCHANGE = RabbitExchange("bot.events", type=ExchangeType.FANOUT)
+
+
+class EventSubscription:
+    """A single stream client, receiving events of the selected guilds."""
+
+    def __init__(self, guild_ids: set[int] | None, max_queue_size: int) -> None:
+        self.guild_ids = guild_ids
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=max_queue_size)
+        self.overflowed = False
+
+    def wants(self, event: dict[str, Any]) -> bool:
+        """Whether the client is interested in the event."""
+        return self.guild_ids is None or event.get("guild_id") in self.guild_ids
+
+
+class EventHub:
+    """Distributes bot events to every subscribed stream client.
+
+    Each client has a bounded queue. A client that does not keep up is marked as overflowed
+    and disconnected, instead of slowing down delivery to every other client."""
+
+    def __init__(self, max_queue_size: int = 256) -> None:
+        self.max_queue_size = max_queue_size
+        self.__subscriptions: set[EventSubscription] = set()
+
+    def __len__(self) -> int:
+        return len(self.__subscriptions)
+
+    def subscribe(self, guild_ids: set[int] | None = None) -> EventSubscription:
+        """Register a new client, receiving events of the specified guilds or every event if none are specified."""
+        subscription = EventSubscription(guild_ids, self.max_queue_size)
+        self.__subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        """Remove a client."""
+        self.__subscriptions.discard(subscription)
+
+    def dispatch(self, events: list[dict[str, Any]]) -> None:
+        """Queue the events for every interested client."""
+        for subscription in list(self.__subscriptions):
+            for event in events:
+                if not subscription.wants(event):
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    logger.warning("Disconnecting an event stream client which does not keep up")
+                    subscription.overflowed = True
+                    self.unsubscribe(subscription)
+                    break
+
+
+def subscribe_bot_events(broker: RabbitBroker, hub: EventHub) -> None:
+    """Dispatch the event batches published by the bot to the hub."""
+    # Every API process needs its own queue to receive every event
+    queue = RabbitQueue(f"api.events.{uuid.uuid4().hex}", exclusive=True, auto_delete=True)
+
+    @broker.subscriber(queue, EVENTS_EXCHANGE)
+    async def handle_bot_events(payload: dict[str, Any]) -> None:
+        hub.dispatch(payload["events"])
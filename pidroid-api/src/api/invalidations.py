@@ -0,0 +1,29 @@
+"""Invalidations of cached data, pushed by every bot process after it writes the data."""
+
+import uuid
+
+from faststream.rabbit import ExchangeType, RabbitBroker, RabbitExchange, RabbitQueue
+from typing import Any, Hashable
+
+from .cache import ReadCache
+
+# Fanout exchange over which every bot process announces the cached data it has written
+INVALIDATIONS_EXCHANGE = RabbitExchange("bot.invalidations", type=ExchangeType.FANOUT)
+
+
+def matches(payload: dict[str, Any], key: Hashable) -> bool:
+    """Return whether the invalidation covers the read cache key."""
+    if not isinstance(key, tuple) or len(key) < 2:
+        return False
+    scope, guild_id = key[0], key[1]
+    return scope == payload["scope"] and guild_id == payload["guild_id"]
+
+
+def subscribe_invalidations(broker: RabbitBroker, cache: ReadCache) -> None:
+    """Evict the data written by the bot from the read cache."""
+    # Every API process needs its own queue to receive every message
+    queue = RabbitQueue(f"api.invalidations.{uuid.uuid4().hex}", exclusive=True, auto_delete=True)
+
+    @broker.subscriber(queue, INVALIDATIONS_EXCHANGE)
+    async def handle_invalidation(payload: dict[str, Any]) -> None:
+        cache.evict(lambda key: matches(payload, key))
@@ -1,5 +1,6 @@
 """Main FastAPI application."""
 
+import logging
 import uvicorn
 
 from contextlib import asynccontextmanager
@@ -7,16 +8,26 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
-from .dependencies import broker
-from .routes import health, bot
+from .database import dispose_engine
+from .dependencies import broker, guild_snapshot
+from .routes import health, bot, events, guilds, metrics
+from .snapshot import refresh_guild_snapshot
+
+logger = logging.getLogger("api.main")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context for FastAPI app to manage RabbitMQ broker."""
     await broker.start()
+    try:
+        await refresh_guild_snapshot(broker, guild_snapshot)
+    except Exception:
+        # The snapshot will be pushed by the bot or requested on the first query
+        logger.warning("Failed to fetch the initial guild snapshot", exc_info=True)
     yield
     await broker.stop()
+    await dispose_engine()
 
 
 def create_app() -> FastAPI:
@@ -40,6 +51,9 @@ def create_app() -> FastAPI:
     # Include routers
     app.include_router(health.router)
     app.include_router(bot.router)
+    app.include_router(guilds.router)
+    app.include_router(events.router)
+    app.include_router(metrics.router)
 
     return app
 
@@ -0,0 +1,78 @@
+"""Rendering of the bot metrics in the Prometheus text exposition format."""
+
+import asyncio
+import json
+
+from faststream.rabbit import RabbitBroker
+from typing import Any
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def _query_cluster_metrics(broker: RabbitBroker, cluster_id: int) -> list[dict[str, Any]]:
+    result = await broker.request(
+        None,
+        f"bot.query_metrics.{cluster_id}",
+        timeout=5.0,
+    )
+    payload = json.loads(result.body.decode("utf-8"))
+    if not payload["ok"]:
+        raise RuntimeError(payload["error"])
+    return payload["metrics"]
+
+
+async def fetch_bot_metrics(broker: RabbitBroker, cluster_count: int = 1) -> list[dict[str, Any]]:
+    """Fetch the current metrics of every bot cluster via RPC.
+
+    Samples are labelled with the cluster they come from. Clusters which do not respond are left out,
+    unless none of them responds, in which case the first failure is raised."""
+    results = await asyncio.gather(
+        *(_query_cluster_metrics(broker, cluster_id) for cluster_id in range(cluster_count)),
+        return_exceptions=True
+    )
+    families: dict[str, dict[str, Any]] = {}
+    errors: list[BaseException] = []
+    for cluster_id, result in enumerate(results):
+        if isinstance(result, BaseException):
+            errors.append(result)
+            continue
+        for metric in result:
+            family = families.setdefault(metric["name"], {**metric, "samples": []})
+            family["samples"].extend(
+                {**sample, "labels": {"cluster": str(cluster_id), **sample["labels"]}}
+                for sample in metric["samples"]
+            )
+    if errors and not families:
+        raise errors[0]
+    return list(families.values())
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    return repr(float(value))
+
+
+def render_metrics(metrics: list[dict[str, Any]]) -> str:
+    """Render the metrics exported by the bot in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in metrics:
+        documentation = metric["documentation"].replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric['name']} {documentation}")
+        lines.append(f"# TYPE {metric['name']} {metric['type']}")
+        for sample in metric["samples"]:
+            labels = ",".join(
+                f'{name}="{_escape_label_value(str(value))}"' for name, value in sample["labels"].items()
+            )
+            if labels:
+                lines.append(f"{sample['name']}{{{labels}}} {_format_value(sample['value'])}")
+            else:
+                lines.append(f"{sample['name']} {_format_value(sample['value'])}")
+    return "\n".join(lines) + "\n"
@@ -1,12 +1,11 @@
 """Bot-related routes."""
 
-import json
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from faststream.rabbit import RabbitBroker
-from typing import Annotated, Any
+from typing import Annotated
 
-from ..dependencies import get_broker
+from ..dependencies import get_broker, get_guild_snapshot
+from ..snapshot import GuildSnapshot, refresh_guild_snapshot
 
 router = APIRouter(prefix="/bot", tags=["bot"])
 
@@ -14,26 +13,34 @@ router = APIRouter(prefix="/bot", tags=["bot"])
 @router.get(
     "/query-data",
     summary="Query bot data",
-    description="Query the bot for guild data via RPC",
+    description="Query guild data from the local snapshot pushed by the bot",
     response_description="Guild data from the bot",
 )
-async def query_data(broker: Annotated[RabbitBroker, Depends(get_broker)]) -> dict[str, Any]:
-    """Query the bot for guild data via FastStream RPC."""
-    try:
-        result = await broker.request(
-            None,
-            "bot.query_data",
-            timeout=5.0,
-        )
-        print("Bot response:", result)
-        return json.loads(result.body.decode("utf-8"))
-    except TimeoutError:
-        raise HTTPException(
-            status_code=504,
-            detail="Bot response timeout"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=503,
-            detail=str(e)
-        )
+async def query_data(
+    broker: Annotated[RabbitBroker, Depends(get_broker)],
+    snapshot: Annotated[GuildSnapshot, Depends(get_guild_snapshot)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Return guild data from the local snapshot, querying the bot clusters via RPC only at cold start.
+
+    If some clusters do not respond, the guilds of the other clusters are returned."""
+    if not snapshot.is_ready:
+        try:
+            await refresh_guild_snapshot(broker, snapshot, snapshot.missing_clusters)
+        except TimeoutError:
+            if snapshot.is_empty:
+                raise HTTPException(
+                    status_code=504,
+                    detail="Bot response timeout"
+                )
+        except Exception as e:
+            if snapshot.is_empty:
+                raise HTTPException(
+                    status_code=503,
+                    detail=str(e)
+                )
+
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if if_none_match == snapshot.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -0,0 +1,117 @@
+"""Live bot event stream routes."""
+
+import asyncio
+import json
+import secrets
+
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Any
+
+from ..config import settings
+from ..dependencies import get_event_hub
+from ..events import EventHub, EventSubscription
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Seconds of inactivity after which a keep-alive is sent
+HEARTBEAT_INTERVAL = 15.0
+
+
+def is_authorized(authorization: str | None, access_token: str | None) -> bool:
+    """Whether the client presented the event stream token, either as a bearer token or as a query parameter.
+
+    Browsers can not set headers on EventSource and WebSocket connections, hence the query parameter."""
+    if settings.EVENTS_TOKEN is None:
+        return False
+    token = access_token
+    if authorization is not None and authorization.startswith("Bearer "):
+        token = authorization.removeprefix("Bearer ")
+    return token is not None and secrets.compare_digest(token.encode(), settings.EVENTS_TOKEN.encode())
+
+
+async def iterate_events(subscription: EventSubscription) -> AsyncIterator[dict[str, Any] | None]:
+    """Yield the events of the subscription, or None when a keep-alive is due.
+
+    Stops once an overflowed subscription has been drained."""
+    while True:
+        if subscription.overflowed and subscription.queue.empty():
+            return
+        try:
+            yield await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_INTERVAL)
+        except TimeoutError:
+            yield None
+
+
+@router.get(
+    "/stream",
+    summary="Stream bot events",
+    description="Stream bot events as server-sent events, optionally only for the specified guilds. Requires the event stream token",
+    response_description="Stream of server-sent events",
+)
+async def stream_events(
+    hub: Annotated[EventHub, Depends(get_event_hub)],
+    guild_id: Annotated[list[int] | None, Query()] = None,
+    authorization: Annotated[str | None, Header()] = None,
+    access_token: Annotated[str | None, Query()] = None,
+) -> StreamingResponse:
+    """Stream bot events as server-sent events."""
+    if settings.EVENTS_TOKEN is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event stream is not configured"
+        )
+    if not is_authorized(authorization, access_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid event stream token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    subscription = hub.subscribe(set(guild_id) if guild_id else None)
+
+    async def generate() -> AsyncIterator[str]:
+        try:
+            async for event in iterate_events(subscription):
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event['name']}\ndata: {json.dumps(event)}\n\n"
+            yield "event: overflow\ndata: {}\n\n"
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    hub: Annotated[EventHub, Depends(get_event_hub)],
+    guild_id: Annotated[list[int] | None, Query()] = None,
+    authorization: Annotated[str | None, Header()] = None,
+    access_token: Annotated[str | None, Query()] = None,
+) -> None:
+    """Stream bot events over a WebSocket."""
+    if not is_authorized(authorization, access_token):
+        # Closing before accepting rejects the handshake
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscription = hub.subscribe(set(guild_id) if guild_id else None)
+    try:
+        async for event in iterate_events(subscription):
+            if event is None:
+                await websocket.send_json({"type": "keep-alive"})
+            else:
+                await websocket.send_json(event)
+        # 1013 asks the client to try again later
+        await websocket.close(code=1013, reason="Client did not keep up with the event stream")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,69 @@
+"""Guild data routes, served directly from the database."""
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Annotated, Any, Awaitable, Callable, Hashable
+
+from .. import database
+from ..dependencies import read_cache
+
+router = APIRouter(prefix="/guilds", tags=["guilds"])
+
+
+async def read(key: Hashable, fetch: Callable[[], Awaitable[dict[str, Any]]]) -> dict[str, Any]:
+    """Read through the cache, translating database errors to HTTP errors."""
+    try:
+        return await read_cache.get_or_fetch(key, fetch)
+    except database.DatabaseNotConfigured as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except database.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get(
+    "/{guild_id}/leaderboard",
+    summary="Guild level leaderboard",
+    description="Get a page of members of the guild ordered by their total XP",
+    response_description="Page of level information and the cursor of the next page",
+)
+async def get_leaderboard(
+    guild_id: int,
+    limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """Return a page of the guild level leaderboard."""
+    return await read(
+        ("leaderboard", guild_id, limit, cursor),
+        lambda: database.fetch_leaderboard(guild_id, limit, cursor),
+    )
+
+
+@router.get(
+    "/{guild_id}/tags",
+    summary="Guild tags",
+    description="Get a page of tags of the guild ordered by name",
+    response_description="Page of tags and the cursor of the next page",
+)
+async def get_tags(
+    guild_id: int,
+    limit: Annotated[int, Query(ge=1, le=100)] = 25,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """Return a page of guild tags."""
+    return await read(
+        ("tags", guild_id, limit, cursor),
+        lambda: database.fetch_guild_tags(guild_id, limit, cursor),
+    )
+
+
+@router.get(
+    "/{guild_id}/moderation-statistics",
+    summary="Guild moderation statistics",
+    description="Get the amount of visible cases in the guild by punishment type",
+    response_description="Total amount of cases and the amount of cases by type",
+)
+async def get_moderation_statistics(guild_id: int, moderator_id: int | None = None) -> dict[str, Any]:
+    """Return moderation statistics of the guild, optionally for a single moderator."""
+    return await read(
+        ("moderation-statistics", guild_id, moderator_id),
+        lambda: database.fetch_moderation_statistics(guild_id, moderator_id),
+    )
@@ -1,6 +1,10 @@
 """Health check routes."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from typing import Annotated, Any
+
+from ..clusters import ClusterRegistry
+from ..dependencies import get_cluster_registry
 
 router = APIRouter(tags=["health"])
 
@@ -14,3 +18,18 @@ router = APIRouter(tags=["health"])
 async def health_check() -> dict[str, str]:
     """Return the health status of the API."""
     return {"status": "ok"}
+
+
+@router.get(
+    "/health/clusters",
+    summary="Bot cluster health",
+    description="Check the latest health pushed by every bot cluster",
+    response_description="Health of every bot cluster",
+)
+async def cluster_health(
+    registry: Annotated[ClusterRegistry, Depends(get_cluster_registry)],
+) -> dict[str, Any]:
+    """Return the health of every bot cluster, with the overall status being ok only if every cluster is ok."""
+    clusters = registry.get_clusters()
+    status = "ok" if all(cluster["status"] == "ok" for cluster in clusters) else "degraded"
+    return {"status": status, "clusters": clusters}
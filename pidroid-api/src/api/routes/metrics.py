@@ -0,0 +1,36 @@
+"""Metrics routes."""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from faststream.rabbit import RabbitBroker
+from typing import Annotated
+
+from ..config import settings
+from ..dependencies import get_broker
+from ..metrics import CONTENT_TYPE, fetch_bot_metrics, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    summary="Bot metrics",
+    description="Query the runtime metrics of the bot in the Prometheus text exposition format",
+    response_description="Bot metrics",
+)
+async def metrics(
+    broker: Annotated[RabbitBroker, Depends(get_broker)],
+) -> Response:
+    """Return the runtime metrics of every bot cluster, queried via RPC on every scrape."""
+    try:
+        bot_metrics = await fetch_bot_metrics(broker, settings.BOT_CLUSTER_COUNT)
+    except TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="Bot response timeout"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e)
+        )
+    return Response(content=render_metrics(bot_metrics), media_type=CONTENT_TYPE)
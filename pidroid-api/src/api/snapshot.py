@@ -0,0 +1,155 @@
+"""Local snapshot of the guilds the bot is in."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+
+from collections.abc import Iterable
+from faststream.rabbit import ExchangeType, RabbitBroker, RabbitExchange, RabbitQueue
+from typing import Any
+
+logger = logging.getLogger("api.snapshot")
+
+# Fanout exchange over which the bot pushes guild snapshots and deltas
+GUILD_EVENTS_EXCHANGE = RabbitExchange("bot.guilds", type=ExchangeType.FANOUT)
+
+
+class ClusterGuilds:
+    """Guilds of a single bot cluster, with the epoch and version of the last applied change."""
+
+    def __init__(self, epoch: str, version: int, guilds: dict[int, dict[str, Any]]) -> None:
+        self.epoch = epoch
+        self.version = version
+        self.guilds = guilds
+
+
+class GuildSnapshot:
+    """In-memory copy of the bot guild list, kept up to date by pushed events.
+
+    Every bot cluster pushes the guilds it owns, which are versioned separately and combined here.
+    The serialized response and its ETag are rebuilt on every change,
+    so that serving the snapshot does not require any work."""
+
+    def __init__(self, cluster_count: int = 1) -> None:
+        self.cluster_count = cluster_count
+        self.__clusters: dict[int, ClusterGuilds] = {}
+        self.body = b""
+        self.etag = ""
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether a snapshot has been received from every cluster."""
+        return not self.missing_clusters
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether no snapshot has been received from any cluster."""
+        return not self.__clusters
+
+    @property
+    def missing_clusters(self) -> list[int]:
+        """IDs of the clusters which have not sent a snapshot yet."""
+        return [cluster_id for cluster_id in range(self.cluster_count) if cluster_id not in self.__clusters]
+
+    def __rebuild(self) -> None:
+        clusters = sorted(self.__clusters.items())
+        guilds = [guild for _, cluster in clusters for guild in cluster.guilds.values()]
+        self.body = json.dumps({"ok": True, "data": guilds}).encode("utf-8")
+        versions = ",".join(f"{cluster_id}:{cluster.epoch}-{cluster.version}" for cluster_id, cluster in clusters)
+        self.etag = f'"{hashlib.sha1(versions.encode("utf-8")).hexdigest()}"'
+
+    def apply_snapshot(self, payload: dict[str, Any]) -> None:
+        """Replace the guild list of a cluster with a full snapshot, unless it is older than the current one."""
+        current = self.__clusters.get(payload["cluster_id"])
+        if current is not None and payload["epoch"] == current.epoch and payload["version"] < current.version:
+            return
+        self.__clusters[payload["cluster_id"]] = ClusterGuilds(
+            payload["epoch"], payload["version"], {guild["id"]: guild for guild in payload["data"]}
+        )
+        self.__rebuild()
+
+    def apply_delta(self, payload: dict[str, Any]) -> bool:
+        """Apply a single guild change.
+
+        Returns False if a delta was missed and the snapshot of the cluster has to be refreshed."""
+        cluster = self.__clusters.get(payload["cluster_id"])
+        if cluster is None or payload["epoch"] != cluster.epoch:
+            return False
+        if payload["version"] <= cluster.version:
+            # Already included in the snapshot
+            return True
+        if payload["version"] != cluster.version + 1:
+            return False
+
+        guild = payload["guild"]
+        if payload["operation"] == "remove":
+            _ = cluster.guilds.pop(guild["id"], None)
+        else:
+            cluster.guilds[guild["id"]] = guild
+        cluster.version = payload["version"]
+        self.__rebuild()
+        return True
+
+
+async def _query_cluster_snapshot(broker: RabbitBroker, cluster_id: int) -> dict[str, Any]:
+    result = await broker.request(
+        None,
+        f"bot.query_data.{cluster_id}",
+        timeout=5.0,
+    )
+    payload = json.loads(result.body.decode("utf-8"))
+    if not payload["ok"]:
+        raise RuntimeError(payload["error"])
+    return payload
+
+
+async def refresh_guild_snapshot(
+    broker: RabbitBroker,
+    snapshot: GuildSnapshot,
+    cluster_ids: Iterable[int] | None = None
+) -> None:
+    """Fetch full snapshots from the bot clusters via RPC, from every cluster by default.
+
+    The snapshots of the clusters which answered are applied even if other clusters failed,
+    after which the first failure is raised."""
+    if cluster_ids is None:
+        cluster_ids = range(snapshot.cluster_count)
+    results = await asyncio.gather(
+        *(_query_cluster_snapshot(broker, cluster_id) for cluster_id in cluster_ids),
+        return_exceptions=True
+    )
+    errors: list[BaseException] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            errors.append(result)
+        else:
+            snapshot.apply_snapshot(result)
+    if errors:
+        raise errors[0]
+
+
+def subscribe_guild_events(broker: RabbitBroker, snapshot: GuildSnapshot) -> None:
+    """Keep the snapshot up to date with the guild events pushed by the bot."""
+    # Every API process needs its own queue to receive every event
+    queue = RabbitQueue(f"api.guilds.{uuid.uuid4().hex}", exclusive=True, auto_delete=True)
+    resyncing: set[int] = set()
+
+    async def resync(cluster_id: int) -> None:
+        if cluster_id in resyncing:
+            return
+        resyncing.add(cluster_id)
+        try:
+            await refresh_guild_snapshot(broker, snapshot, [cluster_id])
+        except Exception:
+            logger.exception(f"Failed to resynchronise guild snapshot of cluster {cluster_id}")
+        finally:
+            resyncing.discard(cluster_id)
+
+    @broker.subscriber(queue, GUILD_EVENTS_EXCHANGE)
+    async def handle_guild_event(payload: dict[str, Any]) -> None:
+        if payload["type"] == "snapshot":
+            snapshot.apply_snapshot(payload)
+        elif not snapshot.apply_delta(payload):
+            await resync(payload["cluster_id"])
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+from fastapi import HTTPException
+
+from api.config import settings
+from api.events import EventHub
+from api.routes.events import is_authorized, stream_events, websocket_events
+
+
+class FakeWebSocket:
+    def __init__(self) -> None:
+        self.accepted = False
+        self.close_code: int | None = None
+
+    async def accept(self) -> None:
+        self.accepted = True
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.close_code = code
+
+
+def test_is_authorized(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "EVENTS_TOKEN", None)
+    # Without a configured token, nobody is authorized
+    assert not is_authorized(None, None)
+    assert not is_authorized("Bearer ", "")
+
+    monkeypatch.setattr(settings, "EVENTS_TOKEN", "secret")
+    assert is_authorized("Bearer secret", None)
+    assert is_authorized(None, "secret")
+    assert not is_authorized("Bearer wrong", "secret")
+    assert not is_authorized("secret", None)
+    assert not is_authorized(None, None)
+
+
+def test_stream_requires_token(monkeypatch: pytest.MonkeyPatch):
+    hub = EventHub()
+
+    async def run(authorization: str | None) -> int:
+        try:
+            await stream_events(hub, None, authorization, None)
+        except HTTPException as e:
+            return e.status_code
+        return 200
+
+    monkeypatch.setattr(settings, "EVENTS_TOKEN", None)
+    assert asyncio.run(run("Bearer secret")) == 503
+
+    monkeypatch.setattr(settings, "EVENTS_TOKEN", "secret")
+    assert asyncio.run(run(None)) == 401
+    assert asyncio.run(run("Bearer wrong")) == 401
+    assert len(hub) == 0
+
+
+def test_websocket_requires_token(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "EVENTS_TOKEN", "secret")
+    hub = EventHub()
+    websocket = FakeWebSocket()
+    asyncio.run(websocket_events(websocket, hub, None, None, "wrong")) # pyright: ignore[reportArgumentType]
+    assert not websocket.accepted
+    assert websocket.close_code == 1008
+    assert len(hub) == 0
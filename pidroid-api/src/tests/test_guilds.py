@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import StaticPool
+from typing import Any
+
+from api import database
+from api.cache import ReadCache
+from api.database import InvalidCursor, decode_cursor, encode_cursor
+from api.routes import guilds
+
+
+class FakeConnection:
+    """Runs the queries of the API against a synchronous SQLite connection."""
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+
+    async def __aenter__(self) -> "FakeConnection":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.connection.close()
+
+    async def execute(self, query: Any) -> Any:
+        return self.connection.execute(query)
+
+
+class FakeEngine:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def connect(self) -> FakeConnection:
+        return FakeConnection(self.engine.connect())
+
+
+@pytest.fixture
+def engine(monkeypatch: pytest.MonkeyPatch) -> Engine:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        database.user_levels.create(connection)
+        # SQLite has no arrays, the aliases are not selected by these tests
+        _ = connection.execute(text(
+            'CREATE TABLE "Tags" (id INTEGER PRIMARY KEY, guild_id INTEGER, name TEXT, aliases TEXT, locked BOOLEAN)'
+        ))
+    fake = FakeEngine(engine)
+    monkeypatch.setattr(database, "get_engine", lambda: fake)
+    monkeypatch.setattr(guilds, "read_cache", ReadCache(ttl=60))
+    return engine
+
+
+def add_levels(engine: Engine, rows: list[tuple[int, int, int]]) -> None:
+    with engine.begin() as connection:
+        _ = connection.execute(insert(database.user_levels), [
+            {"id": row_id, "guild_id": guild_id, "user_id": row_id, "total_xp": total_xp,
+             "current_xp": 0, "xp_to_next_level": 100, "level": 0}
+            for row_id, guild_id, total_xp in rows
+        ])
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(1500, 42), int, int) == [1500, 42]
+    assert decode_cursor(encode_cursor("road pack", 7), str, int) == ["road pack", 7]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    "ünicode",
+    encode_cursor(1500),
+    encode_cursor(1500, 42, 1),
+    encode_cursor("1500", 42),
+    encode_cursor(1500, None),
+    encode_cursor(True, 42),
+    encode_cursor(1.5, 42),
+    encode_cursor(2**63, 42),
+    encode_cursor([1500], 42),
+])
+def test_invalid_cursors(cursor: str):
+    with pytest.raises(InvalidCursor):
+        _ = decode_cursor(cursor, int, int)
+
+
+def test_invalid_cursor_is_bad_request(engine: Engine):
+    with pytest.raises(HTTPException) as info:
+        asyncio.run(guilds.get_leaderboard(1, 10, encode_cursor("1500", 42)))
+    assert info.value.status_code == 400
+
+
+def test_leaderboard_pages(engine: Engine):
+    # Ties on total XP are broken by ID, the other guild is never returned
+    add_levels(engine, [(1, 1, 300), (2, 1, 200), (3, 1, 200), (4, 1, 200), (5, 1, 100), (6, 2, 1000)])
+
+    async def collect(limit: int) -> list[list[int]]:
+        pages: list[list[int]] = []
+        cursor = None
+        while True:
+            page = await guilds.get_leaderboard(1, limit, cursor)
+            pages.append([row["id"] for row in page["data"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return pages
+
+    assert asyncio.run(collect(2)) == [[1, 2], [3, 4], [5]]
+    # A page which ends exactly at the last row has no next page
+    assert asyncio.run(collect(5)) == [[1, 2, 3, 4, 5]]
+    assert asyncio.run(collect(100)) == [[1, 2, 3, 4, 5]]
+
+
+def test_tag_pages(engine: Engine):
+    with engine.begin() as connection:
+        _ = connection.execute(text(
+            "INSERT INTO \"Tags\" (id, guild_id, name, locked) VALUES "
+            "(1, 1, 'beta', 0), (2, 1, 'Alpha', 0), (3, 1, 'alpha', 1), (4, 1, 'Gamma', 0)"
+        ))
+
+    async def run():
+        first = await guilds.get_tags(1, 2, None)
+        assert [tag["id"] for tag in first["data"]] == [2, 3]
+        assert "sort_name" not in first["data"][0]
+        second = await guilds.get_tags(1, 2, first["next_cursor"])
+        assert [tag["id"] for tag in second["data"]] == [1, 4]
+        assert second["next_cursor"] is None
+
+    asyncio.run(run())
+
+
+def test_pages_are_cached(engine: Engine):
+    add_levels(engine, [(1, 1, 300)])
+
+    async def run():
+        first = await guilds.get_leaderboard(1, 10, None)
+        add_levels(engine, [(2, 1, 400)])
+        # The cached page is returned until it expires or is evicted
+        assert await guilds.get_leaderboard(1, 10, None) == first
+        assert len((await guilds.get_leaderboard(1, 5, None))["data"]) == 2
+
+        guilds.read_cache.evict(lambda key: isinstance(key, tuple) and key[:2] == ("leaderboard", 1))
+        assert [row["id"] for row in (await guilds.get_leaderboard(1, 10, None))["data"]] == [2, 1]
+
+    asyncio.run(run())
+
+
+def test_read_cache_deduplicates_reads():
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        cache = ReadCache(ttl=60)
+        assert await asyncio.gather(*[cache.get_or_fetch("key", fetch) for _ in range(5)]) == [1] * 5
+
+        # A read which started before an eviction is not cached
+        read = asyncio.create_task(cache.get_or_fetch("other", fetch))
+        await asyncio.sleep(0)
+        cache.evict(lambda key: key == "other")
+        assert await read == 2
+        assert await cache.get_or_fetch("other", fetch) == 3
+
+    asyncio.run(run())
+    assert calls == 3
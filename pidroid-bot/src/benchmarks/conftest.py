@@ -0,0 +1,160 @@
+"""Benchmarks of the hot paths of the bot.
+
+Run the suite with ``pytest src/benchmarks``. Results can be saved as a baseline with
+``--benchmark-save=baseline`` and later compared against it with
+``--benchmark-compare --benchmark-compare-fail=mean:10%``.
+
+Database benchmarks require a disposable PostgreSQL database, specified by the
+PIDROID_BENCHMARK_POSTGRES_DSN environment variable. Every table in it is dropped,
+recreated and filled with generated data. Without it, database benchmarks are skipped.
+
+REST benchmarks run against a local stand-in for the Discord REST API, which emulates its
+rate limits with the periods scaled down by REST_TIME_SCALE."""
+
+import asyncio
+import datetime
+import discord
+import os
+import pytest
+import random
+
+from collections.abc import Awaitable, Callable, Iterator
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from typing import Any
+
+from benchmarks.discord_rest import FakeDiscordServer
+from benchmarks.fakes import FakeClient, FakeLeader, FakeServiceAPI
+
+from pidroid.client import Pidroid
+from pidroid.main import offline_config
+from pidroid.utils.api import API
+from pidroid.utils.db.base import Base
+from pidroid.utils.db.levels import UserLevels
+from pidroid.utils.db.punishment import PunishmentTable
+from pidroid.utils.db.tag import TagTable
+
+# Table sizes of the generated database, roughly those of the largest production guilds
+GUILD_IDS = [1000 + i for i in range(5)]
+MEMBERS_PER_GUILD = 20_000
+TAGS_PER_GUILD = 500
+PUNISHMENTS_PER_GUILD = 10_000
+INSERT_BATCH_SIZE = 5_000
+
+# Rate limit periods of the Discord REST stand-in are this many times shorter than Discord's
+REST_TIME_SCALE = 0.02
+
+@pytest.fixture(scope="session")
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Returns the event loop which is shared by every benchmark, so that pooled connections stay usable."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture
+def benchmark_async(benchmark: Any, loop: asyncio.AbstractEventLoop) -> Callable[..., Any]:
+    """Returns a function which benchmarks the coroutine function with the specified arguments."""
+    def run(func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        return benchmark(lambda: loop.run_until_complete(func(*args)))
+    return run
+
+def _generate_rows(rng: random.Random) -> dict[Any, list[dict[str, Any]]]:
+    now = datetime.datetime.now(tz=datetime.UTC)
+    levels: list[dict[str, Any]] = []
+    tags: list[dict[str, Any]] = []
+    punishments: list[dict[str, Any]] = []
+    for guild_id in GUILD_IDS:
+        for user_id in range(MEMBERS_PER_GUILD):
+            level = rng.randint(0, 60)
+            levels.append({
+                "guild_id": guild_id, "user_id": user_id, "level": level,
+                "total_xp": level * level * 100 + rng.randint(0, 99), "current_xp": rng.randint(0, 99),
+                "xp_to_next_level": 5 * (level ** 2) + (50 * level) + 100
+            })
+        for i in range(TAGS_PER_GUILD):
+            tags.append({
+                "guild_id": guild_id, "name": f"tag-{i}", "content": "content " * rng.randint(5, 100),
+                "authors": [rng.randrange(MEMBERS_PER_GUILD)], "aliases": [f"alias-{i}"], "locked": False
+            })
+        for case_id in range(PUNISHMENTS_PER_GUILD):
+            punishments.append({
+                "case_id": case_id, "type": rng.choice(["warning", "timeout", "kick", "ban", "jail"]),
+                "guild_id": guild_id, "user_id": rng.randrange(MEMBERS_PER_GUILD), "user_name": "user",
+                "moderator_id": rng.randrange(20), "moderator_name": "moderator", "reason": "reason",
+                "issue_date": now - datetime.timedelta(minutes=case_id), "expire_date": None,
+                "handled": False, "visible": True
+            })
+    return {UserLevels: levels, TagTable: tags, PunishmentTable: punishments}
+
+@pytest.fixture(scope="session")
+def postgres_dsn(loop: asyncio.AbstractEventLoop) -> str:
+    """Returns the DSN of a freshly generated benchmark database."""
+    dsn = os.environ.get("PIDROID_BENCHMARK_POSTGRES_DSN")
+    if not dsn:
+        pytest.skip("PIDROID_BENCHMARK_POSTGRES_DSN is not set")
+
+    async def prepare() -> None:
+        engine = create_async_engine(dsn)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+            for table, rows in _generate_rows(random.Random(0)).items():
+                for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                    _ = await connection.execute(insert(table), rows[start:start + INSERT_BATCH_SIZE])
+            for table in ("UserLevels", "Tags", "Punishments"):
+                await connection.exec_driver_sql(f'ANALYZE "{table}"')
+        await engine.dispose()
+
+    loop.run_until_complete(prepare())
+    return dsn
+
+@pytest.fixture(scope="session")
+def api(loop: asyncio.AbstractEventLoop, postgres_dsn: str) -> Iterator[API]:
+    """Returns the database API connected to the benchmark database."""
+    client = FakeClient()
+    for guild_id in GUILD_IDS:
+        _ = client.models.add_guild(guild_id)
+    api = API(client, postgres_dsn) # pyright: ignore[reportArgumentType]
+    client.api = api
+    yield api
+    loop.run_until_complete(api.close())
+
+@pytest.fixture
+def discord_server(loop: asyncio.AbstractEventLoop) -> Iterator[FakeDiscordServer]:
+    """Returns a running Discord REST stand-in, which discord.py is pointed at."""
+    server = FakeDiscordServer(time_scale=REST_TIME_SCALE)
+    loop.run_until_complete(server.start())
+    yield server
+    loop.run_until_complete(server.stop())
+
+@pytest.fixture
+def discord_client(loop: asyncio.AbstractEventLoop, discord_server: FakeDiscordServer) -> Iterator[discord.Client]:
+    """Returns a discord.py client which is logged in to the Discord REST stand-in."""
+    client = loop.run_until_complete(discord_server.create_client())
+    yield client
+    loop.run_until_complete(client.close())
+
+@pytest.fixture
+def pidroid_client(loop: asyncio.AbstractEventLoop, discord_server: FakeDiscordServer) -> Iterator[Pidroid]:
+    """Returns the bot client which is logged in to the Discord REST stand-in.
+
+    Extensions, the database and the message broker are not started. The database API is
+    replaced by FakeServiceAPI and the client always leads, so that singleton jobs run."""
+
+    async def skip_setup() -> None:
+        pass
+
+    async def create() -> Pidroid:
+        # The engine connects lazily, so the DSN is never used
+        client = Pidroid(offline_config("postgresql+asyncpg://benchmark@localhost/benchmark"))
+        client.setup_hook = skip_setup # pyright: ignore[reportAttributeAccessIssue]
+        await client.login("fake-token")
+        return client
+
+    client = loop.run_until_complete(create())
+    database, leader = client.api, client.leader
+    client.api = FakeServiceAPI() # pyright: ignore[reportAttributeAccessIssue]
+    client.leader = FakeLeader() # pyright: ignore[reportAttributeAccessIssue]
+    yield client
+    client.api, client.leader = database, leader
+    loop.run_until_complete(client.close())
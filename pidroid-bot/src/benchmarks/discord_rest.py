@@ -0,0 +1,465 @@
+"""Local stand-in for the Discord REST API.
+
+The server listens on localhost and discord.py is pointed at it, so that the code paths
+which are dominated by REST behaviour can be load tested without a bot token. It covers
+member edits, message sends, reactions, thread edits, bans and unbans, along with the
+lookups those code paths make.
+
+Rate limits are emulated the way Discord applies them: per route buckets keyed by the major
+parameter, 429 responses with ``retry_after`` and a global limit shared by every route.
+Periods can be scaled down with ``time_scale`` to keep load tests short."""
+
+import asyncio
+import discord
+import itertools
+import json
+import time
+
+from aiohttp import web
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import unquote
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+API_PATH = "/api/v10"
+
+@dataclass(frozen=True)
+class RateLimit:
+    limit: int
+    # Seconds after which the bucket refills
+    period: float
+
+# Route bucket limits, roughly those Discord reports for bots
+DEFAULT_RATE_LIMITS = {
+    "member": RateLimit(10, 10.0),
+    "message": RateLimit(5, 5.0),
+    "reaction": RateLimit(1, 0.25),
+    "channel": RateLimit(5, 5.0),
+    "ban": RateLimit(5, 5.0),
+    "fetch": RateLimit(50, 1.0),
+}
+# Requests per second a bot can make across every route
+DEFAULT_GLOBAL_LIMIT = 50
+
+# Snowflakes of the objects created by the server
+_snowflakes = itertools.count(1 << 40)
+
+def _json_response(data: Any, *, status: int = 200, headers: dict[str, str] | None = None) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly application/json, without a charset
+    return web.Response(body=json.dumps(data).encode(), status=status, headers=headers, content_type="application/json")
+
+class _Bucket:
+    def __init__(self, limit: RateLimit, period: float) -> None:
+        super().__init__()
+        self.limit = limit.limit
+        self.period = period
+        self.remaining = limit.limit
+        self.reset_at = 0.0
+
+    def acquire(self, now: float) -> float:
+        """Takes a request from the bucket and returns 0, or how long to wait if it is exhausted."""
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.period
+        if self.remaining == 0:
+            return self.reset_at - now
+        self.remaining -= 1
+        return 0.0
+
+class FakeDiscordServer:
+    """This class implements a local fake of the Discord REST API.
+
+    Use it as an async context manager, which starts the server and points discord.py at it."""
+
+    def __init__(
+        self,
+        *,
+        rate_limits: dict[str, RateLimit] | None = None,
+        global_limit: int = DEFAULT_GLOBAL_LIMIT,
+        time_scale: float = 1.0,
+        latency: float = 0.0
+    ) -> None:
+        super().__init__()
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.global_limit = global_limit
+        self.time_scale = time_scale
+        self.latency = latency
+
+        # Request statistics keyed by the route, for example "PATCH /guilds/{guild_id}/members/{user_id}"
+        self.requests: Counter[str] = Counter()
+        self.rate_limited: Counter[str] = Counter()
+        self.global_rate_limited = 0
+
+        self.bot_user = self.__create_user(next(_snowflakes), bot=True)
+        self.users: dict[int, dict[str, Any]] = {self.bot_user["id"]: self.bot_user}
+        self.guilds: dict[int, dict[str, Any]] = {}
+        self.members: dict[tuple[int, int], dict[str, Any]] = {}
+        self.channels: dict[int, dict[str, Any]] = {}
+        self.messages: dict[int, dict[str, Any]] = {}
+        self.reactions: dict[tuple[int, str], set[int]] = {}
+        self.bans: dict[int, dict[int, str | None]] = {}
+
+        self.__buckets: dict[tuple[str, str], _Bucket] = {}
+        self.__global_bucket = _Bucket(RateLimit(global_limit, 1.0), time_scale)
+        self.__runner: web.AppRunner | None = None
+        self.__original_base = discord.http.Route.BASE
+        self.url = ""
+
+    async def __aenter__(self) -> "FakeDiscordServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Starts the server on a free localhost port and points discord.py at it."""
+        app = web.Application()
+        self.__add_routes(app)
+        self.__runner = web.AppRunner(app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self.__runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}{API_PATH}"
+        discord.http.Route.BASE = self.url
+
+    async def stop(self) -> None:
+        """Stops the server and points discord.py back at Discord."""
+        discord.http.Route.BASE = self.__original_base
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    async def create_client(self, **options: Any) -> discord.Client:
+        """Returns a discord.py client which is logged in to the server, but not connected to the gateway."""
+        client = discord.Client(intents=discord.Intents.all(), **options)
+        await client.login("fake-token")
+        return client
+
+    # Seeding
+
+    @staticmethod
+    def __create_user(user_id: int, *, bot: bool = False) -> dict[str, Any]:
+        return {
+            "id": user_id, "username": f"user-{user_id}", "discriminator": "0",
+            "global_name": None, "avatar": None, "bot": bot
+        }
+
+    def __create_member(self, guild_id: int, user: dict[str, Any], roles: list[int]) -> dict[str, Any]:
+        member = {
+            "user": user, "roles": [str(role_id) for role_id in roles], "nick": None, "avatar": None,
+            "joined_at": "2020-01-01T00:00:00+00:00", "premium_since": None, "deaf": False, "mute": False,
+            "flags": 0, "pending": False, "communication_disabled_until": None
+        }
+        self.members[(guild_id, int(user["id"]))] = member
+        return member
+
+    def add_guild(
+        self,
+        guild_id: int,
+        *,
+        member_count: int = 0,
+        role_count: int = 0,
+        channel_count: int = 0,
+        channel_ids: Iterable[int] = (),
+        thread_count: int = 0
+    ) -> dict[str, Any]:
+        """Creates a guild and returns its GUILD_CREATE payload, which can be added to a client state.
+
+        Channels with the specified IDs are created in addition to channel_count generated ones."""
+        roles = [{
+            "id": str(guild_id), "name": "@everyone", "color": 0, "hoist": False, "position": 0,
+            "permissions": "0", "managed": False, "mentionable": False
+        }]
+        for position in range(1, role_count + 1):
+            roles.append({**roles[0], "id": str(next(_snowflakes)), "name": f"role-{position}", "position": position})
+
+        channels: list[dict[str, Any]] = []
+        generated_ids = (next(_snowflakes) for _ in range(channel_count))
+        for position, channel_id in enumerate(itertools.chain(channel_ids, generated_ids)):
+            channel = {
+                "id": str(channel_id), "type": 0, "guild_id": str(guild_id), "name": f"channel-{position}",
+                "position": position, "permission_overwrites": [], "nsfw": False, "parent_id": None,
+                "topic": None, "last_message_id": None, "rate_limit_per_user": 0
+            }
+            self.channels[int(channel["id"])] = channel
+            channels.append(channel)
+
+        threads: list[dict[str, Any]] = []
+        for position in range(thread_count):
+            thread = {
+                "id": str(next(_snowflakes)), "type": 11, "guild_id": str(guild_id), "name": f"thread-{position}",
+                "parent_id": channels[position % len(channels)]["id"], "owner_id": str(self.bot_user["id"]),
+                "last_message_id": None, "rate_limit_per_user": 0, "message_count": 0, "member_count": 1, "flags": 0,
+                "thread_metadata": {
+                    "archived": False, "auto_archive_duration": 10080, "locked": False,
+                    "archive_timestamp": "2020-01-01T00:00:00+00:00"
+                }
+            }
+            self.channels[int(thread["id"])] = thread
+            threads.append(thread)
+
+        members = [self.__create_member(guild_id, self.bot_user, [])]
+        for _ in range(member_count):
+            user = self.__create_user(next(_snowflakes))
+            self.users[user["id"]] = user
+            members.append(self.__create_member(guild_id, user, []))
+
+        guild = {
+            "id": str(guild_id), "name": f"guild-{guild_id}", "icon": None, "owner_id": str(self.bot_user["id"]),
+            "roles": roles, "emojis": [], "stickers": [], "features": [], "member_count": len(members),
+            "members": members, "channels": channels, "threads": threads, "large": False, "unavailable": False
+        }
+        self.guilds[guild_id] = guild
+        self.bans[guild_id] = {}
+        return guild
+
+    def add_member(self, guild_id: int, user_id: int, roles: Iterable[int] = ()) -> dict[str, Any]:
+        """Adds the user to the guild with the specified roles and returns the member payload."""
+        guild = self.guilds[guild_id]
+        previous = self.members.get((guild_id, user_id))
+        if previous is not None:
+            guild["members"].remove(previous)
+            guild["member_count"] -= 1
+        user = self.users.setdefault(user_id, self.__create_user(user_id))
+        member = self.__create_member(guild_id, user, list(roles))
+        guild["members"].append(member)
+        guild["member_count"] += 1
+        return member
+
+    def add_message(self, channel_id: int, author_id: int, content: str) -> dict[str, Any]:
+        """Creates a message by the user in the channel and returns its MESSAGE_CREATE payload."""
+        return self.__create_message(channel_id, self.users[author_id], content, [])
+
+    def __create_message(
+        self, channel_id: int, author: dict[str, Any], content: str, embeds: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        channel = self.channels[channel_id]
+        message = {
+            "id": str(next(_snowflakes)), "channel_id": str(channel_id), "guild_id": channel.get("guild_id"),
+            "type": 0, "content": content, "author": author, "attachments": [], "embeds": embeds,
+            "mentions": [], "mention_roles": [], "mention_everyone": False,
+            "pinned": False, "tts": False, "timestamp": "2020-01-01T00:00:00+00:00", "edited_timestamp": None
+        }
+        self.messages[int(message["id"])] = message
+        return message
+
+    def add_ban(self, guild_id: int, user_id: int, reason: str | None = None) -> None:
+        """Bans the user in the guild."""
+        self.users.setdefault(user_id, self.__create_user(user_id))
+        self.bans[guild_id][user_id] = reason
+
+    # Rate limiting
+
+    def __limit(self, bucket_name: str, major_parameter: str, handler: Handler) -> Handler:
+        async def limited(request: web.Request) -> web.StreamResponse:
+            route = f"{request.method} {request.match_info.route.resource.canonical}".replace(API_PATH, "", 1) # pyright: ignore[reportOptionalMemberAccess]
+            self.requests[route] += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            now = time.monotonic()
+            retry_after = self.__global_bucket.acquire(now)
+            if retry_after:
+                self.global_rate_limited += 1
+                return self.__rate_limited(retry_after, is_global=True)
+
+            limit = self.rate_limits[bucket_name]
+            key = (bucket_name, request.match_info.get(major_parameter, ""))
+            bucket = self.__buckets.get(key)
+            if bucket is None:
+                bucket = _Bucket(limit, limit.period * self.time_scale)
+                self.__buckets[key] = bucket
+            retry_after = bucket.acquire(now)
+            headers = {
+                "X-RateLimit-Limit": str(bucket.limit),
+                "X-RateLimit-Remaining": str(bucket.remaining),
+                "X-RateLimit-Reset": f"{time.time() + bucket.reset_at - now:.3f}",
+                "X-RateLimit-Reset-After": f"{bucket.reset_at - now:.3f}",
+                "X-RateLimit-Bucket": bucket_name,
+            }
+            if retry_after:
+                self.rate_limited[route] += 1
+                response = self.__rate_limited(retry_after, is_global=False)
+            else:
+                response = await handler(request)
+            response.headers.update(headers)
+            return response
+        return limited
+
+    @staticmethod
+    def __rate_limited(retry_after: float, *, is_global: bool) -> web.Response:
+        headers = {
+            "Retry-After": f"{retry_after:.3f}",
+            "X-RateLimit-Scope": "global" if is_global else "user",
+            # discord.py treats 429 responses which did not come through Discord's proxy as Cloudflare bans
+            "Via": "1.1 google",
+        }
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        body = {"message": "You are being rate limited.", "retry_after": round(retry_after, 3), "global": is_global}
+        return _json_response(body, status=429, headers=headers)
+
+    # Endpoints
+
+    def __add_routes(self, app: web.Application) -> None:
+        routes: list[tuple[str, str, str, str, Handler]] = [
+            ("GET", "/users/@me", "fetch", "", self.__get_current_user),
+            ("GET", "/oauth2/applications/@me", "fetch", "", self.__get_application),
+            ("GET", "/users/{user_id}", "fetch", "", self.__get_user),
+            ("GET", "/channels/{channel_id}", "fetch", "channel_id", self.__get_channel),
+            ("PATCH", "/channels/{channel_id}", "channel", "channel_id", self.__edit_channel),
+            ("POST", "/channels/{channel_id}/messages", "message", "channel_id", self.__send_message),
+            ("PUT", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me", "reaction", "channel_id", self.__add_reaction),
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me", "reaction", "channel_id", self.__remove_reaction),
+            ("DELETE", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{user_id}", "reaction", "channel_id", self.__remove_reaction),
+            ("GET", "/guilds/{guild_id}/members/{user_id}", "fetch", "guild_id", self.__get_member),
+            ("PATCH", "/guilds/{guild_id}/members/{user_id}", "member", "guild_id", self.__edit_member),
+            ("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}", "member", "guild_id", self.__add_member_role),
+            ("DELETE", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}", "member", "guild_id", self.__remove_member_role),
+            ("GET", "/guilds/{guild_id}/bans/{user_id}", "fetch", "guild_id", self.__get_ban),
+            ("PUT", "/guilds/{guild_id}/bans/{user_id}", "ban", "guild_id", self.__ban),
+            ("DELETE", "/guilds/{guild_id}/bans/{user_id}", "ban", "guild_id", self.__unban),
+        ]
+        for method, path, bucket_name, major_parameter, handler in routes:
+            _ = app.router.add_route(method, API_PATH + path, self.__limit(bucket_name, major_parameter, handler))
+
+    @staticmethod
+    def __not_found(message: str, code: int) -> web.Response:
+        return _json_response({"message": message, "code": code}, status=404)
+
+    @staticmethod
+    def __no_content() -> web.Response:
+        return web.Response(status=204)
+
+    @staticmethod
+    async def __read_json(request: web.Request) -> dict[str, Any]:
+        if request.content_type.startswith("multipart/"):
+            # Messages with files carry their JSON in the payload_json field
+            form = await request.post()
+            return json.loads(str(form.get("payload_json", "{}")))
+        if not request.can_read_body:
+            return {}
+        return await request.json()
+
+    async def __get_current_user(self, request: web.Request) -> web.Response:
+        return _json_response(self.bot_user)
+
+    async def __get_application(self, request: web.Request) -> web.Response:
+        return _json_response({
+            "id": str(self.bot_user["id"]), "name": self.bot_user["username"], "icon": None, "description": "",
+            "bot_public": False, "bot_require_code_grant": False, "owner": self.bot_user, "verify_key": "", "flags": 0
+        })
+
+    async def __get_user(self, request: web.Request) -> web.Response:
+        user = self.users.get(int(request.match_info["user_id"]))
+        if user is None:
+            return self.__not_found("Unknown User", 10013)
+        return _json_response(user)
+
+    async def __get_channel(self, request: web.Request) -> web.Response:
+        channel = self.channels.get(int(request.match_info["channel_id"]))
+        if channel is None:
+            return self.__not_found("Unknown Channel", 10003)
+        return _json_response(channel)
+
+    async def __edit_channel(self, request: web.Request) -> web.Response:
+        channel = self.channels.get(int(request.match_info["channel_id"]))
+        if channel is None:
+            return self.__not_found("Unknown Channel", 10003)
+        for key, value in (await self.__read_json(request)).items():
+            metadata = channel.get("thread_metadata")
+            if metadata is not None and key in ("archived", "locked", "auto_archive_duration", "invitable"):
+                metadata[key] = value
+            else:
+                channel[key] = value
+        return _json_response(channel)
+
+    async def __send_message(self, request: web.Request) -> web.Response:
+        channel_id = int(request.match_info["channel_id"])
+        if channel_id not in self.channels:
+            return self.__not_found("Unknown Channel", 10003)
+        payload = await self.__read_json(request)
+        message = self.__create_message(channel_id, self.bot_user, payload.get("content") or "", payload.get("embeds") or [])
+        return _json_response(message)
+
+    async def __add_reaction(self, request: web.Request) -> web.Response:
+        message_id = int(request.match_info["message_id"])
+        if message_id not in self.messages:
+            return self.__not_found("Unknown Message", 10008)
+        key = (message_id, unquote(request.match_info["emoji"]))
+        self.reactions.setdefault(key, set()).add(self.bot_user["id"])
+        return self.__no_content()
+
+    async def __remove_reaction(self, request: web.Request) -> web.Response:
+        message_id = int(request.match_info["message_id"])
+        if message_id not in self.messages:
+            return self.__not_found("Unknown Message", 10008)
+        user_id = int(request.match_info.get("user_id", self.bot_user["id"]))
+        self.reactions.get((message_id, unquote(request.match_info["emoji"])), set()).discard(user_id)
+        return self.__no_content()
+
+    def __find_member(self, request: web.Request) -> dict[str, Any] | None:
+        return self.members.get((int(request.match_info["guild_id"]), int(request.match_info["user_id"])))
+
+    async def __get_member(self, request: web.Request) -> web.Response:
+        member = self.__find_member(request)
+        if member is None:
+            return self.__not_found("Unknown Member", 10007)
+        return _json_response(member)
+
+    async def __edit_member(self, request: web.Request) -> web.Response:
+        member = self.__find_member(request)
+        if member is None:
+            return self.__not_found("Unknown Member", 10007)
+        for key, value in (await self.__read_json(request)).items():
+            if key == "roles":
+                # The @everyone role shares the guild ID and is implicit
+                guild_id = request.match_info["guild_id"]
+                member[key] = [str(role_id) for role_id in value if str(role_id) != guild_id]
+            elif key in ("nick", "communication_disabled_until", "mute", "deaf", "flags"):
+                member[key] = value
+        return _json_response(member)
+
+    async def __add_member_role(self, request: web.Request) -> web.Response:
+        member = self.__find_member(request)
+        if member is None:
+            return self.__not_found("Unknown Member", 10007)
+        if request.match_info["role_id"] not in member["roles"]:
+            member["roles"].append(request.match_info["role_id"])
+        return self.__no_content()
+
+    async def __remove_member_role(self, request: web.Request) -> web.Response:
+        member = self.__find_member(request)
+        if member is None:
+            return self.__not_found("Unknown Member", 10007)
+        if request.match_info["role_id"] in member["roles"]:
+            member["roles"].remove(request.match_info["role_id"])
+        return self.__no_content()
+
+    async def __get_ban(self, request: web.Request) -> web.Response:
+        bans = self.bans.get(int(request.match_info["guild_id"]), {})
+        user_id = int(request.match_info["user_id"])
+        if user_id not in bans:
+            return self.__not_found("Unknown Ban", 10026)
+        return _json_response({"user": self.users[user_id], "reason": bans[user_id]})
+
+    async def __ban(self, request: web.Request) -> web.Response:
+        guild_id = int(request.match_info["guild_id"])
+        if guild_id not in self.guilds:
+            return self.__not_found("Unknown Guild", 10004)
+        user_id = int(request.match_info["user_id"])
+        reason = request.headers.get("X-Audit-Log-Reason")
+        self.add_ban(guild_id, user_id, unquote(reason) if reason else None)
+        _ = self.members.pop((guild_id, user_id), None)
+        return self.__no_content()
+
+    async def __unban(self, request: web.Request) -> web.Response:
+        bans = self.bans.get(int(request.match_info["guild_id"]), {})
+        if bans.pop(int(request.match_info["user_id"]), False) is False:
+            return self.__not_found("Unknown Ban", 10026)
+        return self.__no_content()
@@ -0,0 +1,144 @@
+"""Builders of discord.py models and stand-ins for the bot client and the database API.
+
+Discord models are the models of discord.py, built from payloads the way the library builds
+them from gateway events. They are not connected to Discord unless the client they are built
+with is logged in to the Discord REST stand-in."""
+
+import asyncio
+import datetime
+import discord
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+from pidroid.modules.moderation.models.case import Case
+from pidroid.modules.moderation.models.types import PunishmentType
+from pidroid.utils.db.expiring_thread import ExpiringThread
+from pidroid.utils.db.punishment import PunishmentTable
+
+from benchmarks.discord_rest import FakeDiscordServer
+
+class DiscordModels:
+    """This class builds discord.py models and caches them in the connection state of the client.
+
+    Payloads are generated by the Discord REST stand-in, which does not have to be running
+    unless the benchmarked code makes requests."""
+
+    def __init__(self, client: discord.Client | None = None, server: FakeDiscordServer | None = None) -> None:
+        super().__init__()
+        self.client = client or discord.Client(intents=discord.Intents.all())
+        self.server = server or FakeDiscordServer()
+
+    @property
+    def _state(self) -> Any:
+        return self.client._connection # pyright: ignore[reportPrivateUsage]
+
+    def add_guild(self, guild_id: int, *, role_count: int = 20, channel_count: int = 10) -> discord.Guild:
+        """Returns a new guild with the specified amount of roles, besides the default role, and text channels."""
+        payload = self.server.add_guild(guild_id, role_count=role_count, channel_count=channel_count)
+        return self._state._add_guild_from_data(payload)
+
+    def add_member(self, guild: discord.Guild, user_id: int, roles: Sequence[discord.Role] = ()) -> discord.Member:
+        """Adds the user to the guild with the specified roles and returns the member."""
+        payload = self.server.add_member(guild.id, user_id, [role.id for role in roles])
+        member = discord.Member(data=payload, guild=guild, state=self._state) # pyright: ignore[reportArgumentType]
+        guild._add_member(member) # pyright: ignore[reportPrivateUsage]
+        return member
+
+    def create_message(self, channel: discord.TextChannel, author: discord.Member, content: str) -> discord.Message:
+        """Returns a new message by the member in the channel."""
+        payload = self.server.add_message(channel.id, author.id, content)
+        return discord.Message(state=self._state, channel=channel, data=payload) # pyright: ignore[reportArgumentType]
+
+def create_guild_configuration(**overrides: Any) -> SimpleNamespace:
+    """Returns an object with the guild configuration attributes used on the message path."""
+    values: dict[str, Any] = {
+        "xp_system_active": True,
+        "xp_exempt_channels": [],
+        "xp_exempt_roles": [],
+        "xp_multiplier": 1.0,
+        "xp_per_message_min": 15,
+        "xp_per_message_max": 25,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+@dataclass
+class FakeClient:
+    """Stand-in for the Pidroid client, which looks up the models cached by its DiscordModels."""
+
+    api: Any = None
+    configuration: SimpleNamespace = field(default_factory=create_guild_configuration)
+    models: DiscordModels = field(default_factory=DiscordModels)
+    debugging: bool = False
+    config: dict[str, Any] = field(default_factory=lambda: {"tt_api_key": None})
+    dispatched: int = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    async def wait_until_guild_configurations_loaded(self) -> None:
+        pass
+
+    async def fetch_guild_configuration(self, guild_id: int) -> SimpleNamespace:
+        return self.configuration
+
+    @property
+    def guilds(self) -> Sequence[discord.Guild]:
+        return self.models.client.guilds
+
+    def get_guild(self, guild_id: int) -> discord.Guild | None:
+        return self.models.client.get_guild(guild_id)
+
+    def get_channel(self, channel_id: int) -> Any:
+        return self.models.client.get_channel(channel_id)
+
+    def dispatch(self, event: str, /, *args: Any, **kwargs: Any) -> None:
+        self.dispatched += 1
+
+class FakeLeader:
+    """Stand-in for the leader election, which always leads, so that singleton jobs run."""
+
+    is_leader = True
+
+class FakeServiceAPI:
+    """Stand-in for the database API, which keeps the rows the periodic services act on in memory."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.expiring_threads: dict[int, ExpiringThread] = {}
+        self.punishments: list[PunishmentTable] = []
+
+    def add_expiring_thread(self, thread_id: int, guild_id: int, expiration_date: datetime.datetime) -> None:
+        row_id = len(self.expiring_threads) + 1
+        self.expiring_threads[row_id] = ExpiringThread(
+            id=row_id, thread_id=thread_id, guild_id=guild_id, expiration_date=expiration_date
+        )
+
+    def add_ban(self, guild_id: int, user_id: int, expire_date: datetime.datetime) -> None:
+        self.punishments.append(PunishmentTable(
+            id=len(self.punishments) + 1, case_id=len(self.punishments) + 1, type=PunishmentType.BAN.value,
+            guild_id=guild_id, user_id=user_id, user_name="user", moderator_id=0, moderator_name="moderator",
+            reason=None, issue_date=expire_date, expire_date=expire_date, handled=False, visible=True
+        ))
+
+    async def fetch_expired_threads(self, expiration_date: datetime.datetime) -> list[ExpiringThread]:
+        return [row for row in self.expiring_threads.values() if row.expiration_date <= expiration_date]
+
+    async def delete_expiring_thread(self, row_id: int) -> None:
+        _ = self.expiring_threads.pop(row_id, None)
+
+    async def fetch_active_guild_bans(self, guild_id: int) -> list[Case]:
+        return [
+            Case(self, row) # pyright: ignore[reportArgumentType]
+            for row in self.punishments
+            if row.guild_id == guild_id and row.type == PunishmentType.BAN.value and not row.handled
+        ]
+
+    async def expire_cases_by_type(self, type: PunishmentType, guild_id: int, user_id: int) -> None:
+        for row in self.punishments:
+            if row.type == type.value and row.guild_id == guild_id and row.user_id == user_id:
+                row.handled = True
@@ -0,0 +1,46 @@
+import asyncio
+import random
+
+from typing import Any
+
+from pidroid.utils.debouncer import RoleAction, RoleChangeDebouncer
+
+from benchmarks.discord_rest import FakeDiscordServer, RateLimit
+from benchmarks.fakes import DiscordModels
+
+MEMBER_COUNT = 1_000
+OPERATIONS_PER_MEMBER = 5
+ROUNDS = 3
+
+def test_role_change_debouncer_bulk(benchmark: Any, loop: asyncio.AbstractEventLoop):
+    # Member edits are sent to the Discord REST stand-in, which does not rate limit them,
+    # so that the benchmark measures the coalescing rather than waiting for the rate limits
+    server = FakeDiscordServer(rate_limits={"member": RateLimit(1_000_000, 1.0)}, global_limit=1_000_000)
+    loop.run_until_complete(server.start())
+    client = loop.run_until_complete(server.create_client())
+    models = DiscordModels(client, server)
+    guild = models.add_guild(1)
+    for user_id in range(1, MEMBER_COUNT + 1):
+        _ = models.add_member(guild, user_id, guild.roles[1:4])
+    rng = random.Random(0)
+    # Mirrors a startup level reward sync, which queues several role changes for every member
+    operations = [
+        (rng.choice([RoleAction.add, RoleAction.remove]), user_id, rng.choice(guild.roles[1:]).id)
+        for user_id in range(1, MEMBER_COUNT + 1)
+        for _ in range(OPERATIONS_PER_MEMBER)
+    ]
+
+    async def apply() -> None:
+        debouncer = RoleChangeDebouncer(client, 0) # pyright: ignore[reportArgumentType]
+        for action, user_id, role_id in operations:
+            await debouncer.update_user_role(action, guild.id, user_id, role_id)
+        while debouncer.pending_operations > 0:
+            await asyncio.sleep(0.001)
+
+    try:
+        benchmark.pedantic(lambda: loop.run_until_complete(apply()), rounds=ROUNDS, iterations=1)
+        assert server.requests["PATCH /guilds/{guild_id}/members/{user_id}"] > 0
+        assert server.rate_limited.total() == 0
+    finally:
+        loop.run_until_complete(client.close())
+        loop.run_until_complete(server.stop())
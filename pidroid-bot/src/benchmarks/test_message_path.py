@@ -0,0 +1,113 @@
+import asyncio
+import discord
+import itertools
+import random
+
+from typing import Any
+
+from pidroid.constants import THEOTOWN_GUILD
+from pidroid.models.queue import MessageQueue
+from pidroid.services.leveling import LevelingService
+from pidroid.services.theotown.chat_translator import TextParser
+from pidroid.services.theotown.copypasta import CopypastaService
+from pidroid.services.theotown.spam_detection import SpamDetectionService
+
+from benchmarks.fakes import DiscordModels, FakeClient
+
+# A mix of the messages seen in busy channels
+MESSAGES = [
+    "hello everyone",
+    "does anyone know how to build an airport?",
+    "I THINK THE NEW UPDATE IS AMAZING",
+    "check this out https://example.com/some/path?query=value",
+    "<:theotown:123456789012345678> nice city",
+    "among us is sus",
+    "I use linux btw",
+    "ja is writing js again",
+    "**bold** and _italic_ with `code` and ||spoilers||",
+    "lithuania is the best country 🇱🇹🇱🇹",
+    "a" * 400,
+]
+
+class FakeLevelAPI:
+    async def award_xp(self, message: Any, amount: int) -> None:
+        pass
+
+def _create_messages(models: DiscordModels, guild: discord.Guild, count: int, rng: random.Random) -> list[discord.Message]:
+    channels = guild.text_channels
+    # The default role is left out, every member has it
+    roles = guild.roles[1:6]
+    messages: list[discord.Message] = []
+    for i in range(count):
+        member = models.add_member(guild, i, rng.sample(roles, 2))
+        messages.append(models.create_message(rng.choice(channels), member, rng.choice(MESSAGES)))
+    return messages
+
+def test_leveling_on_message(benchmark_async: Any):
+    client = FakeClient(api=FakeLevelAPI())
+    service = LevelingService(client) # pyright: ignore[reportArgumentType]
+    guild = client.models.add_guild(1)
+    # Every message comes from a different member, so that none of them are on cooldown
+    messages = itertools.cycle(_create_messages(client.models, guild, 50_000, random.Random(0)))
+
+    async def handle() -> None:
+        await service.on_message(next(messages))
+
+    benchmark_async(handle)
+
+def test_spam_detection_on_message(benchmark_async: Any, loop: asyncio.AbstractEventLoop):
+    client = FakeClient()
+    guild = client.models.add_guild(THEOTOWN_GUILD)
+
+    async def create_service() -> SpamDetectionService:
+        return SpamDetectionService(client) # pyright: ignore[reportArgumentType]
+
+    service = loop.run_until_complete(create_service())
+    messages = itertools.cycle(_create_messages(client.models, guild, 1_000, random.Random(0)))
+
+    async def handle() -> None:
+        await service.on_message(next(messages))
+
+    try:
+        benchmark_async(handle)
+    finally:
+        loop.run_until_complete(service.cog_unload())
+
+def test_text_parser(benchmark: Any):
+    def parse() -> None:
+        for message in MESSAGES:
+            parser = TextParser(message)
+            if parser.should_translate:
+                _ = parser.get_parsed_text()
+
+    benchmark(parse)
+
+def test_copypasta_matching(benchmark: Any):
+    service = CopypastaService(FakeClient()) # pyright: ignore[reportArgumentType]
+    contents = [message.lower() for message in MESSAGES]
+
+    def match() -> None:
+        for content in contents:
+            _ = (
+                service.is_linux(content) or service.is_among_us(content) or service.is_lithuania(content)
+                or service.is_js(content) or service.is_ganyu(content)
+            )
+
+    benchmark(match)
+
+def test_message_queue_packing(benchmark_async: Any):
+    channel = DiscordModels().add_guild(1, channel_count=1).text_channels[0]
+    rng = random.Random(0)
+    # Log lines of varying length, as produced by the logging services
+    lines = [" ".join(rng.choice(MESSAGES) for _ in range(rng.randint(1, 3))) for _ in range(500)]
+
+    async def pack() -> None:
+        queue = MessageQueue(channel)
+        for line in lines:
+            await queue.queue(line)
+        while len(queue) > 0:
+            item = await queue._queue.get() # pyright: ignore[reportPrivateUsage]
+            assert isinstance(item, str)
+            _ = await queue._combine_if_possible(item) # pyright: ignore[reportPrivateUsage]
+
+    benchmark_async(pack)
@@ -0,0 +1,49 @@
+import itertools
+import random
+
+from typing import Any
+
+from pidroid.utils.api import API
+
+from benchmarks.conftest import GUILD_IDS, MEMBERS_PER_GUILD
+from benchmarks.fakes import DiscordModels
+
+GUILD_ID = GUILD_IDS[0]
+
+def test_award_xp(benchmark_async: Any, api: API):
+    models = DiscordModels()
+    guild = models.add_guild(GUILD_ID, channel_count=1)
+    channel = guild.text_channels[0]
+    rng = random.Random(0)
+    messages = itertools.cycle([
+        models.create_message(channel, models.add_member(guild, rng.randrange(MEMBERS_PER_GUILD)), "hello")
+        for _ in range(1_000)
+    ])
+
+    async def award() -> None:
+        await api.award_xp(next(messages), 20)
+
+    benchmark_async(award)
+
+def test_fetch_user_level_info(benchmark_async: Any, api: API):
+    user_ids = itertools.cycle(range(0, MEMBERS_PER_GUILD, 7))
+    benchmark_async(lambda: api.fetch_user_level_info(GUILD_ID, next(user_ids)))
+
+def test_fetch_guild_level_rankings_deep_page(benchmark_async: Any, api: API):
+    benchmark_async(api.fetch_guild_level_rankings, GUILD_ID, MEMBERS_PER_GUILD // 2, 10)
+
+def test_fetch_guild_level_infos(benchmark_async: Any, api: API):
+    benchmark_async(api.fetch_guild_level_infos, GUILD_ID)
+
+def test_fetch_guild_tags(benchmark_async: Any, api: API):
+    benchmark_async(api.fetch_guild_tags, GUILD_ID)
+
+def test_search_guild_tags(benchmark_async: Any, api: API):
+    benchmark_async(api.search_guild_tags, GUILD_ID, "tag-4")
+
+def test_fetch_cases(benchmark_async: Any, api: API):
+    user_ids = itertools.cycle(range(0, MEMBERS_PER_GUILD, 13))
+    benchmark_async(lambda: api._fetch_cases(GUILD_ID, next(user_ids))) # pyright: ignore[reportPrivateUsage]
+
+def test_fetch_moderation_statistics(benchmark_async: Any, api: API):
+    benchmark_async(api.fetch_moderation_statistics, GUILD_ID, 1)
@@ -0,0 +1,166 @@
+import asyncio
+import datetime
+import discord
+
+from typing import Any
+
+from pidroid.client import Pidroid
+from pidroid.constants import THEOTOWN_GUILD
+from pidroid.models.queue import MessageQueue
+from pidroid.modules.moderation.service import PunishmentService
+from pidroid.services.thread_archiver import ThreadArchiverService
+from pidroid.services.theotown.spoiler_reactions import SPOILERS_CHANNEL_ID, SpoilerReactionService
+from pidroid.utils.debouncer import RoleAction, RoleChangeDebouncer
+from pidroid.utils.time import utcnow
+
+from benchmarks.conftest import REST_TIME_SCALE
+from benchmarks.discord_rest import FakeDiscordServer
+from benchmarks.fakes import FakeServiceAPI
+
+ROUNDS = 3
+
+# The reaction added by SpoilerReactionService, as the stand-in records it
+SPOILER_REACTION = ":bear_think:431390001721376770"
+
+def _add_guild(client: discord.Client, server: FakeDiscordServer, guild_id: int, **options: Any) -> discord.Guild:
+    return client._connection._add_guild_from_data(server.add_guild(guild_id, **options)) # pyright: ignore[reportPrivateUsage, reportArgumentType]
+
+def test_role_change_debouncer_rest(
+    benchmark: Any, loop: asyncio.AbstractEventLoop,
+    discord_server: FakeDiscordServer, discord_client: discord.Client
+):
+    guild = _add_guild(discord_client, discord_server, 1, member_count=50, role_count=5)
+    members = [member for member in guild.members if member.id != discord_server.bot_user["id"]]
+
+    route = "PATCH /guilds/{guild_id}/members/{user_id}"
+
+    async def apply() -> None:
+        edits = discord_server.requests[route]
+        debouncer = RoleChangeDebouncer(discord_client, 0) # pyright: ignore[reportArgumentType]
+        for member in members:
+            for role in guild.roles[1:4]:
+                await debouncer.update_user_role(RoleAction.add, guild.id, member.id, role.id)
+        while debouncer.pending_operations > 0:
+            await asyncio.sleep(0.01)
+        # Every member gets a single edit with every role
+        assert discord_server.requests[route] - edits == len(members)
+
+    benchmark.pedantic(lambda: loop.run_until_complete(apply()), rounds=ROUNDS, iterations=1)
+    expected_roles = sorted(str(role.id) for role in guild.roles[1:4])
+    for member in members:
+        assert sorted(discord_server.members[(guild.id, member.id)]["roles"]) == expected_roles
+
+def test_message_queues_rest(
+    benchmark: Any, loop: asyncio.AbstractEventLoop,
+    discord_server: FakeDiscordServer, discord_client: discord.Client
+):
+    guild = _add_guild(discord_client, discord_server, 1, channel_count=10)
+    # Lines too long to be combined, so that every line is a message
+    lines = [f"{i} " + "log line " * 150 for i in range(20)]
+
+    async def flush(channel: discord.TextChannel) -> None:
+        queue = MessageQueue(channel, delay=0.001)
+        for line in lines:
+            await queue.queue(line)
+        while len(queue) > 0:
+            await queue.handle_queue()
+
+    async def flush_all() -> None:
+        sent = len(discord_server.messages)
+        _ = await asyncio.gather(*(flush(channel) for channel in guild.text_channels))
+        assert len(discord_server.messages) - sent == len(guild.text_channels) * len(lines)
+
+    benchmark.pedantic(lambda: loop.run_until_complete(flush_all()), rounds=ROUNDS, iterations=1)
+
+def test_reactions_rest(
+    benchmark: Any, loop: asyncio.AbstractEventLoop,
+    discord_server: FakeDiscordServer, pidroid_client: Pidroid
+):
+    guild = _add_guild(pidroid_client, discord_server, THEOTOWN_GUILD, member_count=1, channel_ids=[SPOILERS_CHANNEL_ID])
+    channel = guild.text_channels[0]
+    author = next(member for member in guild.members if not member.bot)
+    service = SpoilerReactionService(pidroid_client)
+
+    def create_messages() -> tuple[tuple[Any, ...], dict[str, Any]]:
+        messages = [
+            discord.Message(state=pidroid_client._connection, channel=channel, data=discord_server.add_message(channel.id, author.id, f"spoiler {i}")) # pyright: ignore[reportPrivateUsage, reportArgumentType]
+            for i in range(40)
+        ]
+        return (messages,), {}
+
+    async def react(messages: list[discord.Message]) -> None:
+        _ = await asyncio.gather(*(service.on_message(message) for message in messages))
+        assert all(discord_server.reactions.get((message.id, SPOILER_REACTION)) for message in messages)
+
+    benchmark.pedantic(lambda messages: loop.run_until_complete(react(messages)), setup=create_messages, rounds=ROUNDS, iterations=1)
+
+def test_unban_rest(
+    benchmark: Any, loop: asyncio.AbstractEventLoop,
+    discord_server: FakeDiscordServer, pidroid_client: Pidroid
+):
+    guild = _add_guild(pidroid_client, discord_server, 1)
+    api: FakeServiceAPI = pidroid_client.api # pyright: ignore[reportAssignmentType]
+    user_ids = list(range(1, 31))
+
+    async def create_service() -> PunishmentService:
+        service = PunishmentService(pidroid_client)
+        # The periodic task is not needed, the job is called directly
+        service.remove_expired_bans.cancel()
+        return service
+
+    service = loop.run_until_complete(create_service())
+
+    def ban_everyone() -> tuple[tuple[Any, ...], dict[str, Any]]:
+        expire_date = utcnow() - datetime.timedelta(minutes=1)
+        for user_id in user_ids:
+            discord_server.add_ban(guild.id, user_id)
+            api.add_ban(guild.id, user_id, expire_date)
+        return (), {}
+
+    benchmark.pedantic(lambda: loop.run_until_complete(service.remove_expired_bans()), setup=ban_everyone, rounds=ROUNDS, iterations=1)
+    assert discord_server.bans[guild.id] == {}
+    assert all(row.handled for row in api.punishments)
+
+def test_thread_archiving_rest(
+    benchmark: Any, loop: asyncio.AbstractEventLoop,
+    discord_server: FakeDiscordServer, pidroid_client: Pidroid
+):
+    guild = _add_guild(pidroid_client, discord_server, 1, channel_count=1, thread_count=15)
+    api: FakeServiceAPI = pidroid_client.api # pyright: ignore[reportAssignmentType]
+
+    async def create_service() -> ThreadArchiverService:
+        service = ThreadArchiverService(pidroid_client)
+        # The periodic task is not needed, the job is called directly
+        service.archive_threads.cancel()
+        return service
+
+    service = loop.run_until_complete(create_service())
+
+    def expire_threads() -> tuple[tuple[Any, ...], dict[str, Any]]:
+        expiration_date = utcnow() - datetime.timedelta(minutes=1)
+        for thread in guild.threads:
+            api.add_expiring_thread(thread.id, guild.id, expiration_date)
+        return (), {}
+
+    benchmark.pedantic(lambda: loop.run_until_complete(service.archive_threads()), setup=expire_threads, rounds=ROUNDS, iterations=1)
+    assert api.expiring_threads == {}
+    for thread in guild.threads:
+        assert discord_server.channels[thread.id]["thread_metadata"]["locked"]
+
+def test_global_rate_limit(loop: asyncio.AbstractEventLoop):
+    async def run() -> FakeDiscordServer:
+        async with FakeDiscordServer(global_limit=20, time_scale=REST_TIME_SCALE * 5) as server:
+            client = await server.create_client()
+            guild = _add_guild(client, server, 1, member_count=49)
+            try:
+                # Lookups share a bucket with a higher limit, so only the global limit applies.
+                # discord.py gives up after 5 attempts, so there are fewer lookups than 5 global windows allow
+                users = await asyncio.gather(*(client.fetch_user(member.id) for member in guild.members))
+            finally:
+                await client.close()
+            assert [user.id for user in users] == [member.id for member in guild.members]
+        return server
+
+    server = loop.run_until_complete(run())
+    assert server.global_rate_limited > 0
+    assert server.rate_limited.total() == 0
@@ -3,7 +3,9 @@ from __future__ import annotations
 import asyncio
 import datetime
 import discord
+import importlib
 import logging
+import time
 
 from aiohttp import ClientSession
 from contextlib import suppress
@@ -13,10 +15,12 @@ from discord.guild import Guild
 from discord.mentions import AllowedMentions
 from discord.message import Message
 from discord.utils import MISSING
-from typing import TYPE_CHECKING, Any, override
+from functools import partial, wraps
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, override
 
 from pidroid import __VERSION__
 from pidroid.models.categories import Category, register_categories
+from pidroid.models.command_index import CommandIndex
 from pidroid.models.event_types import EventName, EventType
 from pidroid.models.guild_configuration import GuildConfiguration
 from pidroid.models.persistent_views import PersistentSuggestionManagementView
@@ -26,7 +30,24 @@ from pidroid.modules.moderation.models.case import Case
 from pidroid.modules.moderation.models.types import PunishmentType
 from pidroid.services.faststream_service import FastStreamService
 from pidroid.utils.api import API
+from pidroid.utils.assets import AssetCache
+from pidroid.utils.cache import get_caches
 from pidroid.utils.checks import is_client_pidroid
+from pidroid.utils.cluster import ClusterInfo
+from pidroid.utils.data import PersistentDataStore
+from pidroid.utils.file import ATTACHMENT_RESOURCES, asset_store
+from pidroid.utils.metrics import (
+    CACHE_ENTRIES, CACHE_LOOKUPS, COMMAND_LATENCY, EVENTS_DROPPED, LEADER, LISTENER_LATENCY, QUEUE_DEPTH,
+    RateLimitLogFilter, registry
+)
+from pidroid.utils.gateway import GatewayRecorder
+from pidroid.utils.invalidation import CacheScope, Invalidation
+from pidroid.utils.leader import LEADER_LOCK_KEY, LeaderElection
+from pidroid.utils.members import MemberCachePolicy, MemberChunker
+from pidroid.utils.memory import MemoryTracer
+from pidroid.utils.profiler import SamplingProfiler
+from pidroid.utils.startup import StartupReport, WarmupScheduler, load_extensions
+from pidroid.utils.watchdog import LoopWatchdog
 from pidroid.utils.types import ConfigDict, VersionInfo
 
 if TYPE_CHECKING:
@@ -34,11 +55,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("Pidroid")
 
+ListenerFunc = Callable[..., Coroutine[Any, Any, Any]]
+
 def _is_theotown_service(service: str):
     return service.startswith("services.theotown") or service.startswith("theotown:")
 
-class Pidroid(commands.Bot):
-    """This class represents the Pidroid bot client object."""
+class Pidroid(commands.AutoShardedBot):
+    """This class represents the Pidroid bot client object.
+
+    A client connects the shards of its cluster, which are every shard unless it is started by the cluster launcher."""
 
     if TYPE_CHECKING:
         session: ClientSession | None
@@ -47,14 +72,32 @@ class Pidroid(commands.Bot):
         intents = discord.Intents.all()
         intents.presences = False
         allowed_mentions = AllowedMentions(everyone=False, replied_user=False)
+        # Most guilds use no feature which needs every member, so they are not chunked at startup
+        member_chunker = MemberChunker(MemberCachePolicy(config["member_cache_policy"]))
         super().__init__(
             command_prefix="P", help_command=None,
             intents=intents, allowed_mentions=allowed_mentions,
-            case_insensitive=True
+            case_insensitive=True,
+            shard_count=config["shard_count"], shard_ids=config["shard_ids"],
+            chunk_guilds_at_startup=member_chunker.chunk_at_startup
         )
+        self.member_chunker = member_chunker
+        # Listeners are wrapped to be timed, the wrappers are kept so that the listeners can be removed
+        self.__listener_wrappers: dict[tuple[ListenerFunc, str], ListenerFunc] = {}
+
+        # Startup is timed from here, the report is logged once the extensions are loaded
+        self.startup_report = StartupReport()
+        # Expensive warm-ups run in the background, so that they do not delay responding to commands
+        self.warmups = WarmupScheduler(self.startup_report)
 
         # Load configuration
         self.config: ConfigDict = config
+        self.cluster = ClusterInfo(
+            cluster_id=config["cluster_id"],
+            cluster_count=config["cluster_count"],
+            shard_ids=tuple(config["shard_ids"]) if config["shard_ids"] is not None else None,
+            shard_count=config["shard_count"]
+        )
         self.debugging: bool = config["debugging"]
         self.prefixes: list[str] = config["prefixes"]
 
@@ -111,11 +154,23 @@ class Pidroid(commands.Bot):
 
             # Load the error handler last
             'services.error_handler',
+        ]
 
+        # These are loaded in the background after the other extensions, as they are slow to import
+        self._deferred_extensions = [
             # Debugging tool jishaku
             'jishaku',
         ]
 
+        # Extensions are loaded concurrently, each after the extensions it depends on
+        self._extension_dependencies: dict[str, set[str]] = {}
+        # Extensions which are loaded after the listed ones, even if those failed to load
+        self._extension_load_order: dict[str, set[str]] = {
+            'services.error_handler': {
+                ext for ext in self._extensions_to_load if ext != 'services.error_handler'
+            },
+        }
+
         # This holds cached guild configurations
         self._guild_prefix_cache_ready = asyncio.Event()
         self.__cached_guild_prefixes: dict[int, list[str]] = {}
@@ -123,11 +178,13 @@ class Pidroid(commands.Bot):
         self.client_version: VersionInfo = __VERSION__
 
         self.command_categories: list[Category] = []
-
-        self.version_cache: dict[str, str | None] = {}
+        self.command_index = CommandIndex([])
 
         self.session = None
 
+        self.data_store = PersistentDataStore()
+        self.asset_cache = AssetCache()
+
         self.api: API = API(self, self.config["postgres_dsn"], self.debugging)
         try:
             self.github_api: GithubAPI | None = GithubAPI(self)
@@ -138,21 +195,111 @@ class Pidroid(commands.Bot):
         self.__queues: dict[int, AbstractMessageQueue] = {}
         self.__tasks: list[tasks.Loop] = []
         self.__faststream_service = FastStreamService(self)
+        self.api.invalidations.add_handler(self.__refresh_guild_prefixes)
+        # Replicas of a cluster elect a leader which runs the singleton jobs
+        self.leader = LeaderElection(self.api.connect, LEADER_LOCK_KEY + self.cluster.cluster_id)
+        self.watchdog = LoopWatchdog()
+        self.profiler = SamplingProfiler()
+        self.memory_tracer = MemoryTracer()
+
+        # Gateway events are recorded, so that they can be replayed with the replay tool
+        self.gateway_recorder: GatewayRecorder | None = None
+        if config["gateway_recording_path"]:
+            self.gateway_recorder = GatewayRecorder(config["gateway_recording_path"], get_prefixes=self.__get_recorded_prefixes)
+            self.gateway_recorder.install(self._connection.parsers)
 
     @override
     async def setup_hook(self):
-        await self.api.test_connection()
-        await self.load_cogs()
-        await self.__faststream_service.start()
+        report = self.startup_report
+        self.__setup_metrics()
+        if self.gateway_recorder is not None:
+            self.gateway_recorder.start()
+        self.warmups.start()
+        with report.phase("database"):
+            await self.api.test_connection()
+        self.leader.start()
+        # Neither depends on the other, so they are loaded at the same time
+        with report.phase("data store and assets"):
+            _ = await asyncio.gather(self.data_store.load(), asyncio.to_thread(asset_store.preload, ATTACHMENT_RESOURCES))
+        with report.phase("extensions"):
+            await self.load_cogs()
+        with report.phase("message broker"):
+            await self.__faststream_service.start()
         self.add_persistent_views()
+        logger.info(f"Startup report:\n{report.format()}")
 
     @override
     async def close(self) -> None:
         """Called when Pidroid is being shut down."""
         await super().close()
+        await self.warmups.stop()
         for task in self.__tasks:
             task.stop()
         await self.__faststream_service.stop()
+        await self.data_store.close()
+        await self.leader.stop()
+        await self.api.close()
+        await self.watchdog.stop()
+        if self.gateway_recorder is not None:
+            await self.gateway_recorder.close()
+
+    def __setup_metrics(self) -> None:
+        """Starts collecting the runtime metrics which are not recorded where they happen."""
+        self.watchdog.start()
+        registry.add_collector(self.__collect_metrics)
+        logging.getLogger("discord.http").addFilter(RateLimitLogFilter())
+
+    def __collect_metrics(self) -> None:
+        event_bus = self.__faststream_service.event_bus
+        QUEUE_DEPTH.set(event_bus.pending_events, queue="events")
+        QUEUE_DEPTH.set(sum(len(queue) for queue in self.__queues.values()), queue="messages")
+        EVENTS_DROPPED.set(event_bus.dropped)
+        LEADER.set(1 if self.leader.is_leader else 0)
+        for name, cache in get_caches().items():
+            CACHE_LOOKUPS.set(cache.statistics.hits, cache=name, result="hit")
+            CACHE_LOOKUPS.set(cache.statistics.stale_hits, cache=name, result="stale_hit")
+            CACHE_LOOKUPS.set(cache.statistics.misses, cache=name, result="miss")
+            CACHE_ENTRIES.set(len(cache), cache=name)
+
+    def __wrap_listener(self, func: ListenerFunc, name: str) -> ListenerFunc:
+        owner = getattr(func, "__self__", None)
+        cog_name = owner.qualified_name if isinstance(owner, commands.Cog) else "(no cog)"
+
+        @wraps(func)
+        async def listener(*args: Any, **kwargs: Any) -> Any:
+            if self.profiler.running:
+                self.profiler.label_current_task(cog_name, f"listener:{name}")
+            with LISTENER_LATENCY.time(event=name, listener=func.__qualname__):
+                return await func(*args, **kwargs)
+
+        return listener
+
+    @override
+    def add_listener(self, func: ListenerFunc, /, name: str = MISSING) -> None:
+        name = func.__name__ if name is MISSING else name
+        wrapper = self.__wrap_listener(func, name)
+        self.__listener_wrappers[(func, name)] = wrapper
+        super().add_listener(wrapper, name)
+
+    @override
+    def remove_listener(self, func: ListenerFunc, /, name: str = MISSING) -> None:
+        name = func.__name__ if name is MISSING else name
+        super().remove_listener(self.__listener_wrappers.pop((func, name), func), name)
+
+    @override
+    async def invoke(self, ctx: commands.Context[Any], /) -> None:
+        if ctx.command is None:
+            return await super().invoke(ctx)
+
+        self.profiler.label_current_task(
+            ctx.cog.qualified_name if ctx.cog else "(no cog)",
+            f"command:{ctx.command.qualified_name}"
+        )
+        start = time.perf_counter()
+        await super().invoke(ctx)
+        # Errors are dispatched to the error handler instead of being raised
+        status = "failed" if ctx.command_failed else "succeeded"
+        COMMAND_LATENCY.observe(time.perf_counter() - start, command=ctx.command.qualified_name, status=status)
 
     def add_persistent_views(self):
         """Adds persistent views that do not timeout."""
@@ -163,6 +310,7 @@ class Pidroid(commands.Bot):
         
         Should be called on command update or cog reload."""
         self.command_categories = register_categories(self)
+        self.command_index = CommandIndex(self.walk_commands(), previous=self.command_index)
 
     @property
     def token(self) -> str:
@@ -181,6 +329,12 @@ class Pidroid(commands.Bot):
         version_str = '.'.join((str(v) for i, v in enumerate(self.client_version) if i < 3))
         return f"{version_str} {self.client_version.commit_id}"
 
+    def owns_guild(self, guild_id: int | None) -> bool:
+        """Returns true if the periodic tasks of the guild are run by this cluster.
+
+        Periodic tasks which do not belong to a guild are run by the primary cluster."""
+        return self.cluster.owns_guild(guild_id)
+
     async def wait_until_guild_configurations_loaded(self):
         """Waits until the internal guild configuration cache is ready.
 
@@ -221,12 +375,27 @@ class Pidroid(commands.Bot):
 
     def remove_guild_prefixes(self, guild_id: int) -> None:
         """Removes guild prefixes from internal cache."""
-        _ = self.__cached_guild_prefixes.pop(guild_id)
+        _ = self.__cached_guild_prefixes.pop(guild_id, None)
+
+    async def __refresh_guild_prefixes(self, invalidation: Invalidation) -> None:
+        """Refreshes the cached prefixes of a guild after its configuration is written."""
+        guild_id = invalidation.guild_id
+        if invalidation.scope != CacheScope.guild_configuration or guild_id is None or not self.owns_guild(guild_id):
+            return
+        generation = self.api.invalidations.get_generation(invalidation.target)
+        config = await self.api.fetch_guild_configuration(guild_id)
+        # Another write may have been applied while the configuration was being fetched, its refresh stores it instead
+        if self.api.invalidations.get_generation(invalidation.target) != generation:
+            return
+        if config is None:
+            self.remove_guild_prefixes(guild_id)
+        else:
+            _ = self.update_guild_prefixes_from_config(guild_id, config)
 
     async def create_expiring_thread(self, message: Message, name: str, expire_timestamp: datetime.datetime, auto_archive_duration: ThreadArchiveDuration = 60):
         """Creates a new expiring thread"""
         thread = await message.create_thread(name=name, auto_archive_duration=auto_archive_duration)
-        await self.api.insert_expiring_thread(thread.id, expire_timestamp)
+        await self.api.insert_expiring_thread(thread.id, thread.guild.id, expire_timestamp)
         return thread
 
     async def fetch_case(self, guild_id: int, case_id: int) -> Case:
@@ -293,17 +462,27 @@ class Pidroid(commands.Bot):
         return channel
 
 
-    async def get_prefixes(self, message: Message) -> list[str]:
-        """Returns a string list of prefixes for a message using message's context."""
+    def get_prefixes_for_guild(self, guild_id: int | None) -> list[str]:
+        """Returns a string list of prefixes for the guild, or for messages outside of guilds if guild ID is None."""
         if not is_client_pidroid(self):
             return self.prefixes
 
-        if message.guild:
-            guild_prefixes = self.get_guild_prefixes(message.guild.id)
+        if guild_id is not None:
+            guild_prefixes = self.get_guild_prefixes(guild_id)
             if guild_prefixes:
-                return guild_prefixes or self.prefixes
+                return guild_prefixes
         return self.prefixes
 
+    async def get_prefixes(self, message: Message) -> list[str]:
+        """Returns a string list of prefixes for a message using message's context."""
+        return self.get_prefixes_for_guild(message.guild.id if message.guild else None)
+
+    def __get_recorded_prefixes(self, guild_id: int | None) -> list[str]:
+        """Returns the prefixes which the gateway recorder keeps in message contents, including the mentions of the client."""
+        if self.user is None:
+            return self.prefixes
+        return [f"<@{self.user.id}> ", f"<@!{self.user.id}> ", *self.get_prefixes_for_guild(guild_id)]
+
     @override
     async def get_prefix(self, message: Message):
         """Returns a prefix for client to respond to."""
@@ -341,16 +520,25 @@ class Pidroid(commands.Bot):
         # By now, we should be logged in
         is_pidroid = is_client_pidroid(self)
 
+        extensions: list[str] = []
         for ext in self._extensions_to_load:
-            logger.debug(f"Loading {ext}.")
             if not is_pidroid and _is_theotown_service(ext):
                 logger.info(f"Skipping loading {ext} as the current client is not Pidroid.")
                 continue
-            try:
-                await self.load_extension(ext)
-                logger.debug(f"Successfully loaded {ext}.")
-            except Exception:
-                logger.exception(f"Failed to load {ext}.")
+            extensions.append(ext)
+        await load_extensions(
+            self.load_extension, extensions, self._extension_dependencies, self.startup_report,
+            after=self._extension_load_order
+        )
+        await self.register_categories()
+
+        for ext in self._deferred_extensions:
+            _ = self.warmups.schedule(f"extension {ext}", partial(self.__load_deferred_extension, ext), priority=30)
+
+    async def __load_deferred_extension(self, name: str) -> None:
+        # The module is imported in a thread, so that the import does not block the event loop
+        _ = await asyncio.to_thread(importlib.import_module, name)
+        await self.load_extension(name)
         await self.register_categories()
 
     async def load_cogs(self):
@@ -422,18 +610,20 @@ class Pidroid(commands.Bot):
         self,
         event_type: EventType,
         event_name: EventName,
-        guild_id: int,
+        guild_id: int | None,
         target_id: Any,
-        responsible_id: int,
+        responsible_id: int | None,
         *,
-        extra: dict | None = None
+        extra: dict[str, Any] | None = None
     ):
-        """Logs the event to Pidroid's database."""
+        """Publishes the event to the event bus, from which it is streamed to Pidroid API clients."""
         logger.debug(f"{event_type.name}: {event_name.value} {guild_id=} {target_id=} {responsible_id=} {extra=}")
-
-
-        # TODO: implement
-        #self.dispatch(
-        #    'log_event',
-        #    event_type,
-        #)
+        self.__faststream_service.event_bus.publish({
+            "type": event_type.name,
+            "name": event_name.value,
+            "guild_id": guild_id,
+            "target_id": target_id,
+            "responsible_id": responsible_id,
+            "extra": extra or {},
+            "timestamp": discord.utils.utcnow().isoformat()
+        })
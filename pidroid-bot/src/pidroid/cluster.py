@@ -0,0 +1,138 @@
+"""Runs the bot as multiple processes, each connecting a range of shards.
+
+Every cluster is a separate bot process, which is restarted if it exits unexpectedly.
+The shard count defaults to the one recommended by Discord, rounded up to the cluster count.
+
+Usage:
+    cluster --clusters 4
+    cluster --clusters 4 --shards 16
+"""
+
+import aiohttp
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import sys
+
+from pidroid.utils.cluster import split_shards
+
+logger = logging.getLogger("pidroid.cluster")
+
+DISCORD_GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+
+# Seconds to wait before restarting a cluster, doubled on every consecutive quick exit
+RESTART_DELAY = 5.0
+MAX_RESTART_DELAY = 300.0
+
+# A cluster which ran for longer than this is considered healthy, which resets its restart delay
+HEALTHY_UPTIME = 60.0
+
+async def fetch_recommended_shard_count(token: str) -> int:
+    """Returns the shard count recommended by Discord."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(DISCORD_GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return int(data["shards"])
+
+class ClusterProcess:
+    """This class supervises the process of a single cluster."""
+
+    def __init__(self, cluster_id: int, cluster_count: int, shard_ids: list[int], shard_count: int) -> None:
+        super().__init__()
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.restarts = 0
+        self.__process: asyncio.subprocess.Process | None = None
+        self.__stopping = False
+
+    def get_environment(self) -> dict[str, str]:
+        """Returns the environment of the cluster process."""
+        return {
+            **os.environ,
+            "CLUSTER_ID": str(self.cluster_id),
+            "CLUSTER_COUNT": str(self.cluster_count),
+            "SHARD_COUNT": str(self.shard_count),
+            "SHARD_IDS": ",".join(str(shard_id) for shard_id in self.shard_ids),
+        }
+
+    async def run(self) -> None:
+        """Runs the cluster process until the cluster is stopped, restarting it whenever it exits."""
+        delay = RESTART_DELAY
+        loop = asyncio.get_running_loop()
+        while not self.__stopping:
+            logger.info(f"Starting cluster {self.cluster_id} with shards {self.shard_ids[0]}-{self.shard_ids[-1]}")
+            started_at = loop.time()
+            self.__process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "pidroid.main",
+                env=self.get_environment()
+            )
+            code = await self.__process.wait()
+            if self.__stopping:
+                break
+
+            if loop.time() - started_at > HEALTHY_UPTIME:
+                delay = RESTART_DELAY
+            logger.warning(f"Cluster {self.cluster_id} exited with code {code}, restarting in {delay:.0f} seconds")
+            self.restarts += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RESTART_DELAY)
+
+    def stop(self) -> None:
+        """Asks the cluster process to shut down gracefully."""
+        self.__stopping = True
+        if self.__process is not None and self.__process.returncode is None:
+            self.__process.send_signal(signal.SIGTERM)
+
+async def run_clusters(cluster_count: int, shard_count: int | None) -> None:
+    """Starts every cluster and waits until they are stopped by a signal."""
+    if shard_count is None:
+        token = os.environ.get("TOKEN")
+        if not token:
+            sys.exit("No bot token was specified. Please specify it using the TOKEN environment variable.")
+        recommended = await fetch_recommended_shard_count(token)
+        # Every cluster runs the same amount of shards
+        shard_count = -(-max(recommended, cluster_count) // cluster_count) * cluster_count
+        logger.info(f"Discord recommends {recommended} shards, using {shard_count}")
+
+    clusters = [
+        ClusterProcess(cluster_id, cluster_count, shard_ids, shard_count)
+        for cluster_id, shard_ids in enumerate(split_shards(shard_count, cluster_count))
+    ]
+
+    def stop_clusters() -> None:
+        logger.info("Stopping every cluster")
+        for cluster in clusters:
+            cluster.stop()
+
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop_clusters)
+
+    _ = await asyncio.gather(*(cluster.run() for cluster in clusters))
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the bot as multiple processes, each connecting a range of shards.")
+    _ = parser.add_argument(
+        "--clusters", type=int, default=int(os.environ.get("CLUSTER_COUNT", 1)),
+        help="amount of bot processes, defaults to the CLUSTER_COUNT environment variable or 1"
+    )
+    _ = parser.add_argument(
+        "--shards", type=int, default=int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else None,
+        help="total amount of shards, defaults to the SHARD_COUNT environment variable or the count recommended by Discord"
+    )
+    args = parser.parse_args()
+    if args.clusters < 1:
+        sys.exit("There must be at least one cluster.")
+    if args.shards is not None and args.shards < args.clusters:
+        sys.exit("There must be at least as many shards as there are clusters.")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_clusters(args.clusters, args.shards))
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 import asyncio
-import discord
 import random
 import re
 
 from discord.ext import commands
 from discord.ext.commands import BadArgument, Context, MissingRequiredArgument
+from typing import override
 
 from pidroid.client import Pidroid
 from pidroid.constants import JESSE_ID
@@ -13,7 +13,8 @@ from pidroid.services.error_handler import notify
 from pidroid.utils import http
 from pidroid.utils.decorators import command_checks
 from pidroid.utils.embeds import SuccessEmbed
-from pidroid.utils.file import Resource
+from pidroid.utils.file import resource_file
+from pidroid.utils.prefetch import PrefetchBuffer
 
 NEKO_API = "https://nekos.life/api/v2"
 NEKO_ENDPOINTS = [
@@ -58,6 +59,31 @@ class AnimeCommandCog(commands.Cog):
     def __init__(self, client: Pidroid):
         super().__init__()
         self.client = client
+        self.neko_images = PrefetchBuffer("neko", self.fetch_neko_image_url, NEKO_ENDPOINTS)
+        self.waifu_pics_media = PrefetchBuffer("waifu.pics", self.fetch_waifu_pics_media_url, WAIFU_PICS_ENDPOINTS)
+
+    @override
+    async def cog_load(self) -> None:
+        # Endpoints are only prefetched for once they are used
+        self.neko_images.start()
+        self.waifu_pics_media.start()
+
+    @override
+    async def cog_unload(self) -> None:
+        await self.neko_images.stop()
+        await self.waifu_pics_media.stop()
+
+    async def fetch_neko_image_url(self, endpoint: str) -> str:
+        """Returns a random image URL for the specified nekos.life endpoint."""
+        async with await http.get(self.client, f"{NEKO_API}/img/{endpoint}") as r:
+            data: dict[str, str] = await r.json()
+        return data["url"]
+
+    async def fetch_waifu_pics_media_url(self, endpoint: str) -> str:
+        """Returns a random media URL for the specified waifu.pics endpoint."""
+        async with await http.get(self.client, f"{WAIFU_PICS_API}/{endpoint}") as r:
+            data: dict[str, str] = await r.json()
+        return data["url"]
 
     @commands.command(
         name="yourebanned",
@@ -68,7 +94,7 @@ class AnimeCommandCog(commands.Cog):
     @commands.bot_has_permissions(send_messages=True, attach_files=True)
     async def yourebanned_command(self, ctx: Context[Pidroid]):
         async with ctx.typing():
-            return await ctx.reply(file=discord.File(Resource('you_were_banned.mp4')))
+            return await ctx.reply(file=resource_file('you_were_banned.mp4'))
 
     @commands.group(
         name="neko",
@@ -130,10 +156,9 @@ class AnimeCommandCog(commands.Cog):
 
         endpoint = endpoint.lower()
         if endpoint in NEKO_ENDPOINTS:
-            async with await http.get(self.client, f"{NEKO_API}/img/{endpoint}") as r:
-                data: dict[str, str] = await r.json()
+            url = await self.neko_images.get(endpoint)
             embed = SuccessEmbed()
-            embed.set_image(url=data["url"])
+            embed.set_image(url=url)
             embed.set_footer(text=endpoint)
             return await ctx.reply(embed=embed)
 
@@ -178,11 +203,10 @@ class AnimeCommandCog(commands.Cog):
                 'Wrong media type specified. '
                 'The allowed types are: `' + ', '.join(WAIFU_PICS_ENDPOINTS) + '`.'
             ))
-        async with await http.get(self.client, f"{WAIFU_PICS_API}/{endpoint}") as r:
-            data: dict[str, str] = await r.json()
+        url = await self.waifu_pics_media.get(endpoint)
 
         embed = SuccessEmbed()
-        embed.set_image(url=data["url"])
+        embed.set_image(url=url)
         embed.set_footer(text=endpoint)
         await ctx.reply(embed=embed)
 
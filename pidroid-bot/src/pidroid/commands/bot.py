@@ -1,19 +1,25 @@
 import discord
 import os
 import platform
-import psutil
 import sys
 
 from discord.ext import commands
 from discord.ext.commands import Context
 from discord.message import Message
+from typing import TYPE_CHECKING
 
 from pidroid.client import Pidroid
 from pidroid.constants import ALLOWED_MENTIONS
 from pidroid.models.categories import BotCategory
 from pidroid.utils.embeds import PidroidEmbed
+from pidroid.utils.lazy import LazyModule
 from pidroid.utils.time import humanize, timestamp_to_date, utcnow
 
+if TYPE_CHECKING:
+    import psutil
+else:
+    psutil = LazyModule("psutil")
+
 class BotCommandCog(commands.Cog):
     """This class implements cog which contains commands primarily used to diagnose Pidroid."""
 
@@ -10,7 +10,7 @@ from discord.partial_emoji import PartialEmoji
 from pidroid.client import Pidroid
 from pidroid.models.categories import UtilityCategory
 from pidroid.services.error_handler import notify
-from pidroid.utils import http
+from pidroid.utils.assets import read_asset
 from pidroid.utils.embeds import PidroidEmbed
 
 EMOJI_FIND_PATTERN = re.compile(r'<(a:.+?:\d+|:.+?:\d+)>')
@@ -102,8 +102,7 @@ class EmojiCommandCog(commands.Cog):
             raise BadArgument("Please select the correct index of the emoji you want to copy.")
 
         # Get emoji picture
-        async with await http.get(self.client, str(partial_emoji.url)) as r:
-            payload = await r.read()
+        payload = await read_asset(self.client, str(partial_emoji.url))
 
         try:
             emoji: Emoji = await ctx.guild.create_custom_emoji(
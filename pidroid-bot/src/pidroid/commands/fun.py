@@ -15,7 +15,7 @@ from pidroid.models.categories import RandomCategory
 from pidroid.services.error_handler import notify
 from pidroid.utils.checks import assert_bot_channel_permissions
 from pidroid.utils.decorators import command_checks
-from pidroid.utils.file import Resource
+from pidroid.utils.file import Resource, resource_file
 
 CLOAKER_LINES = [
     'cloaker_1', 'cloaker_2', 'cloaker_3',
@@ -24,11 +24,11 @@ CLOAKER_LINES = [
 ]
 
 PINGU_RESPONSES = [
-    ('Ooga booga', Resource('pingutroll.gif')),
-    ('I can\'t read lol', Resource('pinguread.gif')),
-    ('NOOT NOOT!', Resource('pingunoot.gif')),
-    ('Spotify premium be like:', Resource('pingumusic.gif')),
-    ('NOOT NOOT',  Resource('pingu.png'))
+    ('Ooga booga', 'pingutroll.gif'),
+    ('I can\'t read lol', 'pinguread.gif'),
+    ('NOOT NOOT!', 'pingunoot.gif'),
+    ('Spotify premium be like:', 'pingumusic.gif'),
+    ('NOOT NOOT',  'pingu.png')
 ]
 
 FUN_FACTS = [
@@ -104,8 +104,8 @@ class FunCommandCog(commands.Cog):
     @commands.bot_has_permissions(send_messages=True, attach_files=True)
     async def pingu_command(self, ctx: Context[Pidroid]):
         async with ctx.typing():
-            text, file_path = random.choice(PINGU_RESPONSES) # nosec
-            _ = await ctx.reply(text, file=discord.File(file_path))
+            text, resource_name = random.choice(PINGU_RESPONSES) # nosec
+            _ = await ctx.reply(text, file=resource_file(resource_name))
 
     @commands.command(
         name="sloth",
@@ -115,7 +115,7 @@ class FunCommandCog(commands.Cog):
     @commands.bot_has_permissions(send_messages=True, attach_files=True)
     async def sloth_command(self, ctx: Context[Pidroid]):
         async with ctx.typing():
-            _ = await ctx.reply(content="The myth, the legend.", file=discord.File(Resource('sloth.gif')))
+            _ = await ctx.reply(content="The myth, the legend.", file=resource_file('sloth.gif'))
 
     @commands.command(
         name="fire",
@@ -129,7 +129,7 @@ class FunCommandCog(commands.Cog):
             _ = await ctx.reply(
                 content="There's a fire somewhere? Call <@326167365677219840> to the rescue!",
                 allowed_mentions=AllowedMentions(users=False),
-                file=discord.File(Resource('evan.png'))
+                file=resource_file('evan.png')
             )
 
     @commands.command(
@@ -12,7 +12,6 @@ from typing import TYPE_CHECKING, override
 from pidroid.client import Pidroid
 from pidroid.models.categories import Category, BotCategory, get_command_documentation, get_command_usage, get_full_command_name
 from pidroid.models.view import PaginatingView
-from pidroid.utils import get_function_decorators
 from pidroid.utils.embeds import PidroidEmbed
 from pidroid.utils.paginators import ListPageSource
 from pidroid.utils.time import HELP_DURATION_FORMATTING
@@ -163,15 +162,6 @@ class HelpCommandCog(commands.Cog):
         self.client = client
         self.show_usable = True
 
-    def search_command(self, query: str) -> Command | None:
-        """Returns a single command matching the query."""
-        lowercase_query = query.lower()
-        for command in self.client.walk_commands():
-            if (get_full_command_name(command) == lowercase_query
-                and not command.hidden):
-                return command
-        return None
-
     @commands.hybrid_command(
         name="help",
         brief="Returns the help menu with all the commands that you can use.",
@@ -194,8 +184,9 @@ class HelpCommandCog(commands.Cog):
             return await view.send()
         
         # Search commands
-        command = self.search_command(search_string)
-        if command:
+        indexed = self.client.command_index.find(search_string)
+        if indexed:
+            command = indexed.command
             prefix = ctx.prefix or "P"
             embed = PidroidEmbed(
                 title=f"{get_full_command_name(command)}",
@@ -208,20 +199,11 @@ class HelpCommandCog(commands.Cog):
                 embed.add_field(name="Aliases", value=', '.join(command.aliases), inline=False)
 
             # Display the requirements to run the command
-            requirements = []
-            for decorator in get_function_decorators(command.callback):
-                print(decorator)
-                if decorator.is_a_check():
-                    requirements.append("- " + decorator.requirement_text)
-            if requirements:
-                embed.add_field(name="Run requirements", value='\n'.join(requirements))
+            if indexed.requirements:
+                embed.add_field(name="Run requirements", value='\n'.join("- " + r for r in indexed.requirements))
 
             # Display whether the command can be ran
-            can_run = False
-            try:
-                can_run = await command.can_run(ctx)
-            except Exception:
-                pass
+            can_run = await self.client.command_index.can_run(ctx, indexed)
             embed.add_field(name="Can you run it here?", value="Yes" if can_run else "No")
 
             # List custom examples
@@ -237,7 +219,12 @@ class HelpCommandCog(commands.Cog):
 
             return await ctx.reply(embed=embed)
 
-
+        suggestions = self.client.command_index.suggest(search_string)
+        if suggestions:
+            raise BadArgument(
+                "I could not find any commands matching your query. "
+                f"Did you mean {', '.join(f'``{name}``' for name in suggestions)}?"
+            )
         raise BadArgument("I could not find any commands matching your query.")
 
 async def setup(client: Pidroid) -> None:
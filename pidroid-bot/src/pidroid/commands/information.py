@@ -171,6 +171,7 @@ class InformationCommandCog(commands.Cog):
             _ = embed.add_field(name=f'Roles [{role_count:,}]', value=roles, inline=True)
             # Obtain join position, if possible
             if user.joined_at is not None:
+                await self.client.member_chunker.ensure_chunked(ctx.guild)
                 pos = sum(m.joined_at < user.joined_at for m in ctx.guild.members if m.joined_at is not None) + 1
                 _ = embed.add_field(name='Join Position', value=f'{pos:,}', inline=True)
             _ = embed.add_field(name='Permissions', value=', '.join(permissions) + '.', inline=False)
@@ -269,6 +270,8 @@ class InformationCommandCog(commands.Cog):
         if not roles:
             raise BadArgument("This server does not have any roles")
 
+        # Member counts of the roles need every member
+        await self.client.member_chunker.ensure_chunked(ctx.guild)
         view = PaginatingView(client=self.client, ctx=ctx, source=RolePaginator(
             f"Roles in {ctx.guild.name}",
             roles
@@ -6,7 +6,6 @@ from datetime import timedelta
 from discord import (
     app_commands,
     Color,
-    File,
     Member,
     Message,
     Object,
@@ -23,7 +22,7 @@ from pidroid.modules.moderation.models.types import Timeout2
 from pidroid.utils.aliases import MessageableGuildChannel, MessageableGuildChannelTuple
 from pidroid.utils.checks import is_guild_moderator
 from pidroid.utils.decorators import command_checks
-from pidroid.utils.file import Resource
+from pidroid.utils.file import resource_file
 from pidroid.utils.time import delta_to_datetime
 
 logger = logging.getLogger("pidroid.legacy-moderation")
@@ -141,7 +140,7 @@ class ModerationCommandCog(commands.Cog):
         assert isinstance(ctx.channel, MessageableGuildChannelTuple)
         await ctx.message.delete(delay=0)
         _ = await ctx.channel.purge(limit=1)
-        _ = await ctx.send(file=File(Resource('delete_this.png')))
+        _ = await ctx.send(file=resource_file('delete_this.png'))
 
     @commands.hybrid_command(
         name="suspend",
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import aiofiles
+import asyncio
+import copy
 import discord
+import io
 import logging
 import os
 import sys
@@ -14,13 +17,24 @@ from pidroid.client import Pidroid
 from pidroid.constants import JUSTANYONE_ID, TEMPORARY_FILE_PATH
 from pidroid.models.categories import OwnerCategory
 from pidroid.utils.aliases import DiscordUser
+from pidroid.utils.cache import get_caches
 from pidroid.utils.checks import member_has_guild_permission
-from pidroid.utils.data import PersistentDataStore
 from pidroid.utils.decorators import command_checks
 from pidroid.utils.embeds import ErrorEmbed
+from pidroid.utils.file import asset_store
+from pidroid.utils.profiler import ProfileResult
 
 logger = logging.getLogger('Pidroid')
 
+# Longest allowed profiling session in seconds
+MAX_PROFILE_DURATION = 300
+
+# Longest allowed memory tracing session in seconds
+MAX_MEMORY_REPORT_DURATION = 600
+
+def _get_profile_file(result: ProfileResult) -> discord.File:
+    return discord.File(io.BytesIO(result.to_collapsed().encode("utf-8")), "profile.collapsed.txt")
+
 class OwnerCommandCog(commands.Cog):
     """This class implements a cog for special bot owner only commands."""
     
@@ -98,10 +112,9 @@ class OwnerCommandCog(commands.Cog):
     @commands.bot_has_permissions(send_messages=True)
     async def show_data_store_command(self, ctx: Context[Pidroid]):
         string = ""
-        async with PersistentDataStore() as store:
-            for key in await store.keys():
-                val = await store.get(key)
-                string += f"{key}: {val}\n"
+        store = self.client.data_store
+        for key in store.keys():
+            string += f"{key}: {store.get(key)}\n"
         return await ctx.reply(
             f"Displaying values stored in persistent data store:\n\n{string.strip()}"
         )
@@ -114,8 +127,8 @@ class OwnerCommandCog(commands.Cog):
     @commands.is_owner()
     @commands.bot_has_permissions(send_messages=True)
     async def set_data_store_command(self, ctx: Context[Pidroid], key: str, value: str):
-        async with PersistentDataStore() as store:
-            await store.set(key, value)
+        self.client.data_store.set(key, value)
+        await self.client.data_store.flush()
         return await ctx.reply(
             f"Set the data store value with key '{key}' to '{value}'"
         )
@@ -128,14 +141,202 @@ class OwnerCommandCog(commands.Cog):
     @commands.is_owner()
     @commands.bot_has_permissions(send_messages=True)
     async def get_data_store_command(self, ctx: Context[Pidroid], key: str):
-        async with PersistentDataStore() as store:
-            value = await store.get(key)
+        value = self.client.data_store.get(key)
         if value is None:
             raise BadArgument(f"Data store does not have a value for key '{key}'")
         return await ctx.reply(
             f"The data store value for key '{key}' is {value}"
         )
 
+    @commands.command(
+        name="show-cache-statistics",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True)
+    async def show_cache_statistics_command(self, ctx: Context[Pidroid]):
+        string = ""
+        for name, cache in sorted(get_caches().items()):
+            stats = cache.statistics
+            string += (
+                f"{name}: {len(cache)}/{cache.max_size} entries, {stats.hit_rate:.1%} hit rate "
+                f"({stats.hits} hits, {stats.stale_hits} stale hits, {stats.misses} misses)\n"
+            )
+        if string == "":
+            raise BadArgument("No caches have been created yet")
+        return await ctx.reply(
+            f"Displaying statistics of the response caches:\n\n{string.strip()}"
+        )
+
+    @commands.command(
+        name="show-asset-usage",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True)
+    async def show_asset_usage_command(self, ctx: Context[Pidroid]):
+        string = ""
+        # Only the most sent resources fit into a single message
+        for usage in asset_store.usage()[:15]:
+            string += (
+                f"{usage.name}: {usage.size} bytes, {'in memory' if usage.resident else 'on disk'}, "
+                f"sent {usage.memory_sends} times from memory and {usage.disk_sends} times from disk\n"
+            )
+        if string == "":
+            raise BadArgument("No resources have been loaded yet")
+        return await ctx.reply(
+            f"Displaying resource usage, {asset_store.size}/{asset_store.max_size} bytes in memory:\n\n{string.strip()}"
+        )
+
+    @commands.command(
+        name="show-startup-report",
+        brief="Shows how long the startup phases, extension loads and warm-ups took.",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True)
+    async def show_startup_report_command(self, ctx: Context[Pidroid]):
+        pending = self.client.warmups.pending
+        string = f"Displaying the startup report:\n```\n{self.client.startup_report.format()}\n```"
+        if pending:
+            string += f"\nWarm-ups still pending: {', '.join(sorted(pending))}"
+        return await ctx.reply(string)
+
+    @commands.command(
+        name="show-lag-incidents",
+        brief="Sends the recent event loop lag incidents along with the stacks that blocked the loop.",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True, attach_files=True)
+    async def show_lag_incidents_command(self, ctx: Context[Pidroid]):
+        incidents = self.client.watchdog.incidents
+        if not incidents:
+            raise BadArgument("No event loop lag incidents have been recorded")
+
+        report = ""
+        for incident in reversed(incidents):
+            duration = "ongoing" if incident.duration is None else f"{incident.duration:.3f} seconds"
+            report += (
+                f"{incident.started_at.isoformat()}: blocked for {duration} at {incident.frame}\n"
+                f"{incident.stack}\n"
+            )
+        return await ctx.reply(
+            f"Displaying {len(incidents)} recent event loop lag incidents, latest first. "
+            f"Latest was at {incidents[-1].frame}",
+            file=discord.File(io.BytesIO(report.encode("utf-8")), "lag_incidents.txt")
+        )
+
+    @commands.command(
+        name="profile",
+        brief="Samples the bot for the specified amount of seconds and sends a collapsed stack profile.",
+        usage="[seconds]",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True, attach_files=True)
+    async def profile_command(self, ctx: Context[Pidroid], seconds: float = 30):
+        if self.client.profiler.running:
+            raise BadArgument("Profiler is already running")
+        if not 0 < seconds <= MAX_PROFILE_DURATION:
+            raise BadArgument(f"Profile duration must be between 0 and {MAX_PROFILE_DURATION} seconds")
+
+        _ = await ctx.reply(f"Profiling for {seconds} seconds, use profile-stop to stop earlier")
+        result = await self.client.profiler.run(seconds)
+        return await ctx.reply(
+            f"Collected {result.sample_count} samples over {result.duration:.1f} seconds",
+            file=_get_profile_file(result)
+        )
+
+    @commands.command(
+        name="profile-stop",
+        brief="Stops the running profile early.",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True)
+    async def profile_stop_command(self, ctx: Context[Pidroid]):
+        if not self.client.profiler.running:
+            raise BadArgument("Profiler is not running")
+        self.client.profiler.request_stop()
+        return await ctx.reply("Profiler will be stopped")
+
+    @commands.command(
+        name="profile-command",
+        brief="Invokes the specified command and sends a collapsed stack profile of its invocation.",
+        usage="<command>",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True, attach_files=True)
+    async def profile_command_command(self, ctx: Context[Pidroid], *, command: str):
+        if self.client.profiler.running:
+            raise BadArgument("Profiler is already running")
+
+        message = copy.copy(ctx.message)
+        message.content = f"{ctx.prefix}{command}"
+        command_ctx = await self.client.get_context(message)
+        if command_ctx.command is None:
+            raise BadArgument("Specified command could not be found")
+
+        # The command is invoked within this task, therefore only its samples are kept
+        self.client.profiler.start(only_task=asyncio.current_task())
+        try:
+            await self.client.invoke(command_ctx)
+        finally:
+            result = self.client.profiler.stop()
+        return await ctx.reply(
+            f"Collected {result.sample_count} samples over {result.duration:.3f} seconds "
+            f"while invoking {command_ctx.command.qualified_name}",
+            file=_get_profile_file(result)
+        )
+
+    @commands.command(
+        name="memory-report",
+        brief="Traces the allocations for the specified amount of seconds and sends the allocation sites which grew the most.",
+        usage="[seconds]",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True, attach_files=True)
+    async def memory_report_command(self, ctx: Context[Pidroid], seconds: float = 60):
+        if self.client.memory_tracer.running:
+            raise BadArgument("Memory tracer is already running")
+        if not 0 < seconds <= MAX_MEMORY_REPORT_DURATION:
+            raise BadArgument(f"Memory report duration must be between 0 and {MAX_MEMORY_REPORT_DURATION} seconds")
+
+        _ = await ctx.reply(f"Tracing allocations for {seconds} seconds, use memory-report-stop to stop earlier")
+        report = await self.client.memory_tracer.run(seconds)
+        chunked, cached, total = self.client.member_chunker.get_statistics(self.client.guilds)
+        return await ctx.reply(
+            f"Traced memory changed by {report.growth / 1024:+,.1f} KiB over {report.duration:.1f} seconds.\n"
+            f"{cached:,} of {total:,} members are cached, {chunked}/{len(self.client.guilds)} guilds are chunked "
+            f"with the {self.client.member_chunker.policy.value} member cache policy.",
+            file=discord.File(io.BytesIO(report.to_text().encode("utf-8")), "memory_report.txt")
+        )
+
+    @commands.command(
+        name="memory-report-stop",
+        brief="Finishes the running memory report early.",
+        category=OwnerCategory,
+        hidden=True
+    )
+    @commands.is_owner()
+    @commands.bot_has_permissions(send_messages=True)
+    async def memory_report_stop_command(self, ctx: Context[Pidroid]):
+        if not self.client.memory_tracer.running:
+            raise BadArgument("Memory tracer is not running")
+        self.client.memory_tracer.request_stop()
+        return await ctx.reply("Memory report will be finished")
+
     @commands.command(
         name="load-temp-extension",
         brief="Loads a temporary extension that will not survive a restart.",
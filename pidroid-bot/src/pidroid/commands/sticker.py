@@ -55,7 +55,7 @@ class StickerCommandCog(commands.Cog):
 
         assert isinstance(sticker, GuildSticker)
 
-        b = BytesIO(await sticker.read())
+        b = BytesIO(await self.client.asset_cache.get_or_fetch(sticker.url, sticker.read))
         try:
             # Returns bad request, possible problem with the library, henceforth, the command is disabled
             added_sticker: GuildSticker = await ctx.guild.create_sticker(
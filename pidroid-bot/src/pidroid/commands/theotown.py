@@ -2,12 +2,12 @@ import base64
 import logging
 import random
 
-from discord import File
+from discord import File, Interaction, app_commands
 from discord.ext import commands
 from discord.ext.commands import BadArgument, MissingRequiredArgument
 from discord.ext.commands.context import Context
 from io import BytesIO
-from typing import TypedDict
+from typing import Any, TypedDict
 
 from pidroid.client import Pidroid
 from pidroid.constants import THEOTOWN_GUILD
@@ -15,7 +15,9 @@ from pidroid.models.categories import TheoTownCategory
 from pidroid.models.exceptions import APIException
 from pidroid.models.view import PaginatingView
 from pidroid.services.error_handler import notify
-from pidroid.utils import http, format_version_code
+from pidroid.utils import http, format_version_code, truncate_string
+from pidroid.utils.api import API
+from pidroid.utils.cache import cached
 from pidroid.utils.decorators import command_checks
 from pidroid.utils.embeds import PidroidEmbed
 from pidroid.utils.http import Route
@@ -37,6 +39,25 @@ def resolve_gallery_mode(query: str | None) -> str | None:
         return "rating"
     return None
 
+@cached("theotown_versions", ttl=5 * 60, stale_ttl=60 * 60, max_size=1, key=lambda client: None)
+async def fetch_game_versions(client: Pidroid) -> dict[str, dict[str, Any]]:
+    """Returns the latest game versions of TheoTown for every platform."""
+    async with await http.get(client, "https://bd.theotown.com/get_version") as response:
+        return await response.json()
+
+@cached("theotown_version_urls", ttl=24 * 60 * 60, max_size=64, key=lambda api, version: version)
+async def lookup_version_url(api: API, version: str) -> str | None:
+    """Returns the forum post URL for the specified game version, if one exists."""
+    logger.info(f'URL for version {version} not found in internal cache, querying the API')
+    try:
+        data = await api.legacy_get(Route(
+            "/forum/post/lookup_version",
+            {"query": version}
+        ))
+    except APIException:
+        return None
+    return data["url"]
+
 class ScreenshotDict(TypedDict):
     name: str
     image_url: str
@@ -57,37 +78,19 @@ class TheoTownCommandCog(commands.Cog):
     @commands.cooldown(rate=1, per=5, type=commands.BucketType.user)
     async def version(self, ctx: Context[Pidroid]):
         async with ctx.typing():
-            cache = self.client.version_cache
             embed = PidroidEmbed(title="Most recent versions of TheoTown")
-            async with await http.get(self.client, "https://bd.theotown.com/get_version") as response:
-                version_data = await response.json()
+            version_data = await fetch_game_versions(self.client)
             for version_name in version_data:
                 # Ignore Amazon since it's not updated
                 if version_name == 'Amazon':
                     continue
 
                 version = format_version_code(version_data[version_name]['version'])
-                url: str | None = None
-                if version not in cache or cache[version] is None:
-                    logger.info(f'URL for version {version} not found in internal cache, querying the API')
-                    
-                    try:
-                        data = await self.api.legacy_get(Route(
-                            "/forum/post/lookup_version",
-                            {"query": version}
-                        ))
-                        url = data["url"]
-                        logger.info(f'Version URL found, internal cache updated with {url}')
-                    except APIException:
-                        pass
-
-                    cache[version] = url
-                url = cache[version]
+                url = await lookup_version_url(self.api, version)
                 value = f'[{version}]({url})'
                 if url is None:
                     value = version
                 _ = embed.add_field(name=version_name, value=value)
-            self.client.version_cache = cache
             _ = embed.set_footer(text='Note: this will also include versions which are not yet available to regular users.')
             return await ctx.reply(embed=embed)
 
@@ -102,7 +105,7 @@ class TheoTownCommandCog(commands.Cog):
     @commands.max_concurrency(number=3, per=commands.BucketType.guild)
     async def online(self, ctx: Context[Pidroid]):
         async with ctx.typing():
-            data = await self.api.legacy_get(Route("/game/region/statistics"))
+            data = await self.api.legacy_get(Route("/game/region/statistics"), cache_ttl=60)
 
             total_plots: int = data["plots"]["total"]
             free_plots: int = data["plots"]["free"]
@@ -151,7 +154,7 @@ class TheoTownCommandCog(commands.Cog):
         async with ctx.typing():
             data = await self.client.api.legacy_get(Route(
                 "/game/gallery/list", {"mode": selected_mode, "limit": number}
-            ))
+            ), cache_ttl=60)
             screenshot: ScreenshotDict = data[number - 1]
 
             embed = (
@@ -161,7 +164,7 @@ class TheoTownCommandCog(commands.Cog):
             )
             return await ctx.reply(embed=embed)
 
-    @commands.group(
+    @commands.hybrid_group(
         name='find-plugin',
         brief='Searches the plugin store for the specified plugin.',
         usage='<query>',
@@ -174,6 +177,7 @@ class TheoTownCommandCog(commands.Cog):
         invoke_without_command=True,
         fallback="search",
     )
+    @app_commands.describe(query="Plugin name, author or description to search for.")
     @commands.bot_has_permissions(send_messages=True)
     @commands.cooldown(rate=2, per=10, type=commands.BucketType.user)
     async def find_plugin_command(self, ctx: Context[Pidroid], *, query: str):
@@ -198,6 +202,17 @@ class TheoTownCommandCog(commands.Cog):
 
             return await ctx.reply(embed=plugin_list[0].to_embed())
 
+    @find_plugin_command.autocomplete("query")
+    async def find_plugin_query_autocomplete(self, interaction: Interaction, current: str) -> list[app_commands.Choice[str]]:
+        entries = self.api.plugin_catalog.search(current, limit=25)
+        return [
+            app_commands.Choice(
+                name=truncate_string(f"{entry.name} by {entry.author}", 100),
+                value=truncate_string(entry.name, 30, replace_value="")
+            )
+            for entry in entries
+        ]
+
     @find_plugin_command.error
     async def on_find_plugin_command_error(self, ctx: Context[Pidroid], error: Exception):
         if isinstance(error, MissingRequiredArgument):
@@ -211,6 +226,7 @@ class TheoTownCommandCog(commands.Cog):
         usage='<plugin_id>',
         category=TheoTownCategory,
     )
+    @app_commands.describe(plugin_id="ID of the plugin to find.")
     @commands.bot_has_permissions(send_messages=True)
     @commands.cooldown(rate=2, per=10, type=commands.BucketType.user)
     async def find_plugin_by_id_command(self, ctx: Context[Pidroid], plugin_id: int):
@@ -12,6 +12,7 @@ from pidroid.models.categories import UtilityCategory
 from pidroid.models.view import PaginatingView
 from pidroid.utils import http, truncate_string
 from pidroid.utils.aliases import MessageableGuildChannelTuple
+from pidroid.utils.cache import cached
 from pidroid.utils.converters import Datetime, Duration
 from pidroid.utils.db.reminder import Reminder
 from pidroid.utils.embeds import PidroidEmbed
@@ -30,6 +31,17 @@ def parse_urban_text(string: str) -> str:
     text = re.sub(MARKDOWN_URL_PATTERN, term_to_url, string)
     return truncate_string(text, 1000)
 
+@cached(
+    "urban_dictionary", ttl=60 * 60, stale_ttl=60 * 60 * 23, max_size=512,
+    key=lambda client, query: query.lower()
+)
+async def fetch_urban_definitions(client: Pidroid, query: str) -> list[dict[str, Any]]:
+    """Returns Urban Dictionary definitions for the specified term."""
+    url = "https://api.urbandictionary.com/v0/define?term=" + urlencode(query)
+    async with await http.get(client, url) as response:
+        data: dict[str, list[Any]] = await response.json()
+    return data['list']
+
 
 class ReminderPaginator(ListPageSource):
     def __init__(self, title: str, data: list[Reminder], extended: bool = False):
@@ -65,10 +77,7 @@ class UtilityCommandCog(commands.Cog):
     @commands.bot_has_permissions(send_messages=True)
     async def urban(self, ctx: Context[Pidroid], *, query: str):
         async with ctx.typing():
-            url = "https://api.urbandictionary.com/v0/define?term=" + urlencode(query)
-            async with await http.get(self.client, url) as response:
-                data: dict[str, list[Any]] = await response.json()
-            definitions = data['list']
+            definitions = await fetch_urban_definitions(self.client, query)
 
             # Checks if definition exists
             if not definitions:
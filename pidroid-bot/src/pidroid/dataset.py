@@ -0,0 +1,535 @@
+"""Generates a synthetic dataset for scale testing the database layer.
+
+Guild sizes follow a power law, so that a few guilds are huge and most are tiny, like in
+production. Rows are bulk loaded with COPY. Afterwards, every database method of the API
+is called against the largest, a median and the smallest guild and their latencies are reported.
+
+The tables are expected to be created by migrate beforehand. As generated rows would be mixed
+with existing ones, tables which are not empty are only used if --truncate is specified.
+
+Usage:
+    migrate
+    dataset --scale 0.1 --truncate
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from discord import Message
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from typing import Any
+
+from pidroid.client import Pidroid
+from pidroid.main import offline_config
+from pidroid.models.guild_configuration import GuildConfiguration
+from pidroid.modules.moderation.models.case import Case
+from pidroid.modules.moderation.models.types import PunishmentType
+from pidroid.utils.time import utcnow
+
+logger = logging.getLogger("pidroid.dataset")
+
+# Rows generated with a scale of 1
+DEFAULT_GUILDS = 5_000
+DEFAULT_LEVELS = 5_000_000
+DEFAULT_PUNISHMENTS = 1_000_000
+DEFAULT_TAGS = 200_000
+DEFAULT_REMINDERS = 300_000
+DEFAULT_TRANSLATIONS = 1_000_000
+
+# Exponent of the power law of guild sizes, the higher it is, the more rows the largest guilds hold
+DEFAULT_SKEW = 1.1
+
+COPY_BATCH_SIZE = 50_000
+
+GUILD_ID_BASE = 100_000_000_000_000_000
+USER_ID_BASE = 200_000_000_000_000_000
+SNOWFLAKE_BASE = 300_000_000_000_000_000
+
+MAX_LEVEL = 150
+XP_TO_NEXT_LEVEL = [5 * (level ** 2) + (50 * level) + 100 for level in range(MAX_LEVEL + 1)]
+XP_FOR_LEVEL = [sum(XP_TO_NEXT_LEVEL[:level]) for level in range(MAX_LEVEL + 1)]
+
+PUNISHMENT_TYPES = ["warning", "timeout", "kick", "ban", "jail"]
+PUNISHMENT_WEIGHTS = [50, 20, 10, 10, 10]
+THEMES = [None] * 20 + ["blue", "brown", "green", "orange", "purple", "red", "white", "yellow", "ja"]
+LANGUAGES = ["EN", "DE", "LT", "RU", "PL", "FR", "ES", "PT", "NL", "CS"]
+WORDS = (
+    "city build road airport money plugin update bug crash train bus zone power water "
+    "park tree house tower bridge river road tax budget disaster rank level tag help"
+).split()
+
+@dataclass
+class GeneratedGuild:
+    id: int
+    members: int
+    punishments: int
+    tags: int
+    # Offset of the first member in the user pool
+    member_offset: int
+
+@dataclass
+class Dataset:
+    guilds: list[GeneratedGuild]
+    # Amount of distinct users, members of every guild are a window of this pool
+    user_pool: int
+    reminder_users: int
+    translations: int
+    seed: int
+
+    def get_user_id(self, guild: GeneratedGuild, member: int) -> int:
+        """Returns the user ID of the specified member of the guild."""
+        return USER_ID_BASE + (guild.member_offset + member) % self.user_pool
+
+    def get_tiers(self) -> dict[str, GeneratedGuild]:
+        """Returns the largest, a median and the smallest guild."""
+        by_size = sorted(self.guilds, key=lambda guild: guild.members, reverse=True)
+        return {"largest": by_size[0], "median": by_size[len(by_size) // 2], "smallest": by_size[-1]}
+
+def distribute(total: int, count: int, skew: float) -> list[int]:
+    """Returns how the total is split between count buckets when bucket sizes follow a power law."""
+    weights = [1 / (rank ** skew) for rank in range(1, count + 1)]
+    weight_sum = sum(weights)
+    return [max(1, round(total * weight / weight_sum)) for weight in weights]
+
+def create_dataset(scale: float, skew: float, seed: int) -> Dataset:
+    """Returns the shape of the dataset for the specified scale."""
+    guild_count = max(3, round(DEFAULT_GUILDS * scale))
+    members = distribute(round(DEFAULT_LEVELS * scale), guild_count, skew)
+    punishments = distribute(round(DEFAULT_PUNISHMENTS * scale), guild_count, skew)
+    tags = distribute(round(DEFAULT_TAGS * scale), guild_count, skew)
+    # Users are members of several guilds, the pool only has to fit the largest one
+    user_pool = members[0] * 4
+    rng = random.Random(seed)
+    guilds = [
+        GeneratedGuild(GUILD_ID_BASE + i, members[i], punishments[i], tags[i], rng.randrange(user_pool))
+        for i in range(guild_count)
+    ]
+    return Dataset(
+        guilds=guilds,
+        user_pool=user_pool,
+        reminder_users=max(1, round(DEFAULT_REMINDERS * scale)),
+        translations=max(1, round(DEFAULT_TRANSLATIONS * scale)),
+        seed=seed
+    )
+
+def _sentence(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+def _skewed_index(rng: random.Random, size: int) -> int:
+    """Returns an index below size, with low indexes being a lot more likely."""
+    return min(int(rng.paretovariate(1.2)) - 1, size - 1)
+
+def generate_levels(dataset: Dataset, rng: random.Random) -> Iterator[tuple[Any, ...]]:
+    for guild in dataset.guilds:
+        for member in range(guild.members):
+            level = min(int((rng.paretovariate(1.3) - 1) * 4), MAX_LEVEL)
+            current_xp = rng.randrange(XP_TO_NEXT_LEVEL[level])
+            yield (
+                guild.id, dataset.get_user_id(guild, member), XP_FOR_LEVEL[level] + current_xp,
+                current_xp, XP_TO_NEXT_LEVEL[level], level, rng.choice(THEMES)
+            )
+
+def generate_punishments(dataset: Dataset, rng: random.Random) -> Iterator[tuple[Any, ...]]:
+    now = utcnow()
+    history = datetime.timedelta(days=3 * 365)
+    for guild in dataset.guilds:
+        moderators = 2 + guild.members // 5_000
+        for case_id in range(1, guild.punishments + 1):
+            # Cases are numbered in the order they were issued
+            issue_date = now - history + history * (case_id / (guild.punishments + 1))
+            punishment_type = rng.choices(PUNISHMENT_TYPES, PUNISHMENT_WEIGHTS)[0]
+            expire_date = None
+            if punishment_type == "timeout":
+                expire_date = issue_date + datetime.timedelta(hours=rng.randint(1, 24 * 7))
+            elif punishment_type in ("ban", "jail") and rng.random() < 0.3:
+                expire_date = issue_date + datetime.timedelta(days=rng.randint(1, 90))
+            # A few expired bans are left for the expired ban task to handle
+            handled = expire_date is not None and expire_date < now and rng.random() > 0.01
+            user_id = dataset.get_user_id(guild, rng.randrange(guild.members))
+            moderator_id = dataset.get_user_id(guild, rng.randrange(moderators))
+            yield (
+                case_id, punishment_type, guild.id, user_id, f"user-{user_id % 1_000_000}",
+                moderator_id, f"moderator-{moderator_id % 1_000_000}", _sentence(rng, rng.randint(2, 12)),
+                issue_date, expire_date, handled, rng.random() > 0.02
+            )
+
+def generate_punishment_counters(dataset: Dataset) -> Iterator[tuple[Any, ...]]:
+    for guild in dataset.guilds:
+        yield (guild.id, guild.punishments)
+
+def get_tag_name(index: int) -> str:
+    """Returns the name of the tag with the specified index in its guild."""
+    return f"{WORDS[index % len(WORDS)]}-{index}"
+
+def generate_tags(dataset: Dataset, rng: random.Random) -> Iterator[tuple[Any, ...]]:
+    now = utcnow()
+    for guild in dataset.guilds:
+        for i in range(guild.tags):
+            aliases = [f"alias-{i}-{n}" for n in range(rng.choice([0, 0, 0, 1, 2]))]
+            yield (
+                guild.id, get_tag_name(i), _sentence(rng, rng.randint(5, 300)),
+                [dataset.get_user_id(guild, rng.randrange(guild.members))], aliases, rng.random() < 0.1,
+                now - datetime.timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+            )
+
+def generate_reminders(dataset: Dataset, rng: random.Random) -> Iterator[tuple[Any, ...]]:
+    now = utcnow()
+    snowflakes = iter(range(SNOWFLAKE_BASE, SNOWFLAKE_BASE + dataset.reminder_users))
+    for _ in range(dataset.reminder_users):
+        # A few users keep a lot of reminders
+        user_id = USER_ID_BASE + _skewed_index(rng, dataset.user_pool)
+        channel_id = next(snowflakes)
+        message_id = channel_id + 1
+        yield (
+            user_id, channel_id, message_id,
+            f"https://discord.com/channels/{GUILD_ID_BASE}/{channel_id}/{message_id}",
+            _sentence(rng, rng.randint(1, 20)),
+            now + datetime.timedelta(minutes=rng.randint(-60 * 24, 60 * 24 * 365)),
+            now - datetime.timedelta(minutes=rng.randrange(60 * 24 * 30))
+        )
+
+def get_translation_content(index: int) -> str:
+    """Returns the original content of the translation with the specified index."""
+    return f"message {index} " + " ".join(WORDS[(index * 7 + n) % len(WORDS)] for n in range(8))
+
+def generate_translations(dataset: Dataset, rng: random.Random) -> Iterator[tuple[Any, ...]]:
+    for i in range(dataset.translations):
+        # Frequently seen messages are translated more than once
+        index = _skewed_index(rng, dataset.translations) if rng.random() < 0.1 else i
+        yield (get_translation_content(index), rng.choice(LANGUAGES), _sentence(rng, rng.randint(3, 30)))
+
+def generate_guild_configurations(dataset: Dataset, rng: random.Random) -> Iterator[tuple[Any, ...]]:
+    for guild in dataset.guilds:
+        yield (guild.id, rng.random() < 0.5, rng.random() < 0.3)
+
+@dataclass
+class TableLoad:
+    table: str
+    columns: list[str]
+    rows: Callable[[Dataset, random.Random], Iterable[tuple[Any, ...]]]
+
+TABLE_LOADS = [
+    TableLoad(
+        "UserLevels",
+        ["guild_id", "user_id", "total_xp", "current_xp", "xp_to_next_level", "level", "theme_name"],
+        generate_levels
+    ),
+    TableLoad(
+        "Punishments",
+        [
+            "case_id", "type", "guild_id", "user_id", "user_name", "moderator_id", "moderator_name",
+            "reason", "issue_date", "expire_date", "handled", "visible"
+        ],
+        generate_punishments
+    ),
+    TableLoad("PunishmentCounters", ["guild_id", "counter"], lambda dataset, _: generate_punishment_counters(dataset)),
+    TableLoad("Tags", ["guild_id", "name", "content", "authors", "aliases", "locked", "date_created"], generate_tags),
+    TableLoad(
+        "Reminders",
+        ["user_id", "channel_id", "message_id", "message_url", "content", "date_remind", "date_created"],
+        generate_reminders
+    ),
+    TableLoad("Translations", ["original_content", "detected_language", "translated_string"], generate_translations),
+    TableLoad("GuildConfigurations", ["guild_id", "public_tags", "xp_system_active"], generate_guild_configurations),
+]
+
+def _batched(rows: Iterable[tuple[Any, ...]], size: int) -> Iterator[list[tuple[Any, ...]]]:
+    batch: list[tuple[Any, ...]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def fetch_non_empty_tables(engine: AsyncEngine) -> list[str]:
+    """Returns the generated tables which already hold rows."""
+    tables: list[str] = []
+    async with engine.connect() as connection:
+        for load in TABLE_LOADS:
+            result = await connection.execute(text(f'SELECT EXISTS (SELECT 1 FROM "{load.table}")'))
+            if result.scalar():
+                tables.append(load.table)
+    return tables
+
+async def load_dataset(engine: AsyncEngine, dataset: Dataset, *, truncate: bool) -> None:
+    """Fills the tables with the generated rows."""
+    async with engine.connect() as connection:
+        if truncate:
+            tables = ", ".join(f'"{load.table}"' for load in TABLE_LOADS)
+            _ = await connection.execute(text(f"TRUNCATE {tables} RESTART IDENTITY"))
+            await connection.commit()
+
+        raw_connection = await connection.get_raw_connection()
+        driver_connection: Any = raw_connection.driver_connection
+        for load in TABLE_LOADS:
+            start = time.perf_counter()
+            count = 0
+            rng = random.Random(f"{dataset.seed}:{load.table}")
+            for batch in _batched(load.rows(dataset, rng), COPY_BATCH_SIZE):
+                _ = await driver_connection.copy_records_to_table(load.table, records=batch, columns=load.columns)
+                count += len(batch)
+            logger.info(f"Loaded {count} rows into {load.table} in {time.perf_counter() - start:.1f} seconds")
+
+        for load in TABLE_LOADS:
+            _ = await connection.execute(text(f'ANALYZE "{load.table}"'))
+        await connection.commit()
+
+@dataclass
+class MethodLatency:
+    method: str
+    tier: str
+    durations: list[float] = field(default_factory=list)
+
+    @property
+    def p50(self) -> float:
+        return statistics.median(self.durations)
+
+    @property
+    def p95(self) -> float:
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+class LatencyReport:
+    """This class calls the API methods and collects their latencies."""
+
+    def __init__(self, client: Pidroid, dataset: Dataset, repetitions: int) -> None:
+        super().__init__()
+        self.client = client
+        self.api = client.api
+        self.dataset = dataset
+        self.repetitions = repetitions
+        self.results: list[MethodLatency] = []
+        self.__rng = random.Random(dataset.seed)
+        self.__snowflakes = iter(range(SNOWFLAKE_BASE * 2, SNOWFLAKE_BASE * 3))
+
+    async def measure(self, method: str, tier: str, call: Callable[[], Awaitable[object]]) -> None:
+        """Calls the method the configured amount of times and records how long every call took."""
+        latency = MethodLatency(method, tier)
+        for _ in range(self.repetitions):
+            start = time.perf_counter()
+            _ = await call()
+            latency.durations.append(time.perf_counter() - start)
+        self.results.append(latency)
+
+    def __member(self, guild: GeneratedGuild) -> int:
+        return self.dataset.get_user_id(guild, self.__rng.randrange(guild.members))
+
+    def __create_message(self, guild: GeneratedGuild, user_id: int) -> Message:
+        """Returns a message of the member, as award_xp expects."""
+        state = self.client._connection # pyright: ignore[reportPrivateUsage]
+        discord_guild = self.client.get_guild(guild.id)
+        if discord_guild is None:
+            discord_guild = state._add_guild_from_data({ # pyright: ignore[reportPrivateUsage]
+                "id": str(guild.id), "name": f"guild-{guild.id}", "roles": [], "emojis": [], "stickers": [],
+                "features": [], "member_count": guild.members,
+                "channels": [{"id": str(guild.id), "type": 0, "name": "general", "position": 0, "permission_overwrites": []}]
+            }) # pyright: ignore[reportArgumentType]
+        channel = discord_guild.get_channel(guild.id)
+        data: Any = {
+            "id": str(next(self.__snowflakes)), "channel_id": str(guild.id), "guild_id": str(guild.id), "type": 0,
+            "content": "", "author": {"id": str(user_id), "username": "user", "discriminator": "0", "avatar": None},
+            "member": {"roles": [], "joined_at": "2020-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0},
+            "attachments": [], "embeds": [], "mentions": [], "mention_roles": [], "mention_everyone": False,
+            "pinned": False, "tts": False, "timestamp": "2020-01-01T00:00:00+00:00", "edited_timestamp": None
+        }
+        return Message(state=state, channel=channel, data=data) # pyright: ignore[reportArgumentType]
+
+    async def run_global(self) -> None:
+        """Measures the methods which are not specific to a guild."""
+        api = self.api
+        now = utcnow()
+        users = [USER_ID_BASE + _skewed_index(self.__rng, self.dataset.user_pool) for _ in range(self.repetitions)]
+        user_ids = iter(users * 3)
+
+        await self.measure("fetch_guild_configurations", "all", api.fetch_guild_configurations)
+        await self.measure("insert_expiring_thread", "all", lambda: api.insert_expiring_thread(next(self.__snowflakes), GUILD_ID_BASE, now))
+        await self.measure("fetch_expired_threads", "all", lambda: api.fetch_expired_threads(now))
+        threads = await api.fetch_expired_threads(now)
+        rows = iter([thread.id for thread in threads])
+        await self.measure("delete_expiring_thread", "all", lambda: api.delete_expiring_thread(next(rows)))
+
+        await self.measure("fetch_guilds_user_was_punished_in", "all", lambda: api.fetch_guilds_user_was_punished_in(next(user_ids)))
+        await self.measure(
+            "fetch_translations", "all",
+            lambda: api.fetch_translations(get_translation_content(_skewed_index(self.__rng, self.dataset.translations)))
+        )
+        await self.measure("insert_translation_entry", "all", lambda: api.insert_translation_entry("synthetic", "EN", "synthetic"))
+
+        await self.measure("insert_linked_account", "all", lambda: api.insert_linked_account(next(self.__snowflakes), next(self.__snowflakes)))
+        await self.measure("fetch_linked_account_by_user_id", "all", lambda: api.fetch_linked_account_by_user_id(next(user_ids)))
+        await self.measure("fetch_linked_account_by_forum_id", "all", lambda: api.fetch_linked_account_by_forum_id(next(user_ids)))
+
+        await self.measure("fetch_reminders", "all", lambda: api.fetch_reminders(user_id=next(user_ids)))
+        reminder_ids: list[int] = []
+
+        async def insert_reminder() -> None:
+            reminder_ids.append(await api.insert_reminder(
+                user_id=USER_ID_BASE, channel_id=None, message_id=next(self.__snowflakes),
+                message_url="https://discord.com", content="synthetic", date_remind=now
+            ))
+        await self.measure("insert_reminder", "all", insert_reminder)
+        rows = iter(reminder_ids * 2)
+        await self.measure("fetch_reminder", "all", lambda: api.fetch_reminder(row=next(rows)))
+        await self.measure("delete_reminder", "all", lambda: api.delete_reminder(row=next(rows)))
+
+        configurations: list[GuildConfiguration] = []
+
+        async def insert_guild_configuration() -> None:
+            configurations.append(await api.insert_guild_configuration(next(self.__snowflakes)))
+        await self.measure("insert_guild_configuration", "all", insert_guild_configuration)
+        inserted = iter(configurations)
+        await self.measure("delete_guild_configuration", "all", lambda: next(inserted).delete())
+
+    async def run_guild(self, tier: str, guild: GeneratedGuild) -> None:
+        """Measures the methods which query the data of the specified guild."""
+        api = self.api
+        rng = self.__rng
+        configuration = await api.fetch_guild_configuration(guild.id)
+        assert configuration is not None
+
+        await self.measure("fetch_guild_configuration", tier, lambda: api.fetch_guild_configuration(guild.id))
+        await self.measure("_update_guild_configuration", tier, configuration._update) # pyright: ignore[reportPrivateUsage]
+
+        # Tags
+        await self.measure("fetch_guild_tags", tier, lambda: api.fetch_guild_tags(guild.id))
+        await self.measure("fetch_guild_tag", tier, lambda: api.fetch_guild_tag(guild.id, get_tag_name(rng.randrange(guild.tags))))
+        await self.measure("search_guild_tags", tier, lambda: api.search_guild_tags(guild.id, rng.choice(WORDS)))
+        tag_ids: list[int] = []
+
+        async def insert_tag() -> None:
+            tag_ids.append(await api.insert_tag(guild.id, f"synthetic-{next(self.__snowflakes)}", "content", [USER_ID_BASE]))
+        await self.measure("insert_tag", tier, insert_tag)
+        rows = iter(tag_ids * 3)
+        await self.measure("fetch_tag", tier, lambda: api.fetch_tag(next(rows)))
+        await self.measure("update_tag", tier, lambda: api.update_tag(next(rows), "updated", [USER_ID_BASE], [], False))
+        await self.measure("delete_tag", tier, lambda: api.delete_tag(next(rows)))
+
+        # Punishments
+        moderator = self.dataset.get_user_id(guild, 0)
+        await self.measure("_fetch_case", tier, lambda: api._fetch_case(guild.id, rng.randint(1, guild.punishments))) # pyright: ignore[reportPrivateUsage]
+        await self.measure("_fetch_cases", tier, lambda: api._fetch_cases(guild.id, self.__member(guild))) # pyright: ignore[reportPrivateUsage]
+        await self.measure("fetch_cases_by_username", tier, lambda: api.fetch_cases_by_username(guild.id, f"user-{rng.randrange(1000)}"))
+        await self.measure("fetch_moderation_statistics", tier, lambda: api.fetch_moderation_statistics(guild.id, moderator))
+        await self.measure("is_currently_jailed", tier, lambda: api.is_currently_jailed(guild.id, self.__member(guild)))
+        await self.measure("fetch_active_guild_bans", tier, lambda: api.fetch_active_guild_bans(guild.id))
+        cases: list[Case] = []
+
+        async def insert_punishment_entry() -> None:
+            cases.append(await api.insert_punishment_entry(
+                "warning", guild.id, self.__member(guild), "user", moderator, "moderator", "synthetic", None
+            ))
+        await self.measure("insert_punishment_entry", tier, insert_punishment_entry)
+        inserted = iter(cases)
+        await self.measure("update_case_by_internal_id", tier, lambda: next(inserted)._update()) # pyright: ignore[reportPrivateUsage]
+        await self.measure("expire_cases_by_type", tier, lambda: api.expire_cases_by_type(PunishmentType.JAIL, guild.id, self.__member(guild)))
+
+        # Level rewards
+        reward_ids: list[int] = []
+
+        async def insert_level_reward() -> None:
+            reward_ids.append(await api.insert_level_reward(guild.id, next(self.__snowflakes), rng.randint(1, 100)))
+        await self.measure("insert_level_reward", tier, insert_level_reward)
+        rows = iter(reward_ids * 3)
+        role_ids = iter([next(self.__snowflakes) for _ in range(self.repetitions)])
+        await self.measure("fetch_level_reward_by_id", tier, lambda: api.fetch_level_reward_by_id(next(rows)))
+        await self.measure("update_level_reward_by_id", tier, lambda: api.update_level_reward_by_id(next(rows), next(role_ids), rng.randint(1, 100)))
+        await self.measure("fetch_all_guild_level_rewards", tier, lambda: api.fetch_all_guild_level_rewards(guild.id))
+        await self.measure("fetch_level_reward_by_role", tier, lambda: api.fetch_level_reward_by_role(guild.id, next(self.__snowflakes)))
+        await self.measure("fetch_guild_level_reward_by_level", tier, lambda: api.fetch_guild_level_reward_by_level(guild.id, rng.randint(1, 100)))
+        await self.measure("fetch_eligible_level_rewards_for_level", tier, lambda: api.fetch_eligible_level_rewards_for_level(guild.id, rng.randint(1, 100)))
+        await self.measure("fetch_eligible_level_reward_for_level", tier, lambda: api.fetch_eligible_level_reward_for_level(guild.id, rng.randint(1, 100)))
+        await self.measure("fetch_previous_level_reward", tier, lambda: api.fetch_previous_level_reward(guild.id, rng.randint(1, 100)))
+        await self.measure("fetch_next_level_reward", tier, lambda: api.fetch_next_level_reward(guild.id, rng.randint(1, 100)))
+        await self.measure("delete_level_reward", tier, lambda: api.delete_level_reward(next(rows)))
+
+        # Levels
+        await self.measure("fetch_user_level_info", tier, lambda: api.fetch_user_level_info(guild.id, self.__member(guild)))
+        await self.measure("fetch_ranked_user_level_info", tier, lambda: api.fetch_ranked_user_level_info(guild.id, self.__member(guild)))
+        await self.measure("fetch_guild_level_rankings", tier, lambda: api.fetch_guild_level_rankings(guild.id))
+        await self.measure(
+            "fetch_guild_level_rankings (deep page)", tier,
+            lambda: api.fetch_guild_level_rankings(guild.id, start=guild.members // 2)
+        )
+        await self.measure("fetch_guild_level_infos", tier, lambda: api.fetch_guild_level_infos(guild.id))
+        await self.measure("fetch_user_level_info_between", tier, lambda: api.fetch_user_level_info_between(guild.id, 5, 10))
+        await self.measure("award_xp", tier, lambda: api.award_xp(self.__create_message(guild, self.__member(guild)), rng.randint(15, 25)))
+        info = await api.fetch_user_level_info(guild.id, self.__member(guild))
+        if info is not None:
+            await self.measure("update_user_level_theme", tier, lambda: api.update_user_level_theme(info.id, rng.choice(THEMES[-9:])))
+        await self.measure(
+            "insert_member_level_info", tier,
+            lambda: api.insert_member_level_info(guild.id, next(self.__snowflakes))
+        )
+
+    def print(self) -> None:
+        """Prints the latencies of every method, slowest first."""
+        tiers = self.dataset.get_tiers()
+        print("Guild tiers: " + ", ".join(f"{tier} has {guild.members} members" for tier, guild in tiers.items()))
+        print()
+        print(f"{'Method':<44} {'Tier':<10} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+        for latency in sorted(self.results, key=lambda latency: latency.p95, reverse=True):
+            print(
+                f"{latency.method:<44} {latency.tier:<10} {latency.p50 * 1000:>10.2f} "
+                f"{latency.p95 * 1000:>10.2f} {max(latency.durations) * 1000:>10.2f}"
+            )
+
+async def _run(args: argparse.Namespace) -> None:
+    dataset = create_dataset(args.scale, args.skew, args.seed)
+    if not args.report_only:
+        engine = create_async_engine(args.postgres_dsn)
+        try:
+            non_empty_tables = await fetch_non_empty_tables(engine)
+            if non_empty_tables and not args.truncate:
+                sys.exit(f"{', '.join(non_empty_tables)} already hold rows, specify --truncate to replace them.")
+            await load_dataset(engine, dataset, truncate=args.truncate)
+        finally:
+            await engine.dispose()
+    if args.skip_report:
+        return
+
+    client = Pidroid(offline_config(args.postgres_dsn))
+    await client._async_setup_hook() # pyright: ignore[reportPrivateUsage]
+    try:
+        report = LatencyReport(client, dataset, args.repetitions)
+        await report.run_global()
+        for tier, guild in dataset.get_tiers().items():
+            await report.run_guild(tier, guild)
+        report.print()
+    finally:
+        await client.api.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Fills the database with a synthetic dataset and reports the latency of the API.")
+    _ = parser.add_argument("--scale", type=float, default=1.0, help="multiplier of the amount of generated rows")
+    _ = parser.add_argument("--skew", type=float, default=DEFAULT_SKEW, help="exponent of the power law of guild sizes")
+    _ = parser.add_argument("--seed", type=int, default=0, help="seed of the generated data")
+    _ = parser.add_argument("--truncate", action="store_true", help="empty the generated tables before loading")
+    _ = parser.add_argument("--repetitions", type=int, default=20, help="how many times every method is called")
+    group = parser.add_mutually_exclusive_group()
+    _ = group.add_argument("--report-only", action="store_true", help="only report the latency of a previously generated dataset")
+    _ = group.add_argument("--skip-report", action="store_true", help="only generate the dataset")
+    _ = parser.add_argument(
+        "--postgres-dsn", default=os.environ.get("POSTGRES_DSN"),
+        help="database to fill, defaults to the POSTGRES_DSN environment variable"
+    )
+    args = parser.parse_args()
+    if not args.postgres_dsn:
+        sys.exit("No database was specified. Please specify it using --postgres-dsn or the POSTGRES_DSN environment variable.")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,12 @@ import signal
 import sys
 import logging
 
-from alembic.config import CommandLine
 from discord.ext import commands
 from discord.ext.commands import Context
 
 from pidroid.client import Pidroid
 from pidroid.constants import DATA_FILE_PATH, TEMPORARY_FILE_PATH
+from pidroid.utils.cluster import parse_shard_ids
 from pidroid.utils.types import ConfigDict # noqa: E402
 
 # Use uvloop if possible
@@ -78,9 +78,45 @@ def config_from_env() -> ConfigDict:
         "github_owner": os.environ.get("GITHUB_OWNER"),
         "github_repo": os.environ.get("GITHUB_REPO"),
         "rabbitmq_url": os.environ.get("RABBITMQ_URL"),
+        "gateway_recording_path": os.environ.get("GATEWAY_RECORDING_PATH") or None,
+
+        # Set by the cluster launcher, a single process connects every shard by default
+        "cluster_id": int(os.environ.get("CLUSTER_ID", 0)),
+        "cluster_count": int(os.environ.get("CLUSTER_COUNT", 1)),
+        "shard_count": int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else None,
+        "shard_ids": parse_shard_ids(os.environ.get("SHARD_IDS")),
+
+        # Which guilds have every member cached, see MemberCachePolicy
+        "member_cache_policy": os.environ.get("MEMBER_CACHE_POLICY") or "configured",
+    }
+
+def offline_config(postgres_dsn: str) -> ConfigDict:
+    """Returns the configuration of a client which only uses the database, for the development tools."""
+    return {
+        "debugging": False,
+        "token": "",
+        "prefixes": [p.strip() for p in os.environ.get("PREFIXES", "P, p, TT").split(",")],
+        "postgres_dsn": postgres_dsn,
+        "tt_api_key": None,
+        "deepl_api_key": None,
+        "tenor_api_key": None,
+        "unbelievaboat_api_key": None,
+        "github_app_id": None,
+        "github_app_pem": None,
+        "github_owner": None,
+        "github_repo": None,
+        "rabbitmq_url": None,
+        "gateway_recording_path": None,
+        "cluster_id": 0,
+        "cluster_count": 1,
+        "shard_count": None,
+        "shard_ids": None,
+        "member_cache_policy": "lazy",
     }
 
 def migrate():
+    # Only the migration entry point needs alembic, the bot does not import it
+    from alembic.config import CommandLine
     CommandLine("alembic").main(["upgrade", "head"])
 
 def _register_reload_command(bot: Pidroid):
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import difflib
+import itertools
+import logging
+import time
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from discord import Member
+from discord.ext.commands import Command, Context
+from typing import TYPE_CHECKING, Any
+
+from pidroid.models.categories import get_full_command_name
+from pidroid.utils import get_function_decorators
+from pidroid.utils.cache import TTLCache
+
+if TYPE_CHECKING:
+    from pidroid.client import Pidroid
+
+logger = logging.getLogger("pidroid.models.command_index")
+
+# Full name of the command, user, guild, channel, the permissions of the user in the channel and a hash of their roles
+VisibilityKey = tuple[str, int, int | None, int, int, int]
+
+@dataclass(frozen=True)
+class IndexedCommand:
+    command: Command[Any, ..., Any]
+    # Lowercase name including the parent groups
+    full_name: str
+    # Requirements to run the command, as listed by the help command
+    requirements: tuple[str, ...]
+
+def get_command_requirements(command: Command[Any, ..., Any]) -> tuple[str, ...]:
+    """Returns the requirements of the command, parsed from the decorators of its callback."""
+    try:
+        decorators = get_function_decorators(command.callback)
+    except (OSError, TypeError, SyntaxError, ValueError):
+        # Source is not available for every command, such as the ones created at runtime
+        return ()
+    return tuple(decorator.requirement_text for decorator in decorators if decorator.is_a_check())
+
+def get_command_paths(command: Command[Any, ..., Any]) -> list[str]:
+    """Returns every way the command can be invoked, using the names and aliases of the command and its parents."""
+    names = [[parent.name, *parent.aliases] for parent in reversed(command.parents)]
+    names.append([command.name, *command.aliases])
+    return [" ".join(path).lower() for path in itertools.product(*names)]
+
+class CommandIndex:
+    """This class indexes the visible commands, so that they can be searched without walking every command.
+
+    The index should be rebuilt whenever commands are added or removed. Requirements of the commands
+    are parsed from the source code once, and reused by the following index for unchanged commands.
+
+    Whether a user can run a command is cached for a short while, per user, guild, channel, permissions and roles.
+    Roles are part of the key as role checks do not depend on the permissions."""
+
+    def __init__(
+        self,
+        commands: Iterable[Command[Any, ..., Any]],
+        *,
+        previous: CommandIndex | None = None,
+        visibility_ttl: float = 60.0
+    ) -> None:
+        super().__init__()
+        start = time.perf_counter()
+        self.visibility_ttl = visibility_ttl
+        self.__commands: list[IndexedCommand] = []
+        # Full paths, including the aliases, to commands
+        self.__by_path: dict[str, IndexedCommand] = {}
+        # Names and aliases of the commands, without their parents, to commands
+        self.__by_name: dict[str, list[IndexedCommand]] = {}
+        self.__visibility: TTLCache[VisibilityKey, bool] = TTLCache(4096)
+
+        for command in commands:
+            if command.hidden:
+                continue
+            requirements = previous.get_requirements(command) if previous is not None else None
+            if requirements is None:
+                requirements = get_command_requirements(command)
+            indexed = IndexedCommand(command, get_full_command_name(command).lower(), requirements)
+            self.__commands.append(indexed)
+            for path in get_command_paths(command):
+                _ = self.__by_path.setdefault(path, indexed)
+            for name in (command.name, *command.aliases):
+                self.__by_name.setdefault(name.lower(), []).append(indexed)
+
+        logger.debug(f"Indexed {len(self.__commands)} commands in {time.perf_counter() - start:.3f}s")
+
+    def __len__(self) -> int:
+        return len(self.__commands)
+
+    @property
+    def commands(self) -> list[IndexedCommand]:
+        """Returns the indexed commands."""
+        return list(self.__commands)
+
+    def get_requirements(self, command: Command[Any, ..., Any]) -> tuple[str, ...] | None:
+        """Returns the indexed requirements of the command, if the same command is indexed."""
+        indexed = self.__by_path.get(get_full_command_name(command).lower())
+        if indexed is not None and indexed.command.callback is command.callback:
+            return indexed.requirements
+        return None
+
+    def find(self, query: str) -> IndexedCommand | None:
+        """Returns the command which is invoked by the query, or the only command with the queried name."""
+        normalized = " ".join(query.lower().split())
+        indexed = self.__by_path.get(normalized)
+        if indexed is not None:
+            return indexed
+        by_name = self.__by_name.get(normalized, [])
+        if len(by_name) == 1:
+            return by_name[0]
+        return None
+
+    def suggest(self, query: str, limit: int = 3) -> list[str]:
+        """Returns the full names of the commands whose names resemble the query, best match first."""
+        normalized = " ".join(query.lower().split())
+        matches = difflib.get_close_matches(normalized, self.__by_path.keys(), n=limit * 2, cutoff=0.6)
+        suggestions: list[str] = []
+        for match in matches:
+            full_name = self.__by_path[match].full_name
+            if full_name not in suggestions:
+                suggestions.append(full_name)
+        return suggestions[:limit]
+
+    async def can_run(self, ctx: Context[Pidroid], indexed: IndexedCommand) -> bool:
+        """Returns true if the author can run the command in the context, caching the result."""
+        author = ctx.author
+        if isinstance(author, Member):
+            permissions = ctx.channel.permissions_for(author).value
+            roles = hash(tuple(sorted(role.id for role in author.roles)))
+        else:
+            permissions = roles = 0
+        key = (indexed.full_name, author.id, ctx.guild.id if ctx.guild else None, ctx.channel.id, permissions, roles)
+        cached = self.__visibility.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            can_run = await indexed.command.can_run(ctx)
+        except Exception:
+            can_run = False
+        self.__visibility.set(key, can_run, self.visibility_ttl)
+        return can_run
@@ -13,6 +13,15 @@ class EventType(Enum):
     # Guild config related
     update_guild_configuration = 6
 
+    # Leveling related
+    level_up = 7
+
+    # Reminder related
+    reminder_deliver = 8
+
+    # Pidroid guild logs
+    pidroid_log = 9
+
 class EventName(Enum):
 
     tag_create        = "tag_create"
@@ -22,3 +31,12 @@ class EventName(Enum):
     tag_transfer      = "tag_transfer"
     tag_update        = "tag_update"
     tag_delete        = "tag_delete"
+
+    punishment_issue  = "punishment_issue"
+    punishment_revoke = "punishment_revoke"
+
+    level_up          = "level_up"
+
+    reminder_deliver  = "reminder_deliver"
+
+    pidroid_log       = "pidroid_log"
@@ -33,6 +33,12 @@ class GeneralCommandError(BadArgument):
 class APIException(BadArgument):
     """Called when TheoTown API error is encountered"""
     def __init__(self, status: int, message: str | None = None):
+        self.status = status
         if message is None:
             return super().__init__(f"An error has been encountered inside TheoTown API, status code: {status}")
         return super().__init__(message)
+
+class RenderQueueFull(BadArgument):
+    """Called when too many images are being rendered at once"""
+    def __init__(self):
+        super().__init__("I'm busy rendering other images right now, please try again in a moment!")
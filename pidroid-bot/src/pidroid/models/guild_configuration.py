@@ -65,12 +65,14 @@ class GuildConfiguration:
 
     @classmethod
     def from_table(cls, api: API, table: GuildConfigurationTable) -> GuildConfiguration:
-        """Constructs a GuildConfiguration object from a GuildConfigurationTable object."""
+        """Constructs a GuildConfiguration object from a GuildConfigurationTable object.
+
+        The lists are copied, as the table object may be shared through the cache."""
         return cls(
             api,
             row=table.id,
             guild_id=table.guild_id,
-            prefixes=table.prefixes,
+            prefixes=list(table.prefixes),
             public_tags=table.public_tags,
             jail_channel_id=table.jail_channel,
             jail_role_id=table.jail_role,
@@ -81,8 +83,8 @@ class GuildConfiguration:
             xp_multiplier=table.xp_multiplier,
             xp_per_message_min=table.xp_per_message_min,
             xp_per_message_max=table.xp_per_message_max,
-            xp_exempt_roles=table.xp_exempt_roles,
-            xp_exempt_channels=table.xp_exempt_channels,
+            xp_exempt_roles=list(table.xp_exempt_roles),
+            xp_exempt_channels=list(table.xp_exempt_channels),
             stack_level_rewards=table.stack_level_rewards,
             suggestion_system_active=table.suggestion_system_active,
             suggestion_channel_id=table.suggestion_channel,
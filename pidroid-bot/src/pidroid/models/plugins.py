@@ -66,6 +66,11 @@ class AbstractPlugin(abc.ABC):
         """Returns plugin revision ID."""
         return self._revision_id
     
+    @property
+    def author(self) -> TheoTownUser:
+        """Returns plugin author."""
+        return self._author
+
     @property
     def submission_time(self) -> int:
         """Returns plugin submission time."""
@@ -44,6 +44,9 @@ class AbstractMessageQueue:
         if delay <= 0:
             self._delay = 5
 
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
     async def queue(self, item: Embed | str) -> None:
         """Adds the specified embed to the queue."""
         await self._queue.put(item)
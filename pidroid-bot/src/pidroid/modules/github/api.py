@@ -1,7 +1,6 @@
 import base64
 import datetime
 import json
-import jwt
 import time
 
 from dataclasses import dataclass
@@ -9,10 +8,16 @@ from discord import Attachment, Member, User
 from typing import TYPE_CHECKING
 
 from pidroid.utils.http import get, post
+from pidroid.utils.lazy import LazyModule
 from pidroid.utils.time import utcnow
 
 if TYPE_CHECKING:
+    import jwt
+
     from pidroid.client import Pidroid
+else:
+    # Signing pulls in the cryptography package
+    jwt = LazyModule("jwt")
 
 INSTALLATION_ID_URL = "https://api.github.com/orgs/{owner}/installation"
 ACCESS_ID_URL = "https://api.github.com/app/installations/{installation_id}/access_tokens"
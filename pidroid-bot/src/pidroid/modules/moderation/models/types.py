@@ -13,7 +13,7 @@ from discord.utils import format_dt
 from typing import TYPE_CHECKING, Callable, Literal, override
 
 from pidroid.utils import try_message_user
-from pidroid.utils.file import Resource
+from pidroid.utils.file import resource_file
 from pidroid.utils.time import delta_to_datetime, humanize
 from pidroid.utils.types import DiscordUser
 from pidroid.utils.checks import (
@@ -613,7 +613,7 @@ class Jail2(BasePunishment, RevokeablePunishment):
     @property
     @override
     def public_issue_file(self) -> File:
-        return File(Resource('bus.png'))
+        return resource_file('bus.png')
 
     @property
     @override
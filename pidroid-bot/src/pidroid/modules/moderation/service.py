@@ -8,6 +8,7 @@ from typing import override
 from pidroid.client import Pidroid
 from pidroid.modules.moderation.models.types import PunishmentType
 from pidroid.utils.aliases import DiscordUser
+from pidroid.utils.leader import singleton_job
 
 logger = logging.getLogger("pidroid.moderation.punishment_service")
 
@@ -25,6 +26,7 @@ class PunishmentService(commands.Cog):
         self.remove_expired_bans.stop()
 
     @tasks.loop(seconds=5)
+    @singleton_job
     async def remove_expired_bans(self) -> None:
         """Periodically checks for expired punishments to remove."""
         try:
@@ -0,0 +1,185 @@
+import bisect
+import difflib
+import logging
+import re
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from pidroid.models.plugins import AbstractPlugin
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Weights of the fields a token was found in
+NAME_WEIGHT = 3
+AUTHOR_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+# Multipliers of the different kinds of token matches
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.75
+FUZZY_MATCH = 0.5
+
+logger = logging.getLogger("pidroid.plugin_store.catalog")
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    plugin_id: int
+    revision_id: int
+    # Plugin name without inline translations
+    name: str
+    author: str
+
+def tokenize(text: str) -> list[str]:
+    """Returns a list of lowercase search tokens for the specified text."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if len(t) > 1]
+
+class PluginCatalog:
+    """This class implements a local catalog of TheoTown plugin store plugins.
+
+    The catalog keeps an in-memory inverted index over plugin name, author and description tokens
+    which allows plugins to be ranked without querying the TheoTown API. It only keeps what is needed
+    to rank the plugins and suggest them, plugins shown to users are fetched from the API."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__loaded = False
+        self.__plugins: dict[int, CatalogEntry] = {}
+        # Maps a token to plugin IDs and the weight of the field the token was found in
+        self.__index: dict[str, dict[int, int]] = {}
+        self.__tokens_by_plugin: dict[int, dict[str, int]] = {}
+        self.__sorted_tokens: list[str] = []
+        self.__sorted_tokens_dirty = False
+
+    def __len__(self) -> int:
+        return len(self.__plugins)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Returns true if the catalog was loaded."""
+        return self.__loaded
+
+    def load(self, plugins: Iterable[AbstractPlugin]) -> None:
+        """Loads the catalog with the specified plugins, replacing existing entries."""
+        self.__plugins.clear()
+        self.__index.clear()
+        self.__tokens_by_plugin.clear()
+        self.update(plugins)
+        self.__loaded = True
+        logger.info(f"Plugin catalog loaded with {len(self.__plugins)} plugins")
+
+    def update(self, plugins: Iterable[AbstractPlugin]) -> None:
+        """Adds or replaces the specified plugins in the catalog.
+
+        Plugins are replaced only by the same or newer revisions."""
+        for plugin in plugins:
+            existing = self.__plugins.get(plugin.plugin_id)
+            if existing is not None and existing.revision_id > plugin.revision_id:
+                continue
+            self.__unindex(plugin.plugin_id)
+            self.__plugins[plugin.plugin_id] = CatalogEntry(
+                plugin.plugin_id, plugin.revision_id, plugin.clean_name, plugin.author.username
+            )
+            self.__index_plugin(plugin)
+
+    def remove(self, plugin_id: int) -> None:
+        """Removes the plugin with the specified ID from the catalog, such as when it is no longer in the store."""
+        self.__unindex(plugin_id)
+        _ = self.__plugins.pop(plugin_id, None)
+
+    def get(self, plugin_id: int) -> CatalogEntry | None:
+        """Returns the entry of the plugin with the specified ID, if it is in the catalog."""
+        return self.__plugins.get(plugin_id)
+
+    def __index_plugin(self, plugin: AbstractPlugin) -> None:
+        tokens: dict[str, int] = {}
+        for text, weight in (
+            (plugin.clean_description, DESCRIPTION_WEIGHT),
+            (plugin.author.username, AUTHOR_WEIGHT),
+            (plugin.clean_name, NAME_WEIGHT),
+        ):
+            for token in tokenize(text):
+                tokens[token] = max(weight, tokens.get(token, 0))
+
+        for token, weight in tokens.items():
+            posting = self.__index.get(token)
+            if posting is None:
+                posting = {}
+                self.__index[token] = posting
+                self.__sorted_tokens_dirty = True
+            posting[plugin.plugin_id] = weight
+        self.__tokens_by_plugin[plugin.plugin_id] = tokens
+
+    def __unindex(self, plugin_id: int) -> None:
+        tokens = self.__tokens_by_plugin.pop(plugin_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            posting = self.__index[token]
+            del posting[plugin_id]
+            if not posting:
+                del self.__index[token]
+                self.__sorted_tokens_dirty = True
+
+    def __get_sorted_tokens(self) -> list[str]:
+        if self.__sorted_tokens_dirty:
+            self.__sorted_tokens = sorted(self.__index)
+            self.__sorted_tokens_dirty = False
+        return self.__sorted_tokens
+
+    def __score_token(self, query_token: str) -> dict[int, float]:
+        """Returns plugin scores for a single query token."""
+        scores: dict[int, float] = {}
+
+        def add(token: str, multiplier: float):
+            for plugin_id, weight in self.__index[token].items():
+                score = weight * multiplier
+                if score > scores.get(plugin_id, 0):
+                    scores[plugin_id] = score
+
+        # Exact and prefix matches
+        tokens = self.__get_sorted_tokens()
+        i = bisect.bisect_left(tokens, query_token)
+        while i < len(tokens) and tokens[i].startswith(query_token):
+            add(tokens[i], EXACT_MATCH if tokens[i] == query_token else PREFIX_MATCH)
+            i += 1
+
+        # Only fall back to fuzzy matching for likely typos
+        if not scores and len(query_token) > 2:
+            for token in difflib.get_close_matches(query_token, tokens, n=5, cutoff=0.75):
+                add(token, FUZZY_MATCH)
+        return scores
+
+    def search(self, query: str, limit: int | None = None) -> list[CatalogEntry]:
+        """Returns entries of the plugins matching every token of the query, ordered by relevance."""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        total: dict[int, float] | None = None
+        for query_token in query_tokens:
+            scores = self.__score_token(query_token)
+            if total is None:
+                total = scores
+            else:
+                total = {
+                    plugin_id: score + scores[plugin_id]
+                    for plugin_id, score in total.items() if plugin_id in scores
+                }
+            if not total:
+                return []
+        assert total is not None
+
+        # Prefer plugins whose name contains the query as typed
+        lowered_query = query.lower().strip()
+        for plugin_id in total:
+            name = self.__plugins[plugin_id].name.lower()
+            if name == lowered_query:
+                total[plugin_id] += NAME_WEIGHT * 2
+            elif lowered_query in name:
+                total[plugin_id] += NAME_WEIGHT
+
+        ranked = sorted(total, key=lambda plugin_id: (-total[plugin_id], -plugin_id))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.__plugins[plugin_id] for plugin_id in ranked]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pidroid.client import Pidroid
+
+class PluginStoreCursors:
+    """This class keeps the times up to which the plugin store was queried.
+
+    Cursors of the announcing process are shared through the database, so that the process which
+    takes over the announcements after a failover continues where the previous leader stopped.
+    Other processes keep their cursors in memory, so that they do not overwrite the shared ones."""
+
+    def __init__(self, client: Pidroid) -> None:
+        super().__init__()
+        self.client = client
+        self.__local: dict[str, int] = {}
+
+    async def get(self, key: str, *, shared: bool) -> int:
+        """Returns the time up to which the plugin store was queried, or -1 if it was never queried."""
+        if not shared:
+            return self.__local.get(key, -1)
+        value = await self.client.api.fetch_shared_value(key)
+        if value is None:
+            # Cursors used to be kept in the local data store of the announcing process
+            value = self.client.data_store.get(key)
+        return -1 if value is None else int(value)
+
+    async def set(self, key: str, value: int, *, shared: bool) -> None:
+        """Sets the time up to which the plugin store was queried."""
+        self.__local[key] = value
+        if shared:
+            await self.client.api.set_shared_value(key, str(value))
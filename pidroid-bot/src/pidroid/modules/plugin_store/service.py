@@ -9,11 +9,13 @@ from discord.ext import tasks, commands
 from typing import override
 
 from pidroid.client import Pidroid
+from pidroid.constants import THEOTOWN_GUILD
+from pidroid.modules.plugin_store.cursors import PluginStoreCursors
 from pidroid.modules.plugin_store.types import PluginStoreStatisticsDict
 from pidroid.modules.plugin_store.ui import MonthlyPluginReportLayout
 from pidroid.utils import http, truncate_string
 from pidroid.utils.cronjobs import start_cronjob
-from pidroid.utils.data import PersistentDataStore
+from pidroid.utils.leader import singleton_job
 from pidroid.utils.time import timedelta_to_datetime
 
 PLUGIN_SHOWCASE_CHANNEL_ID = 640522649033769000
@@ -34,6 +36,7 @@ class PluginStoreService(commands.Cog):
 
         self.new_plugins_cache: list[int] = []
         self.new_revisions_cache: list[int] = []
+        self.cursors = PluginStoreCursors(client)
 
         _ = self.retrieve_new_plugins.start()
         _ = self.retrieve_new_plugin_revisions.start()
@@ -41,6 +44,14 @@ class PluginStoreService(commands.Cog):
             start_cronjob(self.client, monthly_plugin_cronjob, "Monthly plugin statistics")
         )
 
+    @property
+    def announces(self) -> bool:
+        """Returns true if this process announces the plugin store changes to the TheoTown guild.
+
+        Only the leader of the cluster which owns the TheoTown guild announces them,
+        other clusters and replicas only keep their plugin catalog up to date."""
+        return self.client.owns_guild(THEOTOWN_GUILD) and self.client.leader.is_leader
+
     @override
     async def cog_unload(self):
         """Ensure that tasks are cancelled on cog unload."""
@@ -52,21 +63,18 @@ class PluginStoreService(commands.Cog):
     async def retrieve_new_plugins(self) -> None:
         """Retrieves new plugin store plugins and publishes them to TheoTown guild channel."""
 
-        channel = await self.client.get_or_fetch_channel(PLUGIN_SHOWCASE_CHANNEL_ID)
-        if channel is None:
-            return logger.warning("Showcase channel could not be resolved!")
-        assert isinstance(channel, TextChannel)
+        channel = None
+        if self.announces:
+            channel = await self.client.get_or_fetch_channel(PLUGIN_SHOWCASE_CHANNEL_ID)
+            if channel is None:
+                return logger.warning("Showcase channel could not be resolved!")
+            assert isinstance(channel, TextChannel)
 
         try:
-            async with PersistentDataStore() as store:
-                time = await store.get("last_plugin_approval_time")
-
-            if time is None:
-                last_approval_time = -1
-            else:
-                last_approval_time = int(time)
+            last_approval_time = await self.cursors.get("last_plugin_approval_time", shared=channel is not None)
 
             plugins = await self.client.api.fetch_new_plugins(last_approval_time)
+            self.client.api.plugin_catalog.update(plugins)
 
             if len(plugins) == 0:
                 self.new_plugins_cache = []
@@ -75,8 +83,9 @@ class PluginStoreService(commands.Cog):
             latest_approval_time = plugins[0].approval_time
             if latest_approval_time > last_approval_time:
 
-                async with PersistentDataStore() as store:
-                    await store.set("last_plugin_approval_time", str(latest_approval_time))
+                await self.cursors.set("last_plugin_approval_time", latest_approval_time, shared=channel is not None)
+                if channel is None:
+                    return
 
                 for plugin in plugins:
 
@@ -104,26 +113,38 @@ class PluginStoreService(commands.Cog):
     async def before_new_plugin_retriever(self) -> None:
         """Runs before retrieve_new_plugins task to ensure that the task is ready to run."""
         await self.client.wait_until_ready()
+        await self.load_plugin_catalog()
+
+    async def load_plugin_catalog(self) -> None:
+        """Loads the local plugin catalog, unless it is already loaded.
+
+        The catalog is afterwards kept up to date by the new plugin and revision retrievers."""
+        catalog = self.client.api.plugin_catalog
+        if catalog.is_loaded:
+            return
+        try:
+            # Every plugin was approved after the beginning of time
+            catalog.load(await self.client.api.fetch_new_plugins(-1))
+        except Exception:
+            logger.exception("An exception was encountered while trying to load the plugin catalog")
 
     @tasks.loop(seconds=60)
     async def retrieve_new_plugin_revisions(self) -> None:
         """Retrieves new plugin store plugin revisions and publishes them to a hidden channel."""
 
-        channel = await self.client.get_or_fetch_channel(PLUGIN_REVISION_CHANNEL_ID)
-        if channel is None:
-            return logger.warning("Revision channel could not be resolved!")
-        assert isinstance(channel, TextChannel)
+        channel = None
+        if self.announces:
+            channel = await self.client.get_or_fetch_channel(PLUGIN_REVISION_CHANNEL_ID)
+            if channel is None:
+                return logger.warning("Revision channel could not be resolved!")
+            assert isinstance(channel, TextChannel)
 
         try:
-            async with PersistentDataStore() as store:
-                time = await store.get("last_plugin_revision_query_time")
-
-            if time is None:
-                last_query_time = -1
-            else:
-                last_query_time = int(time)
+            last_query_time = await self.cursors.get("last_plugin_revision_query_time", shared=channel is not None)
 
             plugins = await self.client.api.fetch_new_revisions(last_query_time)
+            # Unapproved revisions are not visible in the plugin store yet
+            self.client.api.plugin_catalog.update([p for p in plugins if p.approval_time > 0])
 
             if len(plugins) == 0:
                 self.new_revisions_cache = []
@@ -132,8 +153,9 @@ class PluginStoreService(commands.Cog):
             last_plugin_time = plugins[-1].submission_time
             if last_plugin_time > last_query_time:
 
-                async with PersistentDataStore() as store:
-                    await store.set("last_plugin_revision_query_time", str(last_plugin_time))
+                await self.cursors.set("last_plugin_revision_query_time", last_plugin_time, shared=channel is not None)
+                if channel is None:
+                    return
 
                 for plugin in plugins:
                     if plugin.revision_id in self.new_revisions_cache:
@@ -161,8 +183,11 @@ class PluginStoreService(commands.Cog):
         await self.client.wait_until_ready()
 
 @aiocron.crontab('0 9 1 * *', start=False) # At 8 in the morning of the first day every month
+@singleton_job
 async def monthly_plugin_cronjob(client: Pidroid) -> None:
     """Retrieves monthly plugin information and posts it to TheoTown guild channel."""
+    if not client.owns_guild(THEOTOWN_GUILD):
+        return
     try:
         channel = await client.get_or_fetch_channel(PLUGIN_INFORMATION_CHANNEL_ID)
         assert isinstance(channel, TextChannel)
@@ -171,16 +196,16 @@ async def monthly_plugin_cronjob(client: Pidroid) -> None:
 
         month_of_data = int(data["month"])
 
-        async with PersistentDataStore() as store:
-            previous_month = await store.get("last_plugin_statistic_month")
+        # The month is shared, so that a failover does not announce the same month again
+        service = client.get_cog("PluginStoreService")
+        assert isinstance(service, PluginStoreService)
+        previous_month = await service.cursors.get("last_plugin_statistic_month", shared=True)
 
-        if previous_month is None:
+        if previous_month == -1:
             return
-        previous_month = int(previous_month)
 
         if month_of_data != previous_month:
-            async with PersistentDataStore() as store:
-                await store.set("last_plugin_statistic_month", str(month_of_data))
+            await service.cursors.set("last_plugin_statistic_month", month_of_data, shared=True)
 
             layout = MonthlyPluginReportLayout(data)
             _ = await channel.send(view=layout)
@@ -0,0 +1,238 @@
+"""Replays a gateway recording through the loaded cogs.
+
+Recordings are made by running the bot with the GATEWAY_RECORDING_PATH environment variable set.
+The events are fed to the cogs without connecting to Discord, requests to the Discord REST API
+are answered by a fake REST layer and the database is the one specified by --postgres-dsn or
+the PIDROID_REPLAY_POSTGRES_DSN environment variable. The bot's POSTGRES_DSN is deliberately not used,
+as replayed events write to the database.
+
+Usage:
+    replay recording.jsonl.gz --speed 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import time
+
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from discord import ClientUser
+from discord.http import Route
+from typing import Any
+
+from pidroid.client import Pidroid
+from pidroid.main import offline_config
+from pidroid.utils.gateway import RecordedEvent, read_recording
+from pidroid.utils.metrics import COMMAND_LATENCY, LISTENER_LATENCY
+
+logger = logging.getLogger("pidroid.replay")
+
+# Snowflakes of the objects created by the fake REST layer
+_snowflakes = itertools.count(1 << 60)
+
+class FakeDiscordHTTP:
+    """This class answers the requests to the Discord REST API made during a replay.
+
+    Nothing is sent to Discord, requests are only counted per route. Requests which create
+    a message are answered with a synthesized message, as the callers expect one back."""
+
+    def __init__(self, client: Pidroid) -> None:
+        super().__init__()
+        self.client = client
+        self.requests: Counter[str] = Counter()
+
+    def install(self) -> None:
+        """Replaces the request method of the client HTTP client."""
+        self.client.http.request = self.request # pyright: ignore[reportAttributeAccessIssue]
+
+    async def request(self, route: Route, **kwargs: Any) -> Any:
+        self.requests[route.key] += 1
+        if route.method == "POST" and route.path == "/channels/{channel_id}/messages":
+            return self.__create_message(route, kwargs.get("json") or {})
+        return None
+
+    def __create_message(self, route: Route, payload: dict[str, Any]) -> dict[str, Any]:
+        assert self.client.user is not None
+        return {
+            "id": str(next(_snowflakes)),
+            "channel_id": str(route.channel_id),
+            "type": 0,
+            "content": payload.get("content") or "",
+            "author": {
+                "id": str(self.client.user.id),
+                "username": self.client.user.name,
+                "discriminator": self.client.user.discriminator,
+                "avatar": None,
+                "bot": True
+            },
+            "attachments": [],
+            "embeds": payload.get("embeds") or [],
+            "mentions": [],
+            "mention_roles": [],
+            "mention_everyone": False,
+            "pinned": False,
+            "tts": False,
+            "timestamp": "2000-01-01T00:00:00+00:00",
+            "edited_timestamp": None
+        }
+
+@dataclass
+class LatencySummary:
+    count: int = 0
+    total: float = 0.0
+    # Cumulative bucket counts keyed by the upper bound
+    buckets: Counter[float] = field(default_factory=Counter)
+
+    @property
+    def mean(self) -> float:
+        """Returns the mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def p95(self) -> float:
+        """Returns the upper bound of the bucket which holds the 95th percentile."""
+        for bound in sorted(self.buckets):
+            if self.buckets[bound] >= self.count * 0.95:
+                return bound
+        return float("inf")
+
+def _summarize(samples: list[dict[str, Any]], get_group: Callable[[dict[str, str]], str]) -> dict[str, LatencySummary]:
+    summaries: dict[str, LatencySummary] = {}
+    for sample in samples:
+        labels = sample["labels"]
+        summary = summaries.setdefault(get_group(labels), LatencySummary())
+        if sample["name"].endswith("_bucket"):
+            summary.buckets[float(labels["le"])] += sample["value"]
+        elif sample["name"].endswith("_sum"):
+            summary.total += sample["value"]
+        elif sample["name"].endswith("_count"):
+            summary.count += sample["value"]
+    return summaries
+
+def get_cog_latencies(client: Pidroid) -> dict[str, LatencySummary]:
+    """Returns the listener and command latencies grouped by the cog they belong to."""
+
+    def get_listener_cog(labels: dict[str, str]) -> str:
+        # Listener names are qualified by the cog class, which is also the cog name in this bot
+        owner, _, _ = labels["listener"].rpartition(".")
+        return owner or "(no cog)"
+
+    def get_command_cog(labels: dict[str, str]) -> str:
+        command = client.get_command(labels["command"])
+        if command is None or command.cog_name is None:
+            return "(no cog)"
+        return command.cog_name
+
+    summaries = _summarize(LISTENER_LATENCY.collect(), get_listener_cog)
+    for cog, summary in _summarize(COMMAND_LATENCY.collect(), get_command_cog).items():
+        merged = summaries.setdefault(cog, LatencySummary())
+        merged.count += summary.count
+        merged.total += summary.total
+        merged.buckets.update(summary.buckets)
+    return summaries
+
+async def _wait_for_listeners() -> None:
+    """Waits until every dispatched event listener finishes."""
+    while True:
+        pending = [
+            task for task in asyncio.all_tasks()
+            if task.get_name().startswith("discord.py:") and not task.done()
+        ]
+        if not pending:
+            return
+        _ = await asyncio.wait(pending)
+
+async def _prepare(client: Pidroid, events: list[RecordedEvent]) -> None:
+    """Builds the guild state from the recording and loads the cogs."""
+    await client._async_setup_hook() # pyright: ignore[reportPrivateUsage]
+    state = client._connection # pyright: ignore[reportPrivateUsage]
+    for event in events:
+        if event.type == "READY":
+            state.user = ClientUser(state=state, data=event.data["user"])
+            application = event.data.get("application")
+            if application is not None:
+                state.application_id = int(application["id"])
+        elif event.type == "GUILD_CREATE":
+            _ = state._add_guild_from_data(event.data) # pyright: ignore[reportPrivateUsage]
+    if state.user is None:
+        raise ValueError("The recording does not contain the READY event")
+
+    await client.api.test_connection()
+    await client.data_store.load()
+    await client.load_cogs()
+    client._ready.set() # pyright: ignore[reportPrivateUsage]
+    client.dispatch("ready")
+    await client.wait_until_guild_configurations_loaded()
+
+async def replay(client: Pidroid, path: str, speed: float) -> None:
+    """Feeds the recorded events to the client and prints a report."""
+    events = list(read_recording(path))
+    rest = FakeDiscordHTTP(client)
+    rest.install()
+    await _prepare(client, events)
+
+    parsers = client._connection.parsers # pyright: ignore[reportPrivateUsage]
+    replayed = [event for event in events if event.type not in ("READY", "GUILD_CREATE")]
+    logger.info(f"Replaying {len(replayed)} events")
+
+    started_at = time.perf_counter()
+    first_offset = replayed[0].offset if replayed else 0.0
+    for event in replayed:
+        if speed > 0:
+            # Keep the recorded gaps between the events, scaled by the speed
+            delay = (event.offset - first_offset) / speed - (time.perf_counter() - started_at)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+        try:
+            parsers[event.type](event.data)
+        except Exception:
+            logger.exception(f"Failed to parse a recorded {event.type} event")
+    await _wait_for_listeners()
+    elapsed = time.perf_counter() - started_at
+
+    throughput = len(replayed) / elapsed if elapsed > 0 else 0.0
+    print(f"Replayed {len(replayed)} events in {elapsed:.2f} seconds ({throughput:.1f} events/s)")
+    print()
+    print(f"{'Cog':<32} {'Calls':>8} {'Mean ms':>10} {'p95 ms':>10}")
+    latencies = sorted(get_cog_latencies(client).items(), key=lambda item: item[1].total, reverse=True)
+    for cog, summary in latencies:
+        print(f"{cog:<32} {summary.count:>8} {summary.mean * 1000:>10.2f} {summary.p95 * 1000:>10.0f}")
+    print()
+    print(f"{'REST route':<64} {'Requests':>8}")
+    for route, count in rest.requests.most_common():
+        print(f"{route:<64} {count:>8}")
+
+async def _run(path: str, speed: float, postgres_dsn: str) -> None:
+    client = Pidroid(offline_config(postgres_dsn))
+    try:
+        await replay(client, path, speed)
+    finally:
+        await client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays a gateway recording through the loaded cogs.")
+    _ = parser.add_argument("recording", help="path to the recording made with GATEWAY_RECORDING_PATH")
+    _ = parser.add_argument(
+        "--speed", type=float, default=1.0,
+        help="how many times faster than recorded to replay the events, 0 replays them as fast as possible"
+    )
+    _ = parser.add_argument(
+        "--postgres-dsn", default=os.environ.get("PIDROID_REPLAY_POSTGRES_DSN"),
+        help="database the cogs use, defaults to the PIDROID_REPLAY_POSTGRES_DSN environment variable"
+    )
+    args = parser.parse_args()
+    if not args.postgres_dsn:
+        sys.exit("No database was specified. Please specify it using --postgres-dsn or the PIDROID_REPLAY_POSTGRES_DSN environment variable.")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args.recording, args.speed, args.postgres_dsn))
+
+if __name__ == "__main__":
+    main()
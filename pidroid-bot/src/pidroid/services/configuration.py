@@ -7,6 +7,7 @@ from discord.guild import Guild
 from discord.role import Role
 
 from pidroid.client import Pidroid
+from pidroid.utils.members import MemberCachePolicy
 
 logger = logging.getLogger("pidroid.services.configuration")
 
@@ -20,6 +21,12 @@ class GuildConfigurationService(commands.Cog):
     async def on_ready(self) -> None:
         """This notifies the host of the bot that the client is ready to use."""
         await self.__fill_guild_prefix_cache()
+        # Commands in the guilds without a configuration use the default prefixes meanwhile
+        _ = self.client.warmups.schedule(
+            "guild configuration generation", self.__generate_missing_guild_configurations, priority=0
+        )
+        if self.client.member_chunker.policy == MemberCachePolicy.configured:
+            _ = self.client.warmups.schedule("member chunking", self.__chunk_configured_guilds, priority=5)
         #assert self.client.user is not None
         #logger.info(f'{self.client.user.name} bot (build {self.client.full_version}) has started with the ID of {self.client.user.id}')
 
@@ -28,21 +35,38 @@ class GuildConfigurationService(commands.Cog):
         logger.debug("Filling guild prefix cache")
         raw_configs = await self.client.api.fetch_guild_configurations()
         for config in raw_configs:
+            # Other clusters receive the messages of the guilds they own
+            if not self.client.owns_guild(config.guild_id):
+                continue
             self.client.update_guild_prefixes_from_config(config.guild_id, config)
         logger.debug("Guild prefix cache filled")
 
-        # Generate configurations for guilds that do not already have it
+        self.client._guild_prefix_cache_ready.set()
+        self.client.startup_report.mark_ready()
+        logger.debug("Guild prefix cache ready")
+
+    async def __generate_missing_guild_configurations(self):
+        """Generates configurations for guilds that do not already have it."""
         logger.debug("Generating missing guild configurations")
         for guild in self.client.guilds:
             prefixes = self.client.get_guild_prefixes(guild.id)
             # If there's no prefix entry, there's no guild configuration either
             if prefixes is None:
-                config = await self.client.api.insert_guild_configuration(guild.id)
-                self.client.update_guild_prefixes_from_config(guild.id, config)
-                logger.warn(f"Guild \"{guild.name}\" ({guild.id}) did not have a guild configuration. Generated one automatically")
-
-        self.client._guild_prefix_cache_ready.set()
-        logger.debug("Guild prefix cache ready")
+                # The guild may have been joined, and its configuration generated, since the cache was filled
+                config = await self.client.api.fetch_guild_configuration(guild.id)
+                if config is None:
+                    config = await self.client.api.insert_guild_configuration(guild.id)
+                    logger.warn(f"Guild \"{guild.name}\" ({guild.id}) did not have a guild configuration. Generated one automatically")
+                _ = self.client.update_guild_prefixes_from_config(guild.id, config)
+
+    async def __chunk_configured_guilds(self):
+        """Caches every member of the guilds which use features that need them."""
+        configs = {config.guild_id: config for config in await self.client.api.fetch_guild_configurations()}
+        chunker = self.client.member_chunker
+        for guild in self.client.guilds:
+            config = configs.get(guild.id)
+            if config is not None and chunker.should_chunk_after_startup(config):
+                await chunker.ensure_chunked(guild)
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: Guild):
@@ -8,13 +8,18 @@ from contextlib import suppress
 from discord.errors import HTTPException
 from discord.ext import commands
 from discord.ext.commands.context import Context
-from jishaku.paginators import PaginatorInterface, WrappedPaginator
 from typing import TYPE_CHECKING
 
 from pidroid.models import exceptions
 from pidroid.utils.embeds import ErrorEmbed as ErrorEmbed
+from pidroid.utils.lazy import LazyModule
 from pidroid.utils.time import humanize
 
+if TYPE_CHECKING:
+    from jishaku import paginators
+else:
+    paginators = LazyModule("jishaku.paginators")
+
 # Errors which command error handler will ignore
 ignored_exceptions = (
     commands.CommandNotFound,
@@ -151,7 +156,7 @@ class ErrorHandlingService(commands.Cog):
             if await self.client.is_owner(ctx.message.author):
 
                 # Create a wrapped paginator which will keep our exception message
-                paginator = WrappedPaginator(
+                paginator = paginators.WrappedPaginator(
                     prefix=f'Exception handler not found for {type(error).__name__}\n```py',
                     suffix='```',
                     max_size=1985
@@ -165,7 +170,7 @@ class ErrorHandlingService(commands.Cog):
                 paginator.add_line(trace)
 
                 # Create paginator interface, I.E, the interactive buttons thing
-                interface = PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
+                interface = paginators.PaginatorInterface(ctx.bot, paginator, owner=ctx.author)
                 return await interface.send_to(ctx)
             with suppress(HTTPException):
                 _ = await ctx.reply(embed=ErrorEmbed(
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import logging
+
+from collections import deque
+from contextlib import suppress
+from faststream.rabbit import ExchangeType, RabbitBroker, RabbitExchange
+from typing import Any
+
+from pidroid.utils.http import get_backoff_delay
+
+logger = logging.getLogger("pidroid.services.event_bus")
+
+# Fanout exchange over which batches of bot events are pushed to every consumer
+EVENTS_EXCHANGE = RabbitExchange("bot.events", type=ExchangeType.FANOUT)
+
+class EventBus:
+    """This class implements a batching publisher of bot events.
+
+    Events are buffered in memory and published in batches, each batch being a single message
+    that is confirmed by the broker. When publishing fails, the batch is retried with backoff.
+    If the buffer fills up in the meantime, the oldest events are dropped."""
+
+    def __init__(
+        self,
+        broker: RabbitBroker,
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_pending: int = 10_000
+    ) -> None:
+        super().__init__()
+        self.__broker = broker
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.__pending: deque[dict[str, Any]] = deque(maxlen=max_pending)
+        self.__wake = asyncio.Event()
+        self.__task: asyncio.Task[None] | None = None
+        self.dropped = 0
+
+    @property
+    def pending_events(self) -> int:
+        """Returns the amount of events waiting to be published."""
+        return len(self.__pending)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Queues the event to be published with the next batch."""
+        if len(self.__pending) == self.__pending.maxlen:
+            self.dropped += 1
+        self.__pending.append(event)
+        if len(self.__pending) >= self.batch_size:
+            self.__wake.set()
+
+    def start(self) -> None:
+        """Starts publishing the queued events in the background."""
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Stops the background publishing and publishes the remaining events once."""
+        if self.__task is not None:
+            _ = self.__task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+        while self.__pending:
+            try:
+                await self.__publish_batch()
+            except Exception:
+                logger.exception(f"Failed to publish {len(self.__pending)} remaining events")
+                break
+
+    async def __publish_batch(self) -> None:
+        batch = [self.__pending.popleft() for _ in range(min(self.batch_size, len(self.__pending)))]
+        try:
+            # Publisher confirms are enabled, therefore this returns once the broker has accepted the batch
+            _ = await self.__broker.publish(
+                # Event details may contain values like dates, which are sent as their string form
+                json.dumps({"events": batch}, default=str).encode(),
+                exchange=EVENTS_EXCHANGE,
+                content_type="application/json"
+            )
+        except BaseException:
+            # Put the batch back in front, in the original order
+            self.__pending.extendleft(reversed(batch))
+            raise
+
+    async def __run(self) -> None:
+        failures = 0
+        while True:
+            with suppress(asyncio.TimeoutError):
+                _ = await asyncio.wait_for(self.__wake.wait(), self.flush_interval)
+            self.__wake.clear()
+
+            while self.__pending:
+                try:
+                    await self.__publish_batch()
+                except Exception:
+                    delay = get_backoff_delay(failures, 1.0, 60.0)
+                    failures += 1
+                    logger.exception(f"Failed to publish a batch of events, retrying in {delay:.1f} seconds")
+                    await asyncio.sleep(delay)
+                    break
+                failures = 0
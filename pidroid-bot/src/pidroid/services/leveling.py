@@ -8,11 +8,13 @@ import random
 
 from discord import Guild, Member, Message, MessageType, Role, User
 from discord.ext import commands
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, override
 
+from pidroid.models.event_types import EventName, EventType
 from pidroid.models.guild_configuration import GuildConfiguration
 from pidroid.utils.db.levels import LevelRewards, UserLevels
 from pidroid.utils.debouncer import RoleChangeDebouncer, RoleAction
+from pidroid.utils.metrics import DEBOUNCER_PENDING, registry
 from pidroid.utils.time import utcnow
 
 logger = logging.getLogger('pidroid.leveling')
@@ -74,6 +76,17 @@ class LevelingService(commands.Cog):
         self.__startup_sync_finished = asyncio.Event()
         self.__role_debouncer = RoleChangeDebouncer(client, 20)
 
+    @override
+    async def cog_load(self) -> None:
+        registry.add_collector(self.__collect_metrics)
+
+    @override
+    async def cog_unload(self) -> None:
+        registry.remove_collector(self.__collect_metrics)
+
+    def __collect_metrics(self) -> None:
+        DEBOUNCER_PENDING.set(self.__role_debouncer.pending_operations)
+
     def get_bucket(self, guild_id: int, user_id: int) -> UserBucket:
         """Returns the user cooldown bucket."""
         guild = self.__cooldown_storage.get(guild_id, None)
@@ -125,6 +138,7 @@ class LevelingService(commands.Cog):
 
         # Update every eligible user
         logger.debug(f"Syncing {guild} member levels")
+        await self.client.member_chunker.ensure_chunked(guild)
         for member_information in await conf.fetch_all_member_levels():
             # Obtain member object, if we can't do that
             # then move onto the next member
@@ -168,7 +182,12 @@ class LevelingService(commands.Cog):
         This can handle the following scenarios:
             - new level rewards getting added;
             - user joins or role gets deleted while bot is offline;
+
+        The sync is run as a warm-up, after the more important ones.
         """
+        _ = self.client.warmups.schedule("level reward sync", self.__sync_level_reward_state, priority=10)
+
+    async def __sync_level_reward_state(self) -> None:
         await self.client.wait_until_guild_configurations_loaded()
         logger.info("Syncing level reward state")
         for guild in self.client.guilds:
@@ -257,6 +276,10 @@ class LevelingService(commands.Cog):
         logger.debug(
             f'{member} just leveled up to {info_after.level} level in {message.guild} ({message.guild.id}) guild!'
         )
+        self.client.log_event(
+            EventType.level_up, EventName.level_up, info_after.guild_id, member.id, member.id,
+            extra={"level": info_after.level, "total_xp": info_after.total_xp}
+        )
 
         rewards = await self.client.api.fetch_eligible_level_rewards_for_level(
             info_after.guild_id, info_after.level
@@ -8,6 +8,7 @@ from discord import AuditLogDiff, AuditLogEntry, Member, Object, Role, User, abc
 from discord.ext import commands
 from typing import TYPE_CHECKING, Any
 
+from pidroid.models.event_types import EventName, EventType
 from pidroid.models.logs import _ChannelData, _OverwriteData, _MemberRoleUpdateData, _MemberUpdateData, _RoleUpdateData, BanData, ChannelCreateData, ChannelCreateLog, ChannelDeleteData, ChannelDeleteLog, ChannelUpdateData, ChannelUpdateLog, KickData, MemberRoleUpdateData, MemberRoleUpdateLog, MemberUpdateData, MemberUpdateLog, OverwriteCreateData, OverwriteCreateLog, OverwriteDeleteData, OverwriteDeleteLog, OverwriteUpdateData, OverwriteUpdateLog, PidroidLog, RoleCreateData, RoleCreateLog, RoleDeleteData, RoleDeleteLog, RoleUpdateData, RoleUpdateLog, UnbanData
 
 # TODO: All punishments throughout the server (bans, unbans, warns, kicks, jails)
@@ -520,6 +521,13 @@ class LoggingService(commands.Cog):
         # If logging system is not active, do nothing
         if not conf.logging_active:
             return
+
+        # Logs are only streamed for guilds which opted into logging
+        embed = log.as_embed()
+        self.client.log_event(
+            EventType.pidroid_log, EventName.pidroid_log, log.guild.id, None, None,
+            extra={"log": log.__logname__, "embed": embed.to_dict()}
+        )
         
         # If we don't have a logging channel set
         # TODO: consider migrating to allow to set custom channels for different logs
@@ -528,7 +536,7 @@ class LoggingService(commands.Cog):
         
         channel = await self.client.get_or_fetch_guild_channel(log.guild, conf.logging_channel_id)
         if channel:
-            await self.client.queue(channel, log.as_embed())
+            await self.client.queue(channel, embed)
         else:
             logger.warning(f"Could not resolve a guild channel {conf.logging_channel_id} to send a Pidroid log to")
 
@@ -7,14 +7,24 @@ from typing import override
 from sqlalchemy import delete, select
 
 from pidroid.client import Pidroid
+from pidroid.models.event_types import EventName, EventType
 from pidroid.utils.aliases import MessageableGuildChannel, MessageableGuildChannelTuple
 from pidroid.utils.checks import member_has_channel_permission
 from pidroid.utils.db.reminder import Reminder
 from pidroid.utils.embeds import PidroidEmbed
+from pidroid.utils.leader import singleton_job
 from pidroid.utils.time import utcnow
 
 logger = logging.getLogger("pidroid.services.reminders")
 
+def get_reminder_guild_id(reminder: Reminder) -> int | None:
+    """Returns the ID of the guild the reminder was created in, or None if it was created in direct messages."""
+    # Message URLs have the form of https://discord.com/channels/<guild ID or @me>/<channel ID>/<message ID>
+    parts = reminder.message_url.rstrip("/").split("/")
+    if len(parts) < 3 or not parts[-3].isdigit():
+        return None
+    return int(parts[-3])
+
 class ReminderService(commands.Cog):
     """This class implements a cog for handling deliveries of reminders."""
 
@@ -30,7 +40,8 @@ class ReminderService(commands.Cog):
 
     async def send_reminder(self, reminder: Reminder) -> Message | None:
         """Sends a reminder."""
-        user = self.client.get_user(reminder.user_id)
+        # The user might only be cached by the cluster which owns the guilds the user is in
+        user = await self.client.get_or_fetch_user(reminder.user_id)
         # If we cannot find the user, don't even bother
         if user is None:
             return
@@ -70,6 +81,7 @@ class ReminderService(commands.Cog):
 
 
     @tasks.loop(seconds=15)
+    @singleton_job
     async def deliver_due_reminders(self) -> None:
         """Periodically fetches and delivers due reminders."""
         try:
@@ -85,8 +97,16 @@ class ReminderService(commands.Cog):
                     # Go over each reminder, send it
                     # and delete it from database
                     for reminder in result.scalars():
+                        if not self.client.owns_guild(get_reminder_guild_id(reminder)):
+                            continue
                         try:
-                            _ = await self.send_reminder(reminder)
+                            message = await self.send_reminder(reminder)
+                            self.client.log_event(
+                                EventType.reminder_deliver, EventName.reminder_deliver,
+                                message.guild.id if message and message.guild else None,
+                                reminder.id, reminder.user_id,
+                                extra={"delivered": message is not None}
+                            )
                         except Exception:
                             logger.exception("An exception was encountered while trying to send a due reminder")
                         await session.execute(
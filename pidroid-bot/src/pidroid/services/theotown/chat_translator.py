@@ -1,5 +1,4 @@
 import asyncio
-import emoji # I am not updating the emoji regex myself every time there's a new one
 import re
 import logging
 
@@ -9,14 +8,21 @@ from discord.ext import commands
 from discord.channel import TextChannel
 from discord.utils import remove_markdown
 from discord.message import Message
-from typing import TypedDict
+from typing import TYPE_CHECKING, TypedDict
 
 from pidroid.client import Pidroid
 from pidroid.models.translation import TranslationEntryDict
 from pidroid.utils.embeds import PidroidEmbed
 from pidroid.utils.http import post
+from pidroid.utils.lazy import LazyModule
 from pidroid.utils.time import utcnow
 
+# I am not updating the emoji regex myself every time there's a new one
+if TYPE_CHECKING:
+    import emoji
+else:
+    emoji = LazyModule("emoji")
+
 class TranslateApiResponseDict(TypedDict):
     translations: list[TranslationEntryDict]
 
@@ -1,7 +1,6 @@
 import asyncio
 import datetime
 
-from discord import File
 from discord.message import Message
 from discord.ext import commands
 from random import randint
@@ -9,7 +8,7 @@ from random import randint
 from pidroid.client import Pidroid
 from pidroid.constants import JUSTANYONE_ID
 from pidroid.utils.checks import is_guild_theotown
-from pidroid.utils.file import Resource
+from pidroid.utils.file import resource_file
 from pidroid.utils.time import utcnow
 
 def find_whole_word(word: str, string: str) -> bool:
@@ -186,7 +185,7 @@ class CopypastaService(commands.Cog):
         if not is_guild_theotown(message.guild) and message.author.id != JUSTANYONE_ID:
             if len(message.mentions) > 0 and any(mention.id == JUSTANYONE_ID for mention in message.mentions):
                 if self.check_cooldown("ping_ja", 60 * 60 * 24):
-                    _ = await message.reply(file=File(Resource('ja ping.png')), delete_after=0.9)
+                    _ = await message.reply(file=resource_file('ja ping.png'), delete_after=0.9)
 
         # Only allow copypastas in TheoTown guild
         if not is_guild_theotown(message.guild):
@@ -86,7 +86,11 @@ class EventHandlerService(commands.Cog):
         Called when bot is ready.
         
         This task updates the vote reactions of the last 200 messages in the events channel.
+        The update is run as a warm-up, after the more important ones.
         """
+        _ = self.client.warmups.schedule("events forum scan", self.__update_vote_reactions, priority=20)
+
+    async def __update_vote_reactions(self) -> None:
         guild = self.client.get_guild(THEOTOWN_GUILD)
         if guild is None:
             return logger.warning("Could not locate TheoTown guild when updating reactions.")
@@ -6,6 +6,7 @@ from typing import override
 from pidroid.client import Pidroid
 from pidroid.constants import THEOTOWN_GUILD
 from pidroid.utils.http import Route
+from pidroid.utils.leader import singleton_job
 
 logger = logging.getLogger("pidroid.services.theotown.guild_statistics")
 
@@ -23,8 +24,11 @@ class GuildStatisticsService(commands.Cog):
         self.update_statistics.cancel()
 
     @tasks.loop(seconds=300)
+    @singleton_job
     async def update_statistics(self) -> None:
         """Updates TheoTown API with guild member count."""
+        if not self.client.owns_guild(THEOTOWN_GUILD):
+            return
         try:
             guild = self.client.get_guild(THEOTOWN_GUILD)
             if guild is None:
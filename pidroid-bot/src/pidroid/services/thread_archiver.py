@@ -6,6 +6,7 @@ from discord.threads import Thread
 from typing import override
 
 from pidroid.client import Pidroid
+from pidroid.utils.leader import singleton_job
 from pidroid.utils.time import utcnow
 
 logger = logging.getLogger("pidroid.services.thread_archiver")
@@ -24,10 +25,13 @@ class ThreadArchiverService(commands.Cog):
         self.archive_threads.cancel()
 
     @tasks.loop(seconds=60)
+    @singleton_job
     async def archive_threads(self) -> None:
         """Archives expired threads."""
         threads_to_archive = await self.client.api.fetch_expired_threads(utcnow())
         for thread_entry in threads_to_archive:
+            if not self.client.owns_guild(thread_entry.guild_id):
+                continue
 
             try:
                 thread = await self.client.fetch_channel(thread_entry.thread_id)
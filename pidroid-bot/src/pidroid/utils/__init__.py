@@ -206,7 +206,26 @@ def _parse_call_name(call: ast.Call) -> list[str]:
     raise ValueError("Unknown call func attribute")
 
 
-def get_function_decorators(func) -> list[Decorator]:
+def _parse_keyword_value(value: ast.expr) -> Any:
+    if isinstance(value, ast.Constant):
+        return value.value
+
+    if isinstance(value, ast.Name):
+        return value.id
+
+    if isinstance(value, ast.Attribute):
+        return '.'.join(_parse_attribute(value))
+
+    if isinstance(value, (ast.List, ast.Tuple)):
+        return [_parse_keyword_value(elem) for elem in value.elts]
+
+    # Anything else is shown as it is written
+    return ast.unparse(value)
+
+def get_function_decorators(func: Callable[..., Any]) -> list[Decorator]:
+    """Returns the decorators of the function, parsed from its source code.
+
+    Parsing is slow, therefore the result should be cached by the caller."""
     # Get the source code of the function
     source_code = inspect.getsource(func)
 
@@ -216,52 +235,28 @@ def get_function_decorators(func) -> list[Decorator]:
     # Parse the source code into an AST
     tree = ast.parse(dedented_code)
 
-    # Extract decorator information from the AST
-    decorators: list[ast.Call] = []
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            for decorator_node in node.decorator_list:
-                assert isinstance(decorator_node, ast.Call)
-                decorators.append(decorator_node)
-                print("Decorator:", ast.dump(decorator_node))
+    # Only the decorators of the function itself, not of the functions defined inside of it
+    node = tree.body[0]
+    if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return []
 
-    print()
     parsed: list[Decorator] = []
-    for dec in decorators:
-
-        call_name = _parse_call_name(dec)
+    for decorator_node in node.decorator_list:
+        # Decorators which are not called, such as @override, have no arguments
+        if not isinstance(decorator_node, ast.Call):
+            if isinstance(decorator_node, ast.Attribute):
+                parsed.append(Decorator(func=_parse_attribute(decorator_node), keywords=[]))
+            elif isinstance(decorator_node, ast.Name):
+                parsed.append(Decorator(func=[decorator_node.id], keywords=[]))
+            continue
 
         # Parse every keyword
-        keywords: list[tuple[Any, Any]] = []
-        for keyword in dec.keywords:
-            assert isinstance(keyword, ast.keyword)
-
-
-            value = None
-            if isinstance(keyword.value, ast.Constant):
-                value = keyword.value.value
-
-            elif isinstance(keyword.value, ast.Name):
-                value = keyword.value.id
-
-            elif isinstance(keyword.value, ast.List):
-                value = []
-                for elem in keyword.value.elts:
-                    print(elem)
-
-            else:
-                print(keyword.__dict__)
-                print(keyword.value)
-                print(dir(keyword.value))
-                print(keyword.value.__dict__)
-
-            keywords.append((
-                keyword.arg, value
-            ))
-
+        keywords: list[tuple[Any, Any]] = [
+            (keyword.arg, _parse_keyword_value(keyword.value)) for keyword in decorator_node.keywords
+        ]
         parsed.append(
             Decorator(
-                func=call_name,
+                func=_parse_call_name(decorator_node),
                 keywords=keywords
             )
         )
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
+import time
 
 from discord import Message, Member, Guild
 from typing import TYPE_CHECKING, Any
 
 from pidroid.models.tags import Tag
 from pidroid.models.guild_configuration import GuildConfiguration
-from pidroid.models.plugins import NewPlugin, NewPluginRevision, Plugin
+from pidroid.models.plugins import AbstractPlugin, NewPlugin, NewPluginRevision, Plugin
 from pidroid.models.accounts import TheoTownAccount
+from pidroid.models.event_types import EventName, EventType
 from pidroid.models.translation import TranslationEntryDict
 from pidroid.modules.moderation.models.case import Case
+from pidroid.modules.plugin_store.catalog import PluginCatalog
 from pidroid.modules.moderation.models.types import PunishmentType
+from pidroid.utils.cache import AsyncCache
 from pidroid.utils.db.expiring_thread import ExpiringThread
 from pidroid.utils.db.guild_configuration import GuildConfigurationTable
 from pidroid.utils.db.levels import LevelRewards, UserLevels
@@ -19,21 +24,46 @@ from pidroid.utils.db.linked_account import LinkedAccount
 from pidroid.utils.db.moderation import GuildCaseCounter, ModerationCase, ActivePunishment, RevocationData
 from pidroid.utils.db.punishment import PunishmentTable
 from pidroid.utils.db.reminder import Reminder
+from pidroid.utils.db.shared_value import SharedValue
 from pidroid.utils.db.tag import TagTable
 from pidroid.utils.db.translation import Translation
-from pidroid.utils.http import HTTP, APIResponse, Route
+from pidroid.utils.http import DEFAULT_TIMEOUT, HTTP, APIResponse, Route
+from pidroid.utils.invalidation import CacheScope, Invalidation, InvalidationBus
+from pidroid.utils.metrics import DATABASE_QUERY_LATENCY
 from pidroid.utils.time import utcnow
 
 
-from sqlalchemy import func, delete, select, update
+from sqlalchemy import event, func, delete, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 if TYPE_CHECKING:
     from pidroid.client import Pidroid
 
+# Amount of the best plugin catalog matches to fetch when the TheoTown API search does not find them
+CATALOG_FETCH_LIMIT = 5
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    # The start time is kept on the execution context, which is discarded along with it if the statement fails
+    context.pidroid_query_start_time = time.perf_counter()
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    start = context.pidroid_query_start_time
+    # Only the statement keyword is used as the label to keep the amount of series low
+    operation = statement.split(None, 1)[0].upper() if statement else "UNKNOWN"
+    DATABASE_QUERY_LATENCY.observe(time.perf_counter() - start, operation=operation)
+
+async def _get_write_version(session: AsyncSession) -> int:
+    """Returns the version of the data written in the current transaction.
+
+    The database clock is shared by every process and conflicting writes wait for the transaction
+    to commit, therefore a later write of the same data always gets a greater version."""
+    await session.flush()
+    result = await session.execute(select(func.clock_timestamp()))
+    return int(result.scalar_one().timestamp() * 1_000_000)
+
 class API:
     """This class handles operations related to Pidroid's Postgres database and remote TheoTown API."""
 
@@ -42,28 +72,60 @@ class API:
         self.client = client
         self.__http = HTTP(client)
         self.__engine = create_async_engine(dsn, echo=echo)
+        event.listen(self.__engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(self.__engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
         self.session = async_sessionmaker(self.__engine, expire_on_commit=False, class_=AsyncSession)
+        self.plugin_catalog = PluginCatalog()
+
+        # Written data is evicted from the caches of every process through the invalidation bus,
+        # the entries also expire in case an invalidation is lost
+        self.invalidations = InvalidationBus()
+        self.invalidations.add_handler(self.evict)
+        self.__guild_configurations: AsyncCache[int, GuildConfigurationTable | None] = AsyncCache(
+            "guild_configurations", ttl=10 * 60, max_size=4096
+        )
+        self.__level_rewards: AsyncCache[int, list[LevelRewards]] = AsyncCache("level_rewards", ttl=10 * 60, max_size=1024)
+        self.__translations: AsyncCache[str, list[TranslationEntryDict]] = AsyncCache("translations", ttl=60 * 60, max_size=1024)
 
     async def test_connection(self) -> None:
         """Test the connection to the database by opening a temporary connection."""
         temp_conn = await self.__engine.connect()
         await temp_conn.close()
 
-    async def get(self, route: Route) -> APIResponse:
-        """Sends a GET request to the TheoTown API."""
-        return await self.__http.request("GET", route)
+    async def connect(self) -> AsyncConnection:
+        """Returns a database connection from the pool, which has to be closed by the caller."""
+        return await self.__engine.connect()
+
+    async def close(self) -> None:
+        """Closes every pooled database connection."""
+        await self.__engine.dispose()
+
+    def evict(self, invalidation: Invalidation) -> None:
+        """Removes the data written by another process, or by this one, from the caches."""
+        if invalidation.scope == CacheScope.guild_configuration and invalidation.guild_id is not None:
+            self.__guild_configurations.invalidate(invalidation.guild_id)
+        elif invalidation.scope == CacheScope.level_rewards and invalidation.guild_id is not None:
+            self.__level_rewards.invalidate(invalidation.guild_id)
+        elif invalidation.scope == CacheScope.translations and invalidation.key is not None:
+            self.__translations.invalidate(invalidation.key)
 
-    async def post(self, route: Route, data: dict[Any, Any]) -> APIResponse:
+    async def get(self, route: Route, *, timeout: float = DEFAULT_TIMEOUT, cache_ttl: float | None = None) -> APIResponse:
+        """Sends a GET request to the TheoTown API.
+
+        If cache_ttl is specified, successful responses are cached for that many seconds."""
+        return await self.__http.request("GET", route, timeout=timeout, cache_ttl=cache_ttl)
+
+    async def post(self, route: Route, data: dict[Any, Any], *, timeout: float = DEFAULT_TIMEOUT) -> APIResponse:
         """Sends a POST request to the TheoTown API."""
-        return await self.__http.request("POST", route, data=data)
+        return await self.__http.request("POST", route, data=data, timeout=timeout)
 
-    async def legacy_get(self, route: Route) -> dict[Any, Any]:
+    async def legacy_get(self, route: Route, *, timeout: float = DEFAULT_TIMEOUT, cache_ttl: float | None = None) -> dict[Any, Any]:
         """Deprecated. Sends a GET request to the TheoTown API."""
-        return await self.__http.legacy_request("GET", route)
+        return await self.__http.legacy_request("GET", route, timeout=timeout, cache_ttl=cache_ttl)
 
-    async def legacy_post(self, route: Route, data: dict[Any, Any]) -> dict[Any, Any]:
+    async def legacy_post(self, route: Route, data: dict[Any, Any], *, timeout: float = DEFAULT_TIMEOUT) -> dict[Any, Any]:
         """Deprecated. Sends a POST request to the TheoTown API."""
-        return await self.__http.legacy_request("POST", route, None, data)
+        return await self.__http.legacy_request("POST", route, None, data, timeout=timeout)
 
     """Tag related"""
 
@@ -78,7 +140,9 @@ class API:
                     authors=authors
                 )
                 session.add(entry)
+                version = await _get_write_version(session)
             await session.commit()
+        await self.invalidations.invalidate(CacheScope.tags, guild_id, version)
         return entry.id 
 
     async def fetch_tag(self, id: int) -> Tag | None:
@@ -130,7 +194,7 @@ class API:
         """Updates a tag entry by specified row ID."""
         async with self.session() as session: 
             async with session.begin():
-                _ = await session.execute(
+                result = await session.execute(
                     update(TagTable).
                     filter(TagTable.id == row_id).
                     values(
@@ -138,16 +202,25 @@ class API:
                         authors=authors,
                         aliases=aliases,
                         locked=locked
-                    )
+                    ).
+                    returning(TagTable.guild_id)
                 )
+                guild_id = result.scalar()
+                version = await _get_write_version(session)
             await session.commit()
+        if guild_id is not None:
+            await self.invalidations.invalidate(CacheScope.tags, guild_id, version)
 
     async def delete_tag(self, row_id: int) -> None:
         """Removes a tag by specified row ID."""
         async with self.session() as session: 
             async with session.begin():
-                _ = await session.execute(delete(TagTable).filter(TagTable.id == row_id))
+                result = await session.execute(delete(TagTable).filter(TagTable.id == row_id).returning(TagTable.guild_id))
+                guild_id = result.scalar()
+                version = await _get_write_version(session)
             await session.commit()
+        if guild_id is not None:
+            await self.invalidations.invalidate(CacheScope.tags, guild_id, version)
 
     """Guild configuration related"""
 
@@ -167,7 +240,9 @@ class API:
                     log_channel=log_channel
                 )
                 session.add(entry)
+                version = await _get_write_version(session)
             await session.commit()
+        await self.invalidations.invalidate(CacheScope.guild_configuration, guild_id, version)
         config = await self.__fetch_guild_configuration_by_id(entry.id) 
         assert config is not None
         return config
@@ -184,14 +259,21 @@ class API:
             return GuildConfiguration.from_table(self, r)
         return None
 
-    async def fetch_guild_configuration(self, guild_id: int) -> GuildConfiguration | None:
-        """Fetches and returns a deserialized guild configuration if available for the specified guild."""
+    async def __fetch_guild_configuration_row(self, guild_id: int) -> GuildConfigurationTable | None:
         async with self.session() as session: 
             result = await session.execute(
                 select(GuildConfigurationTable).
                 filter(GuildConfigurationTable.guild_id == guild_id)
             )
-        r = result.scalar()
+        return result.scalar()
+
+    async def fetch_guild_configuration(self, guild_id: int) -> GuildConfiguration | None:
+        """Fetches and returns a deserialized guild configuration if available for the specified guild.
+
+        The configuration is cached until it is written."""
+        r = await self.__guild_configurations.get_or_fetch(
+            guild_id, lambda: self.__fetch_guild_configuration_row(guild_id)
+        )
         if r:
             return GuildConfiguration.from_table(self, r)
         return None
@@ -229,7 +311,7 @@ class API:
         """Updates a guild configuration entry by specified row ID."""
         async with self.session() as session: 
             async with session.begin():
-                _ = await session.execute(
+                result = await session.execute(
                     update(GuildConfigurationTable).
                     filter(GuildConfigurationTable.id == row_id).
                     values(
@@ -250,23 +332,36 @@ class API:
                         suggestion_system_active=suggestion_system_active,
                         suggestion_channel=suggestion_channel,
                         suggestion_threads_enabled=suggestion_threads_enabled
-                    )
+                    ).
+                    returning(GuildConfigurationTable.guild_id)
                 )
+                guild_id = result.scalar()
+                version = await _get_write_version(session)
             await session.commit()
+        if guild_id is not None:
+            await self.invalidations.invalidate(CacheScope.guild_configuration, guild_id, version)
 
     async def delete_guild_configuration(self, row_id: int) -> None:
         """Removes a guild configuration entry by specified row ID."""
         async with self.session() as session: 
             async with session.begin():
-                _ = await session.execute(delete(GuildConfigurationTable).filter(GuildConfigurationTable.id == row_id))
+                result = await session.execute(
+                    delete(GuildConfigurationTable).
+                    filter(GuildConfigurationTable.id == row_id).
+                    returning(GuildConfigurationTable.guild_id)
+                )
+                guild_id = result.scalar()
+                version = await _get_write_version(session)
             await session.commit()
+        if guild_id is not None:
+            await self.invalidations.invalidate(CacheScope.guild_configuration, guild_id, version)
 
     """Expiring thread related"""
 
-    async def insert_expiring_thread(self, thread_id: int, expiration_date: datetime.datetime) -> None:
+    async def insert_expiring_thread(self, thread_id: int, guild_id: int, expiration_date: datetime.datetime) -> None:
         async with self.session() as session: 
             async with session.begin():
-                session.add(ExpiringThread(thread_id=thread_id, expiration_date=expiration_date))
+                session.add(ExpiringThread(thread_id=thread_id, guild_id=guild_id, expiration_date=expiration_date))
             await session.commit()
 
     async def fetch_expired_threads(self, expiration_date: datetime.datetime) -> list[ExpiringThread]:
@@ -333,6 +428,10 @@ class API:
 
         case = await self.__fetch_case_by_internal_id(entry.id) 
         assert case is not None
+        self.client.log_event(
+            EventType.punishment_issue, EventName.punishment_issue, guild_id, case.case_id, moderator_id,
+            extra={"type": type, "user_id": user_id, "reason": reason, "expire_date": expire_date}
+        )
         return case
 
     async def __fetch_case_by_internal_id(self, id: int) -> Case | None:
@@ -447,7 +546,7 @@ class API:
         """Expires a case entry by making it expired using the specified type, user ID and guild ID."""
         async with self.session() as session: 
             async with session.begin():
-                _ = await session.execute(
+                result = await session.execute(
                     update(PunishmentTable).
                     filter(PunishmentTable.type == type.value, PunishmentTable.guild_id == guild_id, PunishmentTable.user_id == user_id).
                     values(
@@ -457,6 +556,11 @@ class API:
                     )
                 )
             await session.commit()
+        if result.rowcount > 0:
+            self.client.log_event(
+                EventType.punishment_revoke, EventName.punishment_revoke, guild_id, user_id, None,
+                extra={"type": type.value}
+            )
 
     async def fetch_moderation_statistics(self, guild_id: int, moderator_id: int) -> dict[str, int]:
         """Fetches and returns a dictionary containing the general moderation statistics."""
@@ -561,10 +665,20 @@ class API:
                     translated_string=translated_str
                 )
                 session.add(entry)
+                version = await _get_write_version(session)
             await session.commit()
+        await self.invalidations.invalidate(CacheScope.translations, None, version, original_str)
 
     async def fetch_translations(self, original_str: str) -> list[TranslationEntryDict]:
-        """Returns a list of translations for specified string."""
+        """Returns a list of translations for specified string.
+
+        The translations are cached until a translation of the string is inserted."""
+        translations = await self.__translations.get_or_fetch(
+            original_str, lambda: self.__fetch_translations(original_str)
+        )
+        return list(translations)
+
+    async def __fetch_translations(self, original_str: str) -> list[TranslationEntryDict]:
         async with self.session() as session: 
             result = await session.execute(
                 select(Translation).
@@ -618,7 +732,9 @@ class API:
                     level=level
                 )
                 session.add(entry)
+                version = await _get_write_version(session)
             await session.commit()
+        await self.invalidations.invalidate(CacheScope.level_rewards, guild_id, version)
         self.client.dispatch(
             'pidroid_level_reward_add',
             await self.fetch_level_reward_by_id(entry.id)
@@ -629,29 +745,43 @@ class API:
         """Updates a level reward entry by specified ID."""
         async with self.session() as session: 
             async with session.begin():
-                _ = await session.execute(
+                result = await session.execute(
                     update(LevelRewards).
                     filter(LevelRewards.id == id).
                     values(
                        role_id=role_id,
                        level=level
-                    )
+                    ).
+                    returning(LevelRewards.guild_id)
                 )
+                guild_id = result.scalar()
+                version = await _get_write_version(session)
             await session.commit()
+        if guild_id is not None:
+            await self.invalidations.invalidate(CacheScope.level_rewards, guild_id, version)
 
     async def delete_level_reward(self, id: int) -> None:
         """Removes a level reward by specified row ID."""
         obj = await self.fetch_level_reward_by_id(id)
         async with self.session() as session: 
             async with session.begin():
-                _ = await session.execute(delete(LevelRewards).filter(LevelRewards.id == id))
+                result = await session.execute(delete(LevelRewards).filter(LevelRewards.id == id).returning(LevelRewards.guild_id))
+                guild_id = result.scalar()
+                version = await _get_write_version(session)
             await session.commit()
+        if guild_id is not None:
+            await self.invalidations.invalidate(CacheScope.level_rewards, guild_id, version)
         self.client.dispatch("pidroid_level_reward_remove", obj)
 
     async def fetch_all_guild_level_rewards(self, guild_id: int) -> list[LevelRewards]:
         """Returns a list of all LevelReward entries available for the specified guild.
         
-        Role IDs are sorted by their appropriate level requirement descending."""
+        Role IDs are sorted by their appropriate level requirement descending.
+        The entries are cached until a level reward of the guild is written."""
+        rewards = await self.__level_rewards.get_or_fetch(guild_id, lambda: self.__fetch_all_guild_level_rewards(guild_id))
+        return list(rewards)
+
+    async def __fetch_all_guild_level_rewards(self, guild_id: int) -> list[LevelRewards]:
         async with self.session() as session: 
             result = await session.execute(
                 select(LevelRewards).
@@ -699,16 +829,7 @@ class API:
         """Returns a list of LevelReward entries available for the specified guild and level.
         
         Entries are sorted by required level descending."""
-        async with self.session() as session: 
-            result = await session.execute(
-                select(LevelRewards).
-                filter(
-                    LevelRewards.guild_id == guild_id,
-                    LevelRewards.level <= level
-                ).
-                order_by(LevelRewards.level.desc())
-            )
-        return list(result.scalars())
+        return [reward for reward in await self.fetch_all_guild_level_rewards(guild_id) if reward.level <= level]
 
     async def fetch_eligible_level_reward_for_level(self, guild_id: int, level: int) -> LevelRewards | None:
         """Returns a LevelReward entry for the specified guild and level.
@@ -972,6 +1093,29 @@ class API:
                 _ = await session.execute(delete(Reminder).filter(Reminder.id==row))
             await session.commit()
 
+    """Shared value related"""
+
+    async def fetch_shared_value(self, key: str) -> str | None:
+        """Fetches the value which is shared by every process of the bot."""
+        async with self.session() as session:
+            result = await session.execute(
+                select(SharedValue.value).
+                filter(SharedValue.key == key)
+            )
+        return result.scalar()
+
+    async def set_shared_value(self, key: str, value: str) -> None:
+        """Sets the value which is shared by every process of the bot."""
+        async with self.session() as session:
+            async with session.begin():
+                _ = await session.execute(
+                    pg_insert(SharedValue).values(key=key, value=value).on_conflict_do_update(
+                        index_elements=[SharedValue.key],
+                        set_=dict(value=value)
+                    )
+                )
+            await session.commit()
+
     """TheoTown backend related"""
 
     async def fetch_theotown_account_by_discord_id(self, account_id: int) -> TheoTownAccount | None:
@@ -1002,20 +1146,38 @@ class API:
         res.raise_on_error()
         return [NewPluginRevision(np) for np in res.data]
 
-    async def fetch_plugin_by_id(self, plugin_id: int, show_hidden: bool = False) -> list[Plugin]:
-        """Queries the TheoTown API for a plugin of the specified ID."""
+    async def fetch_plugin_by_id(self, plugin_id: int, show_hidden: bool = False) -> list[AbstractPlugin]:
+        """Returns a plugin of the specified ID.
+
+        Plugins which are no longer in the store are removed from the local plugin catalog."""
         res = await self.get(Route(
             "/game/plugin/find",
             {"id": plugin_id, "show_hidden": 1 if show_hidden else 0}
-        ))
+        ), cache_ttl=300)
         res.raise_on_error()
+        if not res.data and not show_hidden:
+            self.plugin_catalog.remove(plugin_id)
         return [Plugin(p) for p in res.data]
 
-    async def search_plugins(self, query: str, show_hidden: bool = False) -> list[Plugin]:
-        """Queries the TheoTown API for plugins matching the query string."""
+    async def search_plugins(self, query: str, show_hidden: bool = False) -> list[AbstractPlugin]:
+        """Returns plugins matching the query string.
+
+        The plugins are ranked by the local plugin catalog, plugins it does not know keep the order
+        of the TheoTown API after them. The best catalog matches the API did not find are fetched by their ID."""
         res = await self.get(Route(
             "/game/plugin/find",
             {"query": query, "show_hidden": 1 if show_hidden else 0}
-        ))
+        ), cache_ttl=300)
         res.raise_on_error()
-        return [Plugin(p) for p in res.data]
+        plugins: list[AbstractPlugin] = [Plugin(p) for p in res.data]
+        if show_hidden or not self.plugin_catalog.is_loaded:
+            return plugins
+
+        ranked = [entry.plugin_id for entry in self.plugin_catalog.search(query)]
+        found = {plugin.plugin_id for plugin in plugins}
+        missing = [plugin_id for plugin_id in ranked[:CATALOG_FETCH_LIMIT] if plugin_id not in found]
+        for fetched in await asyncio.gather(*(self.fetch_plugin_by_id(plugin_id) for plugin_id in missing)):
+            plugins.extend(fetched)
+
+        ranking = {plugin_id: rank for rank, plugin_id in enumerate(ranked)}
+        return sorted(plugins, key=lambda plugin: ranking.get(plugin.plugin_id, len(ranking)))
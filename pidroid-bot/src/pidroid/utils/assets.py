@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from pidroid.constants import DATA_FILE_PATH
+from pidroid.utils import http
+from pidroid.utils.cache import SingleFlight
+
+if TYPE_CHECKING:
+    from pidroid.client import Pidroid
+
+ASSET_CACHE_PATH = os.path.join(DATA_FILE_PATH, "asset_cache")
+
+# Default bounds of the memory and the disk tiers in bytes
+DEFAULT_MAX_MEMORY_SIZE = 32 * 1024 * 1024
+DEFAULT_MAX_DISK_SIZE = 256 * 1024 * 1024
+
+logger = logging.getLogger("pidroid.utils.assets")
+
+def get_asset_key(url: str) -> str:
+    """Returns the content address of the Discord CDN asset URL.
+
+    Discord CDN URLs contain the asset ID or hash and the requested size,
+    therefore the content behind the same URL never changes."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
+class AssetCache:
+    """This class implements a content-addressed cache of downloaded asset bytes.
+
+    Assets are kept in a size bounded memory tier and, optionally, in a size bounded
+    directory on disk. Both tiers evict the least recently used assets first.
+    Concurrent downloads of the same asset are deduplicated."""
+
+    def __init__(
+        self,
+        *,
+        max_memory_size: int = DEFAULT_MAX_MEMORY_SIZE,
+        path: str | None = ASSET_CACHE_PATH,
+        max_disk_size: int = DEFAULT_MAX_DISK_SIZE
+    ) -> None:
+        super().__init__()
+        self.max_memory_size = max_memory_size
+        self.max_disk_size = max_disk_size
+        self.__path = path
+        self.__memory: OrderedDict[str, bytes] = OrderedDict()
+        self.__memory_size = 0
+        # Index of the disk tier as file name to size, in least recently used order
+        self.__disk: OrderedDict[str, int] | None = None
+        self.__disk_size = 0
+        self.__flight: SingleFlight[str] = SingleFlight()
+
+    @property
+    def memory_size(self) -> int:
+        """Returns the total size of assets held in memory."""
+        return self.__memory_size
+
+    @property
+    def disk_size(self) -> int:
+        """Returns the total size of assets held on disk."""
+        return self.__disk_size
+
+    def __store_in_memory(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_memory_size:
+            return
+        old_payload = self.__memory.pop(key, None)
+        if old_payload is not None:
+            self.__memory_size -= len(old_payload)
+        self.__memory[key] = payload
+        self.__memory_size += len(payload)
+        while self.__memory_size > self.max_memory_size:
+            _, evicted = self.__memory.popitem(last=False)
+            self.__memory_size -= len(evicted)
+
+    def __load_disk_index(self) -> OrderedDict[str, int]:
+        assert self.__path is not None
+        os.makedirs(self.__path, exist_ok=True)
+        entries: list[tuple[float, str, int]] = []
+        for entry in os.scandir(self.__path):
+            # Temporary files are left behind by writes which were interrupted
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+        return OrderedDict((name, size) for _, name, size in entries)
+
+    async def __get_disk_index(self) -> OrderedDict[str, int] | None:
+        if self.__path is None:
+            return None
+        if self.__disk is None:
+            self.__disk = await asyncio.to_thread(self.__load_disk_index)
+            self.__disk_size = sum(self.__disk.values())
+        return self.__disk
+
+    def __read_file(self, key: str) -> bytes | None:
+        assert self.__path is not None
+        file_path = os.path.join(self.__path, key)
+        try:
+            with open(file_path, "rb") as f:
+                payload = f.read()
+            # Modification time orders the files by use when the index is rebuilt
+            os.utime(file_path)
+        except FileNotFoundError:
+            return None
+        return payload
+
+    def __write_file(self, key: str, payload: bytes) -> None:
+        assert self.__path is not None
+        # The file only appears under its name once it is written completely
+        temporary_path = os.path.join(self.__path, f".{key}.tmp")
+        with open(temporary_path, "wb") as f:
+            _ = f.write(payload)
+        os.replace(temporary_path, os.path.join(self.__path, key))
+
+    def __remove_files(self, names: list[str]) -> None:
+        assert self.__path is not None
+        for name in names:
+            try:
+                os.remove(os.path.join(self.__path, name))
+            except FileNotFoundError:
+                pass
+
+    async def __read_from_disk(self, key: str) -> bytes | None:
+        disk = await self.__get_disk_index()
+        if disk is None or key not in disk:
+            return None
+        disk.move_to_end(key)
+        payload = await asyncio.to_thread(self.__read_file, key)
+        if payload is None:
+            self.__disk_size -= disk.pop(key, 0)
+        return payload
+
+    async def __store_on_disk(self, key: str, payload: bytes) -> None:
+        disk = await self.__get_disk_index()
+        if disk is None or len(payload) > self.max_disk_size:
+            return
+        # The asset is indexed once its file is in place, so that it is not read while it is being written
+        try:
+            await asyncio.to_thread(self.__write_file, key, payload)
+        except OSError:
+            logger.exception("Failed to write an asset to the disk cache")
+            return
+        self.__disk_size -= disk.pop(key, 0)
+        disk[key] = len(payload)
+        self.__disk_size += len(payload)
+        evicted: list[str] = []
+        while self.__disk_size > self.max_disk_size:
+            name, size = disk.popitem(last=False)
+            self.__disk_size -= size
+            evicted.append(name)
+        if evicted:
+            try:
+                await asyncio.to_thread(self.__remove_files, evicted)
+            except OSError:
+                logger.exception("Failed to remove evicted assets from the disk cache")
+
+    async def get(self, url: str) -> bytes | None:
+        """Returns the cached bytes of the asset at the URL or None if it is not cached."""
+        key = get_asset_key(url)
+        payload = self.__memory.get(key)
+        if payload is not None:
+            self.__memory.move_to_end(key)
+            return payload
+
+        payload = await self.__read_from_disk(key)
+        if payload is not None:
+            self.__store_in_memory(key, payload)
+        return payload
+
+    async def get_or_fetch(self, url: str, fetch: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Returns the bytes of the asset at the URL, downloading them with the fetch function if they are not cached."""
+        payload = await self.get(url)
+        if payload is not None:
+            return payload
+
+        key = get_asset_key(url)
+
+        async def fetch_and_store() -> bytes:
+            payload = await fetch()
+            self.__store_in_memory(key, payload)
+            await self.__store_on_disk(key, payload)
+            return payload
+        return await self.__flight.do(key, fetch_and_store)
+
+    def clear_memory(self) -> None:
+        """Removes every asset from the memory tier."""
+        self.__memory.clear()
+        self.__memory_size = 0
+
+async def read_asset(client: Pidroid, url: str) -> bytes:
+    """Returns the bytes of the Discord CDN asset at the URL, using the asset cache of the client."""
+    async def fetch() -> bytes:
+        async with await http.get(client, url) as r:
+            r.raise_for_status()
+            return await r.read()
+    return await client.asset_cache.get_or_fetch(url, fetch)
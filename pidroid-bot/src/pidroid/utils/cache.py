@@ -0,0 +1,235 @@
+import asyncio
+import functools
+import logging
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Hashable, ParamSpec, Protocol, TypeVar, cast
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+logger = logging.getLogger("pidroid.utils.cache")
+
+class TTLCache(Generic[K, V]):
+    """This class implements a size bounded in-memory cache with per entry expiry.
+
+    When the cache is full, the least recently used entry is evicted."""
+
+    def __init__(self, max_size: int = 256) -> None:
+        super().__init__()
+        if max_size <= 0:
+            raise ValueError("Max size must be greater than 0")
+        self.__max_size = max_size
+        self.__entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    @property
+    def max_size(self) -> int:
+        """Returns the maximum amount of entries the cache can hold."""
+        return self.__max_size
+
+    def get(self, key: K) -> V | None:
+        """Returns the cached value for the specified key or None if it is missing or expired."""
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.__entries[key]
+            return None
+        self.__entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float) -> None:
+        """Stores the value under the specified key for ttl seconds."""
+        self.__entries[key] = (time.monotonic() + ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            _ = self.__entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """Removes the specified key from the cache and returns its value, if any."""
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return None
+        return entry[1]
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        self.__entries.clear()
+
+class SingleFlight(Generic[K]):
+    """This class deduplicates concurrent calls for the same key.
+
+    While a call for a key is in progress, every other caller for the same key
+    awaits the result of that call instead of starting a new one. The call runs in
+    its own task, so that cancelling one of the callers does not cancel it for the others."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__calls: dict[K, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__calls)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.__calls
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """Runs the function for the specified key or joins the call that is already in progress."""
+        task = self.__calls.get(key)
+        if task is None:
+            async def call() -> V:
+                return await func()
+            task = asyncio.create_task(call())
+            self.__calls[key] = task
+            task.add_done_callback(functools.partial(self.__finish, key))
+        return await asyncio.shield(task)
+
+    def __finish(self, key: K, task: asyncio.Task[Any]) -> None:
+        if self.__calls.get(key) is task:
+            del self.__calls[key]
+        # Prevent 'exception was never retrieved' warnings when every caller was cancelled
+        if not task.cancelled():
+            _ = task.exception()
+
+@dataclass
+class CacheStatistics:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+
+    @property
+    def requests(self) -> int:
+        """Returns the total amount of cache lookups."""
+        return self.hits + self.stale_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the ratio of lookups served from the cache, including stale values."""
+        if self.requests == 0:
+            return 0.0
+        return (self.hits + self.stale_hits) / self.requests
+
+# Holds every named cache so that their statistics could be inspected
+_CACHES: dict[str, "AsyncCache[Any, Any]"] = {}
+
+def get_caches() -> dict[str, "AsyncCache[Any, Any]"]:
+    """Returns every named cache that was created."""
+    return _CACHES.copy()
+
+class AsyncCache(Generic[K, V]):
+    """This class implements a cache for asynchronously fetched values.
+
+    Values are fresh for ttl seconds. Afterwards, for stale_ttl more seconds, the stale value is returned
+    immediately while it is refreshed in the background. Concurrent fetches for the same key are deduplicated.
+    None values are not cached, neither are values fetched while the cache was invalidated, as they might be stale."""
+
+    def __init__(self, name: str, *, ttl: float, stale_ttl: float = 0, max_size: int = 256) -> None:
+        super().__init__()
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.statistics = CacheStatistics()
+        self.__entries: TTLCache[K, tuple[float, V]] = TTLCache(max_size)
+        # Fetches are keyed by the generation as well, so that callers after an invalidation do not join older fetches
+        self.__flight: SingleFlight[tuple[K, int]] = SingleFlight()
+        self.__refresh_tasks: set[asyncio.Task[Any]] = set()
+        # Incremented on every invalidation, so that fetches which were started before it are not stored
+        self.__generation = 0
+        _CACHES[name] = self
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def max_size(self) -> int:
+        """Returns the maximum amount of entries the cache can hold."""
+        return self.__entries.max_size
+
+    async def __fetch(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        async def fetch_and_store() -> V:
+            generation = self.__generation
+            value = await fetch()
+            if value is not None and generation == self.__generation:
+                self.__entries.set(key, (time.monotonic(), value), self.ttl + self.stale_ttl)
+            return value
+        return await self.__flight.do((key, self.__generation), fetch_and_store)
+
+    async def __refresh(self, key: K, fetch: Callable[[], Awaitable[V]]) -> None:
+        try:
+            _ = await self.__fetch(key, fetch)
+        except Exception:
+            logger.exception(f"Failed to refresh a stale value in {self.name} cache")
+
+    async def get_or_fetch(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        """Returns the cached value for the key, fetching it if required."""
+        entry = self.__entries.get(key)
+        if entry is not None:
+            fetched_at, value = entry
+            if time.monotonic() - fetched_at < self.ttl:
+                self.statistics.hits += 1
+                return value
+
+            self.statistics.stale_hits += 1
+            # Only schedule a refresh if one is not already in progress
+            if (key, self.__generation) not in self.__flight:
+                task = asyncio.create_task(self.__refresh(key, fetch))
+                self.__refresh_tasks.add(task)
+                task.add_done_callback(self.__refresh_tasks.discard)
+            return value
+
+        self.statistics.misses += 1
+        return await self.__fetch(key, fetch)
+
+    def invalidate(self, key: K) -> None:
+        """Removes the cached value for the specified key."""
+        self.__generation += 1
+        _ = self.__entries.pop(key)
+
+    def clear(self) -> None:
+        """Removes every cached value."""
+        self.__generation += 1
+        self.__entries.clear()
+
+P = ParamSpec("P")
+
+class CachedFunction(Protocol[P, V]):
+    cache: AsyncCache[Any, V]
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> Awaitable[V]: ...
+
+def cached(
+    name: str,
+    *,
+    ttl: float,
+    stale_ttl: float = 0,
+    max_size: int = 256,
+    key: Callable[..., Hashable] | None = None
+) -> Callable[[Callable[P, Awaitable[V]]], CachedFunction[P, V]]:
+    """Caches the results of the decorated coroutine function in a named AsyncCache.
+
+    By default, every argument forms the cache key, which can be overridden by the key function
+    that accepts the same arguments as the decorated function."""
+
+    def decorator(func: Callable[P, Awaitable[V]]) -> CachedFunction[P, V]:
+        cache: AsyncCache[Hashable, V] = AsyncCache(name, ttl=ttl, stale_ttl=stale_ttl, max_size=max_size)
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> V:
+            if key is None:
+                cache_key = (args, tuple(sorted(kwargs.items())))
+            else:
+                cache_key = key(*args, **kwargs)
+            return await cache.get_or_fetch(cache_key, lambda: func(*args, **kwargs))
+
+        setattr(wrapper, "cache", cache)
+        return cast(CachedFunction[P, V], wrapper)
+    return decorator
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+def get_shard_id(guild_id: int, shard_count: int) -> int:
+    """Returns the ID of the shard which receives the events of the guild."""
+    return (guild_id >> 22) % shard_count
+
+def split_shards(shard_count: int, cluster_count: int) -> list[list[int]]:
+    """Returns contiguous shard ID ranges, one for every cluster.
+
+    The ranges differ in length by at most one shard."""
+    if cluster_count < 1:
+        raise ValueError("There must be at least one cluster")
+    if shard_count < cluster_count:
+        raise ValueError("There must be at least as many shards as there are clusters")
+    size, remainder = divmod(shard_count, cluster_count)
+    ranges: list[list[int]] = []
+    start = 0
+    for cluster_id in range(cluster_count):
+        end = start + size + (1 if cluster_id < remainder else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+def parse_shard_ids(value: str | None) -> list[int] | None:
+    """Returns the shard IDs from a comma separated list, or None if the value is empty."""
+    if not value:
+        return None
+    return [int(shard_id.strip()) for shard_id in value.split(",") if shard_id.strip()]
+
+@dataclass(frozen=True)
+class ClusterInfo:
+    """This class describes the part of the bot which is run by the current process.
+
+    Every cluster connects a range of shards and owns the guilds which belong to them.
+    A process without a shard range connects every shard and owns every guild."""
+
+    cluster_id: int = 0
+    cluster_count: int = 1
+    shard_ids: tuple[int, ...] | None = None
+    shard_count: int | None = None
+
+    @property
+    def is_primary(self) -> bool:
+        """Returns true if this cluster runs the work which does not belong to any guild."""
+        return self.cluster_id == 0
+
+    def owns_guild(self, guild_id: int | None) -> bool:
+        """Returns true if the periodic work of the guild is run by this cluster.
+
+        Work which does not belong to a guild is run by the primary cluster."""
+        if guild_id is None:
+            return self.is_primary
+        if self.shard_ids is None or self.shard_count is None:
+            return True
+        return get_shard_id(guild_id, self.shard_count) in self.shard_ids
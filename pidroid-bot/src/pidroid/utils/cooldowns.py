@@ -1,10 +1,16 @@
-import dill
 import logging
 import os
 
 from discord.ext import commands
+from typing import TYPE_CHECKING
 
 from pidroid.constants import COOLDOWN_FILE_PATH
+from pidroid.utils.lazy import LazyModule
+
+if TYPE_CHECKING:
+    import dill
+else:
+    dill = LazyModule("dill")
 
 logger = logging.getLogger("pidroid.utils.cooldowns")
 
@@ -1,27 +1,176 @@
 import asyncio
-import aiodbm
+import dbm
+import logging
 import os
+import sqlite3
 
-from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, Callable, TypeVar
 
 from pidroid.constants import DATA_FILE_PATH
 
-PERSISTENT_DATA_FILE = os.path.join(DATA_FILE_PATH, "data.dbm")
-
-_DATA_STORE_LOCK = asyncio.Lock()
-
-@asynccontextmanager
-async def PersistentDataStore():
-    """
-    Asynchronously opens the persistent data store, protected by a lock.
-    """
-    await _DATA_STORE_LOCK.acquire()
-    
-    store = None
-    try:
-        store = await aiodbm.open(PERSISTENT_DATA_FILE, "c") # pyright: ignore[reportUnknownMemberType]
-        yield store
-    finally:
-        if store is not None:
-            await store.close()
-        _DATA_STORE_LOCK.release()
+PERSISTENT_DATA_FILE = os.path.join(DATA_FILE_PATH, "data.sqlite3")
+# The dbm file which was used by the persistent data store before
+LEGACY_PERSISTENT_DATA_FILE = os.path.join(DATA_FILE_PATH, "data.dbm")
+
+logger = logging.getLogger("pidroid.utils.data")
+
+T = TypeVar("T")
+
+class PersistentDataStore:
+    """This class implements a persistent key-value store which is resident in memory.
+
+    Every value is loaded into memory on startup, therefore reads do not require any locking or IO.
+    Writes are applied to memory immediately and are written to a SQLite database in WAL mode
+    in batches by a periodic or an explicit flush, outside of the event loop."""
+
+    def __init__(
+        self,
+        path: str = PERSISTENT_DATA_FILE,
+        *,
+        legacy_path: str | None = LEGACY_PERSISTENT_DATA_FILE,
+        flush_interval: float = 5.0
+    ) -> None:
+        super().__init__()
+        self.__path = path
+        self.__legacy_path = legacy_path
+        self.__flush_interval = flush_interval
+        self.__values: dict[str, str] = {}
+        # Pending writes, None marks a deletion
+        self.__pending: dict[str, str | None] = {}
+        self.__loaded = False
+        # SQLite connections are bound to a thread, all database work happens in this one
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pidroid-data-store")
+        self.__connection: sqlite3.Connection | None = None
+        self.__flush_lock = asyncio.Lock()
+        self.__flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Returns true if the data store was loaded."""
+        return self.__loaded
+
+    @property
+    def pending_writes(self) -> int:
+        """Returns the amount of writes which were not flushed yet."""
+        return len(self.__pending)
+
+    async def __run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, func, *args)
+
+    def __open(self) -> dict[str, str]:
+        connection = sqlite3.connect(self.__path, check_same_thread=False)
+        _ = connection.execute("PRAGMA journal_mode=WAL")
+        _ = connection.execute("PRAGMA synchronous=NORMAL")
+        _ = connection.execute("CREATE TABLE IF NOT EXISTS data_store (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        connection.commit()
+        self.__connection = connection
+
+        values = dict(connection.execute("SELECT key, value FROM data_store").fetchall())
+        if not values:
+            values = self.__migrate_legacy_store()
+        return values
+
+    def __migrate_legacy_store(self) -> dict[str, str]:
+        """Copies every value from the legacy dbm data store, if it exists."""
+        if self.__legacy_path is None or not dbm.whichdb(self.__legacy_path):
+            return {}
+
+        values: dict[str, str] = {}
+        with dbm.open(self.__legacy_path, "r") as legacy_store:
+            for key in legacy_store.keys():
+                values[key.decode()] = legacy_store[key].decode()
+
+        assert self.__connection is not None
+        with self.__connection:
+            _ = self.__connection.executemany(
+                "INSERT OR REPLACE INTO data_store (key, value) VALUES (?, ?)",
+                values.items()
+            )
+        logger.info(f"Migrated {len(values)} values from the legacy data store")
+        return values
+
+    def __write(self, pending: dict[str, str | None]) -> None:
+        assert self.__connection is not None
+        with self.__connection:
+            _ = self.__connection.executemany(
+                "INSERT OR REPLACE INTO data_store (key, value) VALUES (?, ?)",
+                [(k, v) for k, v in pending.items() if v is not None]
+            )
+            _ = self.__connection.executemany(
+                "DELETE FROM data_store WHERE key = ?",
+                [(k,) for k, v in pending.items() if v is None]
+            )
+
+    def __close(self) -> None:
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    async def load(self) -> None:
+        """Loads every value of the data store into memory and starts the periodic flush."""
+        if self.__loaded:
+            return
+        self.__values = await self.__run(self.__open)
+        self.__loaded = True
+        self.__flush_task = asyncio.create_task(self.__flush_periodically())
+        logger.debug(f"Loaded {len(self.__values)} values from the persistent data store")
+
+    async def __flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.__flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush the persistent data store")
+
+    async def flush(self) -> None:
+        """Writes every pending change to the database."""
+        async with self.__flush_lock:
+            if not self.__pending:
+                return
+            pending = self.__pending
+            self.__pending = {}
+            try:
+                await self.__run(self.__write, pending)
+            except BaseException:
+                # Keep the failed writes, unless they were superseded in the meantime
+                for key, value in pending.items():
+                    _ = self.__pending.setdefault(key, value)
+                raise
+
+    async def close(self) -> None:
+        """Flushes pending changes and closes the data store."""
+        if self.__flush_task is not None:
+            _ = self.__flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__flush_task
+            self.__flush_task = None
+        if self.__loaded:
+            await self.flush()
+            await self.__run(self.__close)
+            self.__loaded = False
+        self.__executor.shutdown(wait=False)
+
+    def get(self, key: str) -> str | None:
+        """Returns the value stored under the specified key."""
+        return self.__values.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        """Stores the value under the specified key.
+
+        The value is persisted on the next flush."""
+        self.__values[key] = value
+        self.__pending[key] = value
+
+    def delete(self, key: str) -> None:
+        """Removes the value stored under the specified key.
+
+        The removal is persisted on the next flush."""
+        if self.__values.pop(key, None) is not None:
+            self.__pending[key] = None
+
+    def keys(self) -> list[str]:
+        """Returns a list of every key in the data store."""
+        return list(self.__values)
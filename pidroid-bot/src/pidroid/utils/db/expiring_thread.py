@@ -10,4 +10,6 @@ class ExpiringThread(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     thread_id: Mapped[int] = mapped_column(BigInteger)
+    # Threads created before clustering have no guild and are archived by the primary cluster
+    guild_id: Mapped[int | None] = mapped_column(BigInteger)
     expiration_date: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
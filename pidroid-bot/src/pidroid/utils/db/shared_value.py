@@ -0,0 +1,10 @@
+from sqlalchemy import Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from pidroid.utils.db.base import Base
+
+class SharedValue(Base):
+    __tablename__ = "SharedValues"
+
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    value: Mapped[str] = mapped_column(Text)
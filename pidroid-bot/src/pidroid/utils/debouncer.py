@@ -1,7 +1,8 @@
 import asyncio
 import logging
 
-from discord import Object
+from contextlib import suppress
+from discord import HTTPException, Object
 from enum import Enum
 from typing import TypedDict, Any
 
@@ -28,6 +29,11 @@ class RoleChangeDebouncer:
         self.__delay_seconds = delay_seconds
         self.__pending_updates: dict[GuildUserIdTuple, PendingUpdate] = {}
 
+    @property
+    def pending_operations(self) -> int:
+        """Returns the amount of role operations waiting to be applied."""
+        return sum(len(update['operations']) for update in self.__pending_updates.values())
+
     async def __process_role_change(self, guild_id: int, user_id: int, operations_to_apply: list[PendingRoleChange]):
         """
         This is the actual function that performs the role changes.
@@ -40,6 +46,10 @@ class RoleChangeDebouncer:
             return
         
         member = guild.get_member(user_id)
+        # Members of guilds which are not chunked might not be cached
+        if member is None:
+            with suppress(HTTPException):
+                member = await guild.fetch_member(user_id)
         if member is None:
             logger.warning(f"Member {user_id} not found in guild {guild_id}. Skipping role update.")
             return
@@ -1,7 +1,26 @@
+import asyncio
+import logging
 import os
 
+from dataclasses import dataclass
+from discord import File
+from io import BytesIO
+from collections.abc import Iterable
+from typing import Any
+
 from pidroid.constants import RESOURCE_FILE_PATH
 
+# Default amount of resource bytes which can be held in memory
+DEFAULT_ASSET_BUDGET = 16 * 1024 * 1024
+
+# Resources which are sent as attachments, the rest are only read by the code which uses them
+ATTACHMENT_RESOURCES = (
+    "bus.png", "delete_this.png", "evan.png", "ja ping.png", "sloth.gif", "you_were_banned.mp4",
+    "pingu.png", "pingumusic.gif", "pingunoot.gif", "pinguread.gif", "pingutroll.gif"
+)
+
+logger = logging.getLogger("pidroid.utils.file")
+
 class Resource(str): # All this for type hints
 
     def __new__(cls, *paths: str):
@@ -10,3 +29,147 @@ class Resource(str): # All this for type hints
 def get_resource(*paths: str) -> str:
     """Returns absolute path to a Pidroid resource file."""
     return os.path.join(RESOURCE_FILE_PATH, *paths)
+
+@dataclass
+class AssetUsage:
+    name: str
+    size: int
+    resident: bool
+    memory_sends: int = 0
+    disk_sends: int = 0
+
+    @property
+    def sends(self) -> int:
+        """Returns the total amount of times the asset was sent."""
+        return self.memory_sends + self.disk_sends
+
+class AssetStore:
+    """This class implements a memory-resident store of Pidroid resource files.
+
+    Resources are kept in memory within a size budget, so that sending them does not touch the filesystem.
+    When the budget is exceeded, the least sent resources are evicted and served from disk instead.
+
+    A resource which is sent from disk is loaded into memory in the background,
+    so that the event loop never waits for the filesystem."""
+
+    def __init__(self, path: str = RESOURCE_FILE_PATH, *, max_size: int = DEFAULT_ASSET_BUDGET) -> None:
+        super().__init__()
+        self.path = path
+        self.max_size = max_size
+        self.__assets: dict[str, bytes] = {}
+        self.__size = 0
+        self.__usage: dict[str, AssetUsage] = {}
+        self.__loads: dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def size(self) -> int:
+        """Returns the total size of resources held in memory."""
+        return self.__size
+
+    def __get_usage(self, name: str) -> AssetUsage:
+        usage = self.__usage.get(name)
+        if usage is None:
+            # Size of a resource which was not seen by the preload is learned once it is loaded
+            usage = AssetUsage(name, 0, False)
+            self.__usage[name] = usage
+        return usage
+
+    def __make_room(self, usage: AssetUsage) -> bool:
+        """Evicts resources which were sent less than the specified one until it fits within the budget."""
+        if usage.size > self.max_size:
+            return False
+        candidates = sorted(
+            (u for u in self.__usage.values() if u.resident and u.sends < usage.sends),
+            key=lambda u: u.sends
+        )
+        while self.__size + usage.size > self.max_size:
+            if not candidates:
+                return False
+            evicted = candidates.pop(0)
+            del self.__assets[evicted.name]
+            self.__size -= evicted.size
+            evicted.resident = False
+        return True
+
+    def __read(self, name: str) -> bytes:
+        with open(os.path.join(self.path, name), "rb") as f:
+            return f.read()
+
+    def __store(self, usage: AssetUsage, data: bytes) -> None:
+        self.__assets[usage.name] = data
+        self.__size += len(data)
+        usage.size = len(data)
+        usage.resident = True
+
+    async def __load(self, usage: AssetUsage) -> None:
+        try:
+            data = await asyncio.to_thread(self.__read, usage.name)
+        except OSError:
+            logger.exception(f"Failed to load resource {usage.name}")
+            return
+        finally:
+            del self.__loads[usage.name]
+        usage.size = len(data)
+        # Another resource might have taken the room while this one was being read
+        if not usage.resident and self.__make_room(usage):
+            self.__store(usage, data)
+
+    def __schedule_load(self, usage: AssetUsage) -> None:
+        if usage.name in self.__loads or usage.size > self.max_size:
+            return
+        try:
+            self.__loads[usage.name] = asyncio.get_running_loop().create_task(self.__load(usage))
+        except RuntimeError:
+            # There is no event loop to load the resource in
+            pass
+
+    def preload(self, names: Iterable[str] | None = None) -> None:
+        """Records the size of every resource and loads the specified ones, or every one,
+        into memory, smallest first, until the budget is exhausted.
+
+        This is blocking and should be run in an executor."""
+        for root, _, files in os.walk(self.path):
+            for file in files:
+                path = os.path.join(root, file)
+                self.__get_usage(os.path.relpath(path, self.path)).size = os.path.getsize(path)
+
+        candidates = self.__usage.values() if names is None else [self.__get_usage(name) for name in names]
+        for usage in sorted(candidates, key=lambda u: u.size):
+            if usage.resident:
+                continue
+            if self.__size + usage.size > self.max_size:
+                break
+            self.__store(usage, self.__read(usage.name))
+        logger.debug(f"Preloaded {len(self.__assets)} resources using {self.__size} bytes")
+
+    def get(self, name: str) -> bytes | None:
+        """Returns the contents of the resource if it is held in memory."""
+        return self.__assets.get(name)
+
+    def file(self, name: str, **kwargs: Any) -> File:
+        """Returns a discord.File of the resource.
+
+        Resources held in memory are sent without copying or reading them from disk.
+        Other resources are sent from disk and loaded into memory in the background, if they fit."""
+        usage = self.__get_usage(name)
+        data = self.__assets.get(name)
+
+        filename = kwargs.pop("filename", os.path.basename(name))
+        if data is None:
+            usage.disk_sends += 1
+            self.__schedule_load(usage)
+            return File(os.path.join(self.path, name), filename=filename, **kwargs)
+
+        usage.memory_sends += 1
+        # BytesIO shares the buffer of the bytes object until it is written to
+        return File(BytesIO(data), filename=filename, **kwargs)
+
+    def usage(self) -> list[AssetUsage]:
+        """Returns usage of every resource that was loaded or sent."""
+        return sorted((u for u in self.__usage.values() if u.resident or u.sends), key=lambda u: u.sends, reverse=True)
+
+asset_store = AssetStore()
+
+def resource_file(name: str, **kwargs: Any) -> File:
+    """Returns a discord.File of the Pidroid resource file from the asset store."""
+    return asset_store.file(name, **kwargs)
@@ -0,0 +1,206 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import re
+import time
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, IO
+
+logger = logging.getLogger("pidroid.utils.gateway")
+
+# Gateway events which describe the guild state required to replay the other events
+STATE_EVENTS = frozenset({"READY", "GUILD_CREATE"})
+
+# Gateway events which are recorded, besides the state events
+RECORDED_EVENTS = frozenset({
+    "MESSAGE_CREATE",
+    "MESSAGE_UPDATE",
+    "MESSAGE_DELETE",
+    "MESSAGE_REACTION_ADD",
+    "MESSAGE_REACTION_REMOVE",
+    "GUILD_MEMBER_ADD",
+    "GUILD_MEMBER_UPDATE",
+    "GUILD_MEMBER_REMOVE",
+    "GUILD_AUDIT_LOG_ENTRY_CREATE",
+})
+
+# Fields which hold user written text, names or links, their values are replaced by hashes of the same length
+PRIVATE_FIELDS = frozenset({
+    "reason", "nick", "username", "global_name", "description", "title", "value", "text",
+    # Audit log changes
+    "old_value", "new_value",
+    # Attachments
+    "filename", "url", "proxy_url"
+})
+
+# Fields of embed fields and embed authors which are hashed, names elsewhere are kept as they name channels, roles and emojis
+PRIVATE_EMBED_FIELD_FIELDS = frozenset({"name", "value"})
+
+# Returns the command prefixes used in the guild, or outside of guilds if the guild ID is None
+PrefixGetter = Callable[[int | None], Iterable[str]]
+
+# Fields of the state events which are dropped, as they are large and not required to replay
+DROPPED_STATE_FIELDS = ("members", "presences", "voice_states", "guilds", "private_channels", "relationships")
+
+def hash_text(text: str) -> str:
+    """Returns a hash of the text which has the same length as the text."""
+    if not text:
+        return text
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (digest * (len(text) // len(digest) + 1))[:len(text)]
+
+def anonymize_content(content: str, prefixes: Iterable[str] = ()) -> str:
+    """Returns the message content with every word hashed, except for the command prefix and name.
+
+    Whitespace is kept, so that commands are still invoked with the same amount of arguments
+    when the content is replayed. Names of subcommands are hashed like the other arguments."""
+    keep = 0
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        if prefix and content.startswith(prefix):
+            command = re.match(r"\s*\S+", content[len(prefix):])
+            keep = len(prefix) + (command.end() if command else 0)
+            break
+    return content[:keep] + re.sub(r"\S+", lambda word: hash_text(word.group()), content[keep:])
+
+def anonymize_payload(data: Any, prefixes: Iterable[str] = ()) -> Any:
+    """Returns a copy of the gateway payload with every private field hashed.
+
+    Command prefixes and names at the start of message contents are kept, see anonymize_content."""
+    if isinstance(data, dict):
+        anonymized: dict[str, Any] = {}
+        for key, value in data.items(): # pyright: ignore[reportUnknownVariableType]
+            if key == "content" and isinstance(value, str):
+                anonymized[key] = anonymize_content(value, prefixes)
+            elif key in PRIVATE_FIELDS and isinstance(value, str):
+                anonymized[key] = hash_text(value)
+            elif key == "fields" and isinstance(value, list):
+                anonymized[key] = [_anonymize_embed_field(field) for field in value] # pyright: ignore[reportUnknownVariableType]
+            elif key == "author" and isinstance(value, dict) and "name" in value:
+                # Message authors are users, which have no name, therefore this is an embed author
+                anonymized[key] = _anonymize_embed_field(value)
+            else:
+                anonymized[key] = anonymize_payload(value, prefixes)
+        return anonymized
+    if isinstance(data, list):
+        return [anonymize_payload(value, prefixes) for value in data] # pyright: ignore[reportUnknownVariableType]
+    return data
+
+def _anonymize_embed_field(field: Any) -> Any:
+    if not isinstance(field, dict):
+        return anonymize_payload(field)
+    return {
+        key: hash_text(value) if key in PRIVATE_EMBED_FIELD_FIELDS | PRIVATE_FIELDS and isinstance(value, str) else anonymize_payload(value)
+        for key, value in field.items() # pyright: ignore[reportUnknownVariableType]
+    }
+
+@dataclass
+class RecordedEvent:
+    # Seconds since the recording started
+    offset: float
+    type: str
+    data: Any
+
+def read_recording(path: str) -> Iterator[RecordedEvent]:
+    """Yields the events of a gateway recording in the order they were received."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            yield RecordedEvent(entry["at"], entry["t"], entry["d"])
+
+class GatewayRecorder:
+    """This class implements a recorder of gateway events.
+
+    Selected events are anonymized and written to a gzip compressed JSON lines file.
+    Lines are buffered in memory and written from a thread, so that the event loop does not block on disk.
+
+    Message contents keep the command prefix and name when the prefixes are known, so that
+    replayed messages still invoke commands. Without them, commands are not invoked on replay."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        events: frozenset[str] = RECORDED_EVENTS,
+        get_prefixes: PrefixGetter | None = None,
+        flush_interval: float = 1.0
+    ) -> None:
+        super().__init__()
+        self.path = path
+        self.events = events
+        self.get_prefixes = get_prefixes
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self.__started_at = time.monotonic()
+        self.__buffer: list[str] = []
+        self.__file: IO[str] | None = None
+        self.__task: asyncio.Task[None] | None = None
+
+    def install(self, parsers: dict[str, Callable[[Any], None]]) -> None:
+        """Wraps the gateway event parsers of the connection state, so that their payloads are recorded."""
+        for event in self.events | STATE_EVENTS:
+            parser = parsers.get(event)
+            if parser is not None:
+                parsers[event] = self.__wrap(event, parser)
+
+    def __wrap(self, event: str, parser: Callable[[Any], None]) -> Callable[[Any], None]:
+        def record_and_parse(data: Any) -> None:
+            try:
+                self.record(event, data)
+            except Exception:
+                logger.exception(f"Failed to record a {event} event")
+            parser(data)
+        return record_and_parse
+
+    def record(self, event: str, data: Any) -> None:
+        """Queues the event payload to be written."""
+        if self.__file is None:
+            return
+        if event in STATE_EVENTS:
+            data = {key: value for key, value in data.items() if key not in DROPPED_STATE_FIELDS}
+        prefixes: Iterable[str] = ()
+        if self.get_prefixes is not None and "content" in data:
+            guild_id = data.get("guild_id")
+            prefixes = self.get_prefixes(int(guild_id) if guild_id is not None else None)
+        entry = {"at": round(time.monotonic() - self.__started_at, 6), "t": event, "d": anonymize_payload(data, prefixes)}
+        self.__buffer.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.recorded += 1
+
+    def start(self) -> None:
+        """Opens the recording file and starts writing recorded events to it."""
+        if self.__file is not None:
+            return
+        self.__file = gzip.open(self.path, "at", encoding="utf-8")
+        self.__started_at = time.monotonic()
+        self.__task = asyncio.create_task(self.__run())
+        logger.info(f"Recording gateway events to {self.path}")
+
+    async def close(self) -> None:
+        """Writes the remaining events and closes the recording file."""
+        if self.__task is not None:
+            _ = self.__task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+        if self.__file is not None:
+            await self.__flush()
+            await asyncio.to_thread(self.__file.close)
+            self.__file = None
+
+    async def __flush(self) -> None:
+        if not self.__buffer or self.__file is None:
+            return
+        lines, self.__buffer = self.__buffer, []
+        _ = await asyncio.to_thread(self.__file.writelines, lines)
+
+    async def __run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.__flush()
+            except Exception:
+                logger.exception("Failed to write recorded gateway events")
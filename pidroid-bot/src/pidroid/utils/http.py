@@ -1,23 +1,48 @@
 from __future__ import annotations
 
+import asyncio
+import enum
+import logging
+import random
 import re
+import time
 
-from aiohttp import ContentTypeError
+from aiohttp import ClientConnectionError, ContentTypeError
 from aiohttp.client import ClientTimeout
 from dataclasses import dataclass
 from urllib.parse import urlencode
 from typing import Any, TYPE_CHECKING, override
 
 from pidroid.models.exceptions import APIException
+from pidroid.utils.cache import SingleFlight, TTLCache
+from pidroid.utils.metrics import REST_RATE_LIMITS
 
 if TYPE_CHECKING:
     from pidroid.client import Pidroid
 
 DEFAULT_HEADERS = {'User-Agent': 'Pidroid bot by JustAnyone'}
 
+# Default total timeout for a single TheoTown API request in seconds
+DEFAULT_TIMEOUT = 10.0
+
+# Retry policy for idempotent requests
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# Default per-route token bucket configuration as (tokens per second, burst capacity)
+DEFAULT_RATE_LIMIT = (5.0, 10)
+# Route specific overrides of the default token bucket configuration
+ROUTE_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "/game/plugin/encrypt": (0.5, 2),
+    "/game/account/redeem_wage": (0.5, 2),
+}
+
 DataDict = dict[str, list[Any] | bytes | int | str | None]
 HeaderDict = dict[str, str]
 
+logger = logging.getLogger("pidroid.utils.http")
+
 @dataclass
 class APIResponse:
     code: int
@@ -32,12 +57,225 @@ class APIResponse:
         raise APIException(self.code)
 
 
+class TokenBucket:
+    """This class implements a token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        super().__init__()
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Rate and capacity must be greater than 0")
+        self.rate = rate
+        self.capacity = capacity
+        self.__tokens = float(capacity)
+        self.__updated_at = time.monotonic()
+        self.__lock = asyncio.Lock()
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated_at) * self.rate)
+        self.__updated_at = now
+
+    @property
+    def tokens(self) -> float:
+        """Returns the amount of tokens currently available."""
+        self.__refill()
+        return self.__tokens
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and consumes it."""
+        async with self.__lock:
+            self.__refill()
+            if self.__tokens < 1:
+                await asyncio.sleep((1 - self.__tokens) / self.rate)
+                self.__refill()
+            self.__tokens -= 1
+
+
+class CircuitState(enum.Enum):
+    CLOSED    = 0
+    OPEN      = 1
+    HALF_OPEN = 2
+
+
+class CircuitBreaker:
+    """This class implements a circuit breaker.
+
+    After the specified amount of consecutive failures, the circuit opens and every request
+    fails fast until the reset timeout passes. Afterwards, a single trial request is let through
+    which either closes the circuit or opens it again."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        super().__init__()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.__failures = 0
+        self.__opened_at = 0.0
+        self.__state = CircuitState.CLOSED
+        self.__trial_in_progress = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Returns the current state of the circuit."""
+        if self.__state == CircuitState.OPEN and time.monotonic() - self.__opened_at >= self.reset_timeout:
+            self.__state = CircuitState.HALF_OPEN
+            self.__trial_in_progress = False
+        return self.__state
+
+    def allow_request(self) -> bool:
+        """Returns true if a request is allowed to go through."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self.__trial_in_progress:
+            self.__trial_in_progress = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Records a successful request and closes the circuit."""
+        self.__failures = 0
+        self.__state = CircuitState.CLOSED
+        self.__trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """Records a failed request, opening the circuit if required."""
+        self.__failures += 1
+        if self.__state == CircuitState.HALF_OPEN or self.__failures >= self.failure_threshold:
+            if self.__state != CircuitState.OPEN:
+                logger.warning("TheoTown API circuit opened after %s consecutive failures", self.__failures)
+            self.__state = CircuitState.OPEN
+            self.__opened_at = time.monotonic()
+            self.__trial_in_progress = False
+
+    def release_trial(self) -> None:
+        """Lets another trial request through, used when the trial request was cancelled without an outcome."""
+        self.__trial_in_progress = False
+
+
+def get_backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Returns a full jitter exponential backoff delay for the specified attempt, starting at 0."""
+    return random.uniform(0, min(cap, base * (2 ** attempt))) # nosec
+
+def _is_retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
 class HTTP:
-    """This class implements a basic TheoTown API HTTP request handling system."""
+    """This class implements a TheoTown API HTTP request handling system.
+
+    Requests are rate limited per route, GET requests are retried with backoff,
+    concurrent identical GET requests are coalesced and responses can be cached."""
 
-    def __init__(self, client: Pidroid) -> None:
+    def __init__(self, client: Pidroid, *, max_retries: int = MAX_RETRIES, cache_size: int = 512) -> None:
         super().__init__()
         self.client = client
+        self.max_retries = max_retries
+        self.__headers = DEFAULT_HEADERS.copy()
+        self.__headers['Authorization'] = "Bearer " + (self.client.config.get("tt_api_key") or "None")
+        self.__buckets: dict[str, TokenBucket] = {}
+        self.__breaker = CircuitBreaker()
+        self.__in_flight: SingleFlight[str] = SingleFlight()
+        self.__cache: TTLCache[str, APIResponse] = TTLCache(cache_size)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Returns the circuit breaker guarding the TheoTown API."""
+        return self.__breaker
+
+    def __get_bucket(self, route: Route) -> TokenBucket:
+        bucket = self.__buckets.get(route.path)
+        if bucket is None:
+            rate, capacity = ROUTE_RATE_LIMITS.get(route.path, DEFAULT_RATE_LIMIT)
+            bucket = TokenBucket(rate, capacity)
+            self.__buckets[route.path] = bucket
+        return bucket
+
+    def __build_headers(self, headers: HeaderDict | None) -> HeaderDict:
+        if not headers:
+            return self.__headers
+        new_headers = self.__headers.copy()
+        new_headers.update(headers)
+        return new_headers
+
+    async def __send(
+        self,
+        method: str,
+        route: Route,
+        headers: HeaderDict,
+        data: DataDict | None,
+        timeout: float
+    ) -> APIResponse:
+        """Sends a single request, guarded by the circuit breaker and the route token bucket."""
+        if not self.__breaker.allow_request():
+            raise APIException(503, "TheoTown API is currently unavailable, please try again later.")
+
+        # Every trial request has to settle, otherwise the circuit would stay half open forever
+        is_trial = self.__breaker.state == CircuitState.HALF_OPEN
+        recorded = False
+        try:
+            await self.__get_bucket(route).acquire()
+
+            assert self.client.session is not None
+            async with self.client.session.request(
+                method, route.url,
+                headers=headers, data=data,
+                timeout=ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 429:
+                    REST_RATE_LIMITS.inc(api="theotown")
+                recorded = True
+                if response.status >= 500:
+                    self.__breaker.record_failure()
+                else:
+                    self.__breaker.record_success()
+                try:
+                    return APIResponse(
+                        response.status,
+                        await response.json()
+                    )
+                except ContentTypeError as e:
+                    raise APIException(response.status) from e
+        except asyncio.CancelledError:
+            # Cancellation says nothing about the health of the API
+            if is_trial and not recorded:
+                self.__breaker.release_trial()
+            raise
+        except Exception:
+            if not recorded:
+                self.__breaker.record_failure()
+            raise
+
+    async def __send_with_retries(
+        self,
+        method: str,
+        route: Route,
+        headers: HeaderDict,
+        data: DataDict | None,
+        timeout: float
+    ) -> APIResponse:
+        """Sends a request, retrying transient failures with jittered exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                response = await self.__send(method, route, headers, data, timeout)
+            except APIException as e:
+                # Do not retry if the circuit is open, that is the whole point of it
+                if self.__breaker.state == CircuitState.OPEN or attempt >= self.max_retries:
+                    raise
+                # Only retry malformed responses from a failing backend
+                if not isinstance(e.__cause__, ContentTypeError) or not _is_retryable_status(e.status):
+                    raise
+            except (asyncio.TimeoutError, ClientConnectionError):
+                if self.__breaker.state == CircuitState.OPEN or attempt >= self.max_retries:
+                    raise
+            else:
+                if not _is_retryable_status(response.code) or attempt >= self.max_retries:
+                    return response
+
+            delay = get_backoff_delay(attempt)
+            logger.debug("Retrying %s %s in %.2f seconds (attempt %s)", method, route.path, delay, attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
 
     async def request(
         self,
@@ -45,53 +283,55 @@ class HTTP:
         route: Route,
         *,
         headers: HeaderDict | None = None,
-        data: DataDict | None = None
+        data: DataDict | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_ttl: float | None = None
     ) -> APIResponse:
-        # Deal with headers
-        new_headers = DEFAULT_HEADERS.copy()
-        if headers:
-            new_headers.update(headers)
-        new_headers['Authorization'] = "Bearer " + (self.client.config.get("tt_api_key") or "None")
-
-        # Do actual request
-        assert self.client.session is not None
-        async with self.client.session.request(
-            method, route.url,
-            headers=new_headers, data=data
-        ) as response:
-            try:
-                data = await response.json()
-                return APIResponse(
-                    response.status,
-                    data
-                )
-            except ContentTypeError as e:
-                raise APIException(response.status) from e
-
-    async def legacy_request(self, method: str, route: Route, headers: HeaderDict | None = None, data: DataDict | None = None) -> dict[Any, Any]:
-        # Deal with headers
-        new_headers = DEFAULT_HEADERS.copy()
+        """Sends a request to the TheoTown API.
+
+        Only GET requests are retried, coalesced and cached. Successful GET responses
+        are cached for cache_ttl seconds, if specified."""
+        built_headers = self.__build_headers(headers)
+        if method != "GET":
+            return await self.__send(method, route, built_headers, data, timeout)
+
+        key = route.url
+        if cache_ttl is not None:
+            cached = self.__cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def do_request() -> APIResponse:
+            response = await self.__send_with_retries(method, route, built_headers, data, timeout)
+            if cache_ttl is not None and response.code == 200:
+                self.__cache.set(key, response, cache_ttl)
+            return response
+
+        # Requests with custom headers can differ in response, do not coalesce them
         if headers:
-            new_headers.update(headers)
-        new_headers['Authorization'] = "Bearer " + self.client.config['tt_api_key']
-
-        # Do actual request
-        assert self.client.session is not None
-        async with self.client.session.request(
-            method, route.url,
-            headers=new_headers, data=data
-        ) as r:
-            if r.status == 200:
-                return await r.json()
+            return await do_request()
+        return await self.__in_flight.do(key, do_request)
 
-            try:
-                data = await r.json()
-                if data:
-                    raise APIException(r.status, data.get("message", None))
-            except ContentTypeError:
-                pass
-                    
-            raise APIException(r.status)
+    async def legacy_request(
+        self,
+        method: str,
+        route: Route,
+        headers: HeaderDict | None = None,
+        data: DataDict | None = None,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_ttl: float | None = None
+    ) -> dict[Any, Any]:
+        response = await self.request(
+            method, route,
+            headers=headers, data=data,
+            timeout=timeout, cache_ttl=cache_ttl
+        )
+        if response.code == 200:
+            return response.data
+        if response.data:
+            raise APIException(response.code, response.data.get("message", None))
+        raise APIException(response.code)
 
 class Route:
     """This class represents a TheoTown API route."""
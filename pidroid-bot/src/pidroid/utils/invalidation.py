@@ -0,0 +1,141 @@
+import asyncio
+import inspect
+import logging
+import uuid
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+from faststream.rabbit import ExchangeType, RabbitBroker, RabbitExchange, RabbitQueue
+from typing import Any
+
+from pidroid.utils.cache import TTLCache
+
+logger = logging.getLogger("pidroid.utils.invalidation")
+
+# Fanout exchange over which every process announces the cached data it has written
+INVALIDATIONS_EXCHANGE = RabbitExchange("bot.invalidations", type=ExchangeType.FANOUT)
+
+class CacheScope(Enum):
+    guild_configuration = "guild_configuration"
+    level_rewards = "level_rewards"
+    tags = "tags"
+    translations = "translations"
+
+InvalidationTarget = tuple[CacheScope, int | None, str | None]
+
+@dataclass(frozen=True)
+class Invalidation:
+    """A write of cached data, after which every process evicts the data from its caches."""
+
+    scope: CacheScope
+    # Guild the data belongs to, None if it does not belong to a guild
+    guild_id: int | None
+    # Key of the data within the scope, None if every entry of the guild was written
+    key: str | None
+    # Database clock of the write in microseconds, writes which do not conflict may commit in another order
+    version: int
+    # Process which wrote the data
+    origin: str
+
+    @property
+    def target(self) -> InvalidationTarget:
+        """Returns what was written, regardless of when and by whom."""
+        return (self.scope, self.guild_id, self.key)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "scope": self.scope.value,
+            "guild_id": self.guild_id,
+            "key": self.key,
+            "version": self.version,
+            "origin": self.origin
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Invalidation":
+        return cls(CacheScope(data["scope"]), data["guild_id"], data["key"], data["version"], data["origin"])
+
+InvalidationHandler = Callable[[Invalidation], Awaitable[None] | None]
+
+class InvalidationBus:
+    """This class distributes invalidations of cached data between the bot and API processes.
+
+    Invalidations of local writes are applied right away and published to every other process.
+    Every invalidation is applied, even if it is delivered twice or after a later write, as evicting
+    data again is harmless while skipping an eviction keeps stale data. The bus counts the invalidations
+    applied for every target, so that handlers which refetch data can tell whether the data was written
+    again in the meantime. Caches should still expire their entries, in case an invalidation is lost."""
+
+    def __init__(self, *, max_size: int = 10_000, retention: float = 600.0) -> None:
+        super().__init__()
+        self.origin = uuid.uuid4().hex
+        self.retention = retention
+        self.__generations: TTLCache[InvalidationTarget, int] = TTLCache(max_size)
+        self.__handlers: list[InvalidationHandler] = []
+        self.__broker: RabbitBroker | None = None
+        self.__started = False
+        self.__tasks: set[asyncio.Task[None]] = set()
+
+    def add_handler(self, handler: InvalidationHandler) -> None:
+        """Adds a handler which evicts the invalidated data."""
+        self.__handlers.append(handler)
+
+    def get_generation(self, target: InvalidationTarget) -> int:
+        """Returns how many invalidations of the target were applied recently.
+
+        Data fetched for the target is stale if the generation changed while it was being fetched."""
+        return self.__generations.get(target) or 0
+
+    def connect(self, broker: RabbitBroker) -> None:
+        """Subscribes to the invalidations of the other processes.
+
+        Has to be called before the broker is started."""
+        self.__broker = broker
+        # Every process needs its own queue to receive every invalidation
+        queue = RabbitQueue(f"bot.invalidations.{self.origin}", exclusive=True, auto_delete=True)
+
+        @broker.subscriber(queue, INVALIDATIONS_EXCHANGE)
+        async def handle_invalidation(payload: dict[str, Any]) -> None: # pyright: ignore[reportUnusedFunction]
+            invalidation = Invalidation.from_dict(payload)
+            if invalidation.origin != self.origin:
+                await self.apply(invalidation)
+
+    def start(self) -> None:
+        """Starts publishing the invalidations of local writes."""
+        self.__started = True
+
+    async def stop(self) -> None:
+        """Stops publishing and waits for the invalidations which are being published."""
+        self.__started = False
+        if self.__tasks:
+            _ = await asyncio.wait(self.__tasks)
+
+    async def apply(self, invalidation: Invalidation) -> None:
+        """Runs the handlers of the invalidation."""
+        target = invalidation.target
+        self.__generations.set(target, self.get_generation(target) + 1, self.retention)
+        for handler in self.__handlers:
+            try:
+                result = handler(invalidation)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(f"Failed to handle an invalidation of {invalidation.scope.value}")
+
+    async def invalidate(self, scope: CacheScope, guild_id: int | None, version: int, key: str | None = None) -> None:
+        """Applies the invalidation of a local write and publishes it to the other processes."""
+        invalidation = Invalidation(scope, guild_id, key, version, self.origin)
+        await self.apply(invalidation)
+        if self.__broker is None or not self.__started:
+            return
+        task = asyncio.create_task(self.__publish(self.__broker, invalidation))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __publish(self, broker: RabbitBroker, invalidation: Invalidation) -> None:
+        try:
+            _ = await broker.publish(invalidation.to_dict(), exchange=INVALIDATIONS_EXCHANGE)
+        except Exception:
+            # Other processes keep the stale data until their cache entries expire
+            logger.exception(f"Failed to publish an invalidation of {invalidation.scope.value}")
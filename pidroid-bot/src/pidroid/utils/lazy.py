@@ -0,0 +1,38 @@
+import importlib
+
+from types import ModuleType
+from typing import Any
+
+class LazyModule:
+    """This class stands in for a module which is imported on the first attribute access.
+
+    Heavy dependencies of features which might never be used are imported this way, which
+    shortens the startup. The module should be imported normally for type checking:
+
+        if TYPE_CHECKING:
+            import emoji
+        else:
+            emoji = LazyModule("emoji")
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.__name = name
+        self.__module: ModuleType | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """Returns true if the module has been imported."""
+        return self.__module is not None
+
+    def load(self) -> ModuleType:
+        """Imports the module if it has not been imported yet and returns it."""
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return self.__module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.load(), attribute)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self.__name}{' (loaded)' if self.loaded else ''}>"
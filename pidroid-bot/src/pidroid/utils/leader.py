@@ -0,0 +1,136 @@
+import asyncio
+import functools
+import logging
+
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from typing import Any, ParamSpec, TypeVar
+
+logger = logging.getLogger("pidroid.utils.leader")
+
+# Advisory lock key of the leader of the first cluster, the other clusters use the following keys
+LEADER_LOCK_KEY = int.from_bytes(b"Pidroid", "big")
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+class LeaderElection:
+    """This class elects a single leader among the processes which use the same lock key.
+
+    Leadership is a PostgreSQL session advisory lock, held by a dedicated connection.
+    The server releases the lock as soon as the connection closes, therefore when a leader
+    shuts down or crashes, a follower takes over within a retry interval.
+
+    The leader renews its lease by checking the connection every renew interval. If the check fails
+    or does not finish within the renew timeout, the leader steps down right away, so that it stops
+    running singleton jobs before the server notices the dead connection and elects another leader."""
+
+    def __init__(
+        self,
+        connect: Callable[[], Coroutine[Any, Any, AsyncConnection]],
+        key: int = LEADER_LOCK_KEY,
+        *,
+        renew_interval: float = 5.0,
+        renew_timeout: float = 3.0,
+        retry_interval: float = 2.0
+    ) -> None:
+        super().__init__()
+        self.key = key
+        self.renew_interval = renew_interval
+        self.renew_timeout = renew_timeout
+        self.retry_interval = retry_interval
+        # Amount of times this process became the leader
+        self.terms = 0
+        self.__connect = connect
+        self.__connection: AsyncConnection | None = None
+        self.__leader = asyncio.Event()
+        self.__task: asyncio.Task[None] | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Returns true if this process is currently the leader."""
+        return self.__leader.is_set()
+
+    async def wait_until_leader(self) -> None:
+        """Waits until this process becomes the leader."""
+        _ = await self.__leader.wait()
+
+    def start(self) -> None:
+        """Starts taking part in the election."""
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Stops taking part in the election, handing the leadership over to another process."""
+        if self.__task is not None:
+            _ = self.__task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+        await self.__disconnect()
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                if self.is_leader:
+                    await asyncio.wait_for(self.__renew(), self.renew_timeout)
+                else:
+                    await self.__try_acquire()
+            except Exception:
+                if self.is_leader:
+                    logger.exception("Failed to renew the leadership, stepping down")
+                else:
+                    logger.exception("Failed to take part in the leader election")
+                await self.__disconnect()
+            await asyncio.sleep(self.renew_interval if self.is_leader else self.retry_interval)
+
+    async def __get_connection(self) -> AsyncConnection:
+        if self.__connection is None:
+            connection = await self.__connect()
+            # The connection is held for as long as the lock, it must not hold a transaction open as well
+            self.__connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        return self.__connection
+
+    async def __try_acquire(self) -> None:
+        connection = await self.__get_connection()
+        result = await connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key})
+        if result.scalar():
+            self.terms += 1
+            self.__leader.set()
+            logger.info(f"Elected as the leader of lock {self.key}")
+
+    async def __renew(self) -> None:
+        connection = await self.__get_connection()
+        _ = await connection.execute(text("SELECT 1"))
+
+    async def __disconnect(self) -> None:
+        if self.is_leader:
+            logger.warning(f"No longer the leader of lock {self.key}")
+        self.__leader.clear()
+        connection, self.__connection = self.__connection, None
+        if connection is not None:
+            # Session locks survive the return to the pool, so the connection is discarded,
+            # which makes the server release the lock right away
+            with suppress(Exception):
+                await connection.invalidate()
+                await connection.close()
+
+def singleton_job(func: Callable[P, Coroutine[Any, Any, T | None]]) -> Callable[P, Coroutine[Any, Any, T | None]]:
+    """Declares a background job which must run only once across every replica of the bot.
+
+    The decorated job is skipped unless the current process is the elected leader. The first argument
+    of the job has to be either the client or an object with the client as its client attribute,
+    such as a cog."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T | None:
+        owner = args[0]
+        client = getattr(owner, "client", owner)
+        if not client.leader.is_leader:
+            return None
+        return await func(*args, **kwargs)
+
+    setattr(wrapper, "__singleton_job__", True)
+    return wrapper
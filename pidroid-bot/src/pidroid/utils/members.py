@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import discord
+import logging
+
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from pidroid.utils.cache import SingleFlight
+
+if TYPE_CHECKING:
+    from pidroid.models.guild_configuration import GuildConfiguration
+
+logger = logging.getLogger("pidroid.utils.members")
+
+class MemberCachePolicy(Enum):
+    # Every guild is chunked at startup, before the client becomes ready
+    all = "all"
+    # Guilds which use features that need every member are chunked after startup, the rest on demand
+    configured = "configured"
+    # Every guild is chunked on demand
+    lazy = "lazy"
+
+def requires_member_cache(config: GuildConfiguration) -> bool:
+    """Returns true if the guild uses features which need every member of the guild to be cached.
+
+    The level reward sync goes over every member with a level and jailing is usually
+    followed by member and role lookups."""
+    return config.xp_system_active or config.jail_role_id is not None
+
+class MemberChunker:
+    """This class decides which guilds have every member cached and requests their members.
+
+    Members of guilds which are not chunked are only cached as they join, therefore code which
+    needs every member of a guild has to call ensure_chunked first."""
+
+    def __init__(self, policy: MemberCachePolicy) -> None:
+        super().__init__()
+        self.policy = policy
+        self.__flight: SingleFlight[int] = SingleFlight()
+
+    @property
+    def chunk_at_startup(self) -> bool:
+        """Returns true if the library should chunk every guild before the client becomes ready."""
+        return self.policy == MemberCachePolicy.all
+
+    def should_chunk_after_startup(self, config: GuildConfiguration) -> bool:
+        """Returns true if the guild should be chunked in the background after startup."""
+        return self.policy == MemberCachePolicy.configured and requires_member_cache(config)
+
+    async def ensure_chunked(self, guild: discord.Guild) -> None:
+        """Caches every member of the guild, unless they are already cached."""
+        if guild.chunked:
+            return
+
+        async def chunk() -> None:
+            logger.debug(f"Chunking {guild} with {guild.member_count} members")
+            _ = await guild.chunk(cache=True)
+
+        await self.__flight.do(guild.id, chunk)
+
+    def get_statistics(self, guilds: list[discord.Guild]) -> tuple[int, int, int]:
+        """Returns the amount of chunked guilds, cached members and members in total."""
+        chunked = sum(1 for guild in guilds if guild.chunked)
+        cached = sum(len(guild.members) for guild in guilds)
+        total = sum(guild.member_count or 0 for guild in guilds)
+        return chunked, cached, total
@@ -0,0 +1,87 @@
+import asyncio
+import time
+import tracemalloc
+
+from dataclasses import dataclass
+
+# Allocations made by the tracing and importing machinery are not interesting
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+@dataclass
+class MemoryReport:
+    duration: float
+    # Traced memory in bytes at the start and the end of the report
+    traced_before: int
+    traced_after: int
+    differences: list[tracemalloc.StatisticDiff]
+
+    @property
+    def growth(self) -> int:
+        """Returns by how many bytes the traced memory grew."""
+        return self.traced_after - self.traced_before
+
+    def to_text(self, limit: int = 50) -> str:
+        """Returns the allocation sites whose memory changed the most, largest change first."""
+        lines = [
+            f"Traced memory changed by {self.growth / 1024:+,.1f} KiB over {self.duration:.1f} seconds, "
+            f"from {self.traced_before / 1024:,.1f} KiB to {self.traced_after / 1024:,.1f} KiB",
+            ""
+        ]
+        for difference in self.differences[:limit]:
+            frame = difference.traceback[0]
+            lines.append(
+                f"{difference.size_diff / 1024:+,.1f} KiB ({difference.count_diff:+,} blocks), "
+                f"{difference.size / 1024:,.1f} KiB in total: {frame.filename}:{frame.lineno}"
+            )
+        return "\n".join(lines)
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    snapshot = tracemalloc.take_snapshot()
+    return snapshot.filter_traces([tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES])
+
+class MemoryTracer:
+    """This class reports which allocation sites grew over a period of time by comparing tracemalloc snapshots.
+
+    Tracing slows down every allocation, therefore it is only enabled while a report is being made,
+    unless it was already enabled. Allocations made before tracing was enabled are not reported."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__stop_requested = asyncio.Event()
+        self.__running = False
+
+    @property
+    def running(self) -> bool:
+        """Returns true if a report is being made."""
+        return self.__running
+
+    def request_stop(self) -> None:
+        """Finishes the report which is being made early."""
+        self.__stop_requested.set()
+
+    async def run(self, seconds: float, *, frames: int = 1) -> MemoryReport:
+        """Traces the allocations for the specified amount of seconds and returns the report."""
+        if self.__running:
+            raise RuntimeError("Memory tracer is already running")
+        self.__running = True
+        self.__stop_requested.clear()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(frames)
+        try:
+            start = time.perf_counter()
+            # Snapshots of a large heap take a while, so they are taken outside of the event loop
+            before = await asyncio.to_thread(_take_snapshot)
+            traced_before, _ = tracemalloc.get_traced_memory()
+            try:
+                _ = await asyncio.wait_for(self.__stop_requested.wait(), seconds)
+            except asyncio.TimeoutError:
+                pass
+            after = await asyncio.to_thread(_take_snapshot)
+            traced_after, _ = tracemalloc.get_traced_memory()
+            differences = await asyncio.to_thread(after.compare_to, before, "lineno")
+            return MemoryReport(time.perf_counter() - start, traced_before, traced_after, differences)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self.__running = False
@@ -0,0 +1,302 @@
+import bisect
+import logging
+import time
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar, override
+
+logger = logging.getLogger("pidroid.utils.metrics")
+
+# Default histogram buckets in seconds, suitable for latencies from a millisecond to a minute
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = tuple[str, ...]
+Sample = dict[str, Any]
+
+M = TypeVar("M", bound="Metric")
+
+class Metric(ABC):
+    """This class represents a named metric with an optional set of labels."""
+
+    type: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__()
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+
+    def _get_label_values(self, labels: dict[str, Any]) -> LabelValues:
+        if labels.keys() != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _get_labels(self, values: LabelValues) -> dict[str, str]:
+        return dict(zip(self.label_names, values))
+
+    @abstractmethod
+    def collect(self) -> list[Sample]:
+        """Returns the samples of the metric."""
+        raise NotImplementedError
+
+class Counter(Metric):
+    """This class represents a monotonically increasing value."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self.__values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Increments the counter by the specified amount."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        key = self._get_label_values(labels)
+        self.__values[key] = self.__values.get(key, 0) + amount
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Sets the counter to a value which is tracked elsewhere."""
+        self.__values[self._get_label_values(labels)] = value
+
+    def get(self, **labels: Any) -> float:
+        """Returns the current value of the counter."""
+        return self.__values.get(self._get_label_values(labels), 0)
+
+    @override
+    def collect(self) -> list[Sample]:
+        return [
+            {"name": f"{self.name}_total", "labels": self._get_labels(key), "value": value}
+            for key, value in self.__values.items()
+        ]
+
+class Gauge(Metric):
+    """This class represents a value that can go up and down."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self.__values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Sets the gauge to the specified value."""
+        self.__values[self._get_label_values(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Increments the gauge by the specified amount."""
+        key = self._get_label_values(labels)
+        self.__values[key] = self.__values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        """Decrements the gauge by the specified amount."""
+        self.inc(-amount, **labels)
+
+    def get(self, **labels: Any) -> float:
+        """Returns the current value of the gauge."""
+        return self.__values.get(self._get_label_values(labels), 0)
+
+    def clear(self) -> None:
+        """Removes every labelled value, so that values which no longer exist are not reported."""
+        self.__values.clear()
+
+    @override
+    def collect(self) -> list[Sample]:
+        return [
+            {"name": self.name, "labels": self._get_labels(key), "value": value}
+            for key, value in self.__values.items()
+        ]
+
+class Histogram(Metric):
+    """This class represents a distribution of observed values over cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # For every label set, holds the per bucket counts, with the last one being +Inf, and the sum
+        self.__values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Records the specified value."""
+        key = self._get_label_values(labels)
+        entry = self.__values.get(key)
+        if entry is None:
+            entry = ([0] * (len(self.buckets) + 1), [0.0])
+            self.__values[key] = entry
+        counts, total = entry
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Records the time it took to run the body of the with statement."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get_count(self, **labels: Any) -> int:
+        """Returns the amount of observed values."""
+        entry = self.__values.get(self._get_label_values(labels))
+        if entry is None:
+            return 0
+        return sum(entry[0])
+
+    @override
+    def collect(self) -> list[Sample]:
+        samples: list[Sample] = []
+        for key, (counts, total) in self.__values.items():
+            labels = self._get_labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                samples.append({"name": f"{self.name}_bucket", "labels": {**labels, "le": le}, "value": cumulative})
+            samples.append({"name": f"{self.name}_sum", "labels": labels, "value": total[0]})
+            samples.append({"name": f"{self.name}_count", "labels": labels, "value": cumulative})
+        return samples
+
+class MetricsRegistry:
+    """This class holds every metric of the bot.
+
+    Values which are tracked elsewhere, like queue depths, are updated by collectors
+    right before the metrics are collected."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__metrics: dict[str, Metric] = {}
+        self.__collectors: list[Callable[[], None]] = []
+
+    def __register(self, metric: M) -> M:
+        existing = self.__metrics.get(metric.name)
+        if existing is not None:
+            # Metrics are registered at import time, reloaded modules get the existing metric back
+            if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                raise ValueError(f"Metric {metric.name} is already registered with a different definition")
+            return existing # pyright: ignore[reportReturnType]
+        self.__metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Counter:
+        """Returns a new or an already registered counter."""
+        return self.__register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Gauge:
+        """Returns a new or an already registered gauge."""
+        return self.__register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Returns a new or an already registered histogram."""
+        return self.__register(Histogram(name, documentation, label_names, buckets))
+
+    def get(self, name: str) -> Metric | None:
+        """Returns the metric with the specified name, if any."""
+        return self.__metrics.get(name)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Adds a function which updates metrics right before they are collected."""
+        if collector not in self.__collectors:
+            self.__collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]) -> None:
+        """Removes a previously added collector."""
+        if collector in self.__collectors:
+            self.__collectors.remove(collector)
+
+    def collect(self) -> list[dict[str, Any]]:
+        """Returns a serializable representation of every metric."""
+        for collector in self.__collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception(f"Metrics collector {collector!r} failed")
+        return [
+            {
+                "name": metric.name,
+                "type": metric.type,
+                "documentation": metric.documentation,
+                "samples": metric.collect()
+            }
+            for metric in self.__metrics.values()
+        ]
+
+# Holds every metric of the bot
+registry = MetricsRegistry()
+
+EVENT_LOOP_LAG = registry.histogram(
+    "pidroid_event_loop_lag_seconds",
+    "Delay between when a callback was scheduled to run and when it actually ran"
+)
+LISTENER_LATENCY = registry.histogram(
+    "pidroid_listener_duration_seconds",
+    "Time it took to run an event listener",
+    ("event", "listener")
+)
+COMMAND_LATENCY = registry.histogram(
+    "pidroid_command_duration_seconds",
+    "Time it took to invoke a command",
+    ("command", "status")
+)
+DATABASE_QUERY_LATENCY = registry.histogram(
+    "pidroid_database_query_duration_seconds",
+    "Time it took to execute a database statement",
+    ("operation",)
+)
+REST_RATE_LIMITS = registry.counter(
+    "pidroid_rest_rate_limited",
+    "Amount of REST responses with status 429",
+    ("api",)
+)
+QUEUE_DEPTH = registry.gauge(
+    "pidroid_queue_depth",
+    "Amount of items waiting to be processed by an internal queue",
+    ("queue",)
+)
+EVENTS_DROPPED = registry.counter(
+    "pidroid_events_dropped",
+    "Amount of bot events dropped because the event bus buffer was full"
+)
+DEBOUNCER_PENDING = registry.gauge(
+    "pidroid_debouncer_pending_operations",
+    "Amount of role changes waiting to be applied by the debouncer"
+)
+CACHE_LOOKUPS = registry.counter(
+    "pidroid_cache_lookups",
+    "Amount of cache lookups by result",
+    ("cache", "result")
+)
+CACHE_ENTRIES = registry.gauge(
+    "pidroid_cache_entries",
+    "Amount of entries held by a cache",
+    ("cache",)
+)
+LEADER = registry.gauge(
+    "pidroid_leader",
+    "Whether the process is the elected leader which runs the singleton jobs"
+)
+
+class RateLimitLogFilter(logging.Filter):
+    """This class counts the 429 responses which discord.py reports through its logger."""
+
+    @override
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str) and record.msg.startswith("We are being rate limited."):
+            REST_RATE_LIMITS.inc(api="discord")
+        return True
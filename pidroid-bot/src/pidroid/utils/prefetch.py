@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+
+from collections import deque
+from collections.abc import Iterable
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from pidroid.utils.http import get_backoff_delay
+
+T = TypeVar("T")
+
+logger = logging.getLogger("pidroid.utils.prefetch")
+
+class PrefetchBuffer(Generic[T]):
+    """This class implements per key ring buffers of prefetched results.
+
+    The buffers are refilled in the background with capped concurrency, backing off from keys
+    that fail to be fetched. This allows results to be handed out without waiting on a remote round-trip.
+
+    A key is only prefetched for once it has been requested. Its buffer holds a result for every request
+    made within the demand window, up to the size, so rarely used keys hold one result at most and
+    keys which were not requested within the window are no longer refilled."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[str], Awaitable[T]],
+        keys: Iterable[str],
+        *,
+        size: int = 3,
+        demand_window: float = 600.0,
+        max_concurrency: int = 2,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 300.0
+    ) -> None:
+        super().__init__()
+        self.name = name
+        self.size = size
+        self.demand_window = demand_window
+        self.__fetch = fetch
+        self.__buffers: dict[str, deque[T]] = {key: deque(maxlen=size) for key in keys}
+        # Times of the requests made within the demand window
+        self.__requests: dict[str, deque[float]] = {key: deque() for key in self.__buffers}
+        self.__failures: dict[str, int] = {key: 0 for key in self.__buffers}
+        self.__retry_at: dict[str, float] = {key: 0.0 for key in self.__buffers}
+        self.__backoff_base = backoff_base
+        self.__backoff_cap = backoff_cap
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__wake = asyncio.Event()
+        self.__filling: dict[str, asyncio.Task[Any]] = {}
+        self.__worker: asyncio.Task[None] | None = None
+
+    @property
+    def keys(self) -> list[str]:
+        """Returns every key the buffer is prefetching for."""
+        return list(self.__buffers)
+
+    def buffered(self, key: str) -> int:
+        """Returns the amount of ready results for the specified key."""
+        return len(self.__buffers[key])
+
+    def target_size(self, key: str, now: float | None = None) -> int:
+        """Returns the amount of results which should be buffered for the specified key."""
+        requests = self.__requests[key]
+        expired_before = (time.monotonic() if now is None else now) - self.demand_window
+        while requests and requests[0] < expired_before:
+            _ = requests.popleft()
+        return min(self.size, len(requests))
+
+    def start(self) -> None:
+        """Starts refilling the buffers in the background."""
+        if self.__worker is None:
+            self.__worker = asyncio.create_task(self.__run())
+            self.__wake.set()
+
+    async def stop(self) -> None:
+        """Stops refilling the buffers."""
+        tasks = list(self.__filling.values())
+        if self.__worker is not None:
+            tasks.append(self.__worker)
+            self.__worker = None
+        for task in tasks:
+            _ = task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self.__filling.clear()
+
+    def pop(self, key: str) -> T | None:
+        """Returns a prefetched result for the specified key or None if the buffer is empty."""
+        buffer = self.__buffers[key]
+        requests = self.__requests[key]
+        requests.append(time.monotonic())
+        # Only the latest requests are needed to size the buffer
+        if len(requests) > self.size:
+            _ = requests.popleft()
+        self.__wake.set()
+        if not buffer:
+            return None
+        return buffer.popleft()
+
+    async def get(self, key: str) -> T:
+        """Returns a prefetched result for the specified key, fetching it directly if the buffer is empty."""
+        result = self.pop(key)
+        if result is None:
+            return await self.__fetch(key)
+        return result
+
+    async def __run(self) -> None:
+        while True:
+            _ = await self.__wake.wait()
+            self.__wake.clear()
+
+            now = time.monotonic()
+            next_retry_at: float | None = None
+            for key, buffer in self.__buffers.items():
+                if len(buffer) >= self.target_size(key, now) or key in self.__filling:
+                    continue
+                retry_at = self.__retry_at[key]
+                if retry_at > now:
+                    if next_retry_at is None or retry_at < next_retry_at:
+                        next_retry_at = retry_at
+                    continue
+                self.__filling[key] = asyncio.create_task(self.__fill(key))
+
+            # Wake up on our own once a key is allowed to be retried
+            if next_retry_at is not None:
+                with suppress(asyncio.TimeoutError):
+                    _ = await asyncio.wait_for(self.__wake.wait(), next_retry_at - now)
+                self.__wake.set()
+
+    async def __fill(self, key: str) -> None:
+        buffer = self.__buffers[key]
+        try:
+            async with self.__semaphore:
+                while len(buffer) < self.target_size(key):
+                    try:
+                        result = await self.__fetch(key)
+                    except Exception:
+                        failures = self.__failures[key]
+                        self.__failures[key] = failures + 1
+                        delay = get_backoff_delay(failures, self.__backoff_base, self.__backoff_cap)
+                        self.__retry_at[key] = time.monotonic() + delay
+                        logger.warning(f"Failed to prefetch {self.name} result for {key}, retrying in {delay:.1f} seconds")
+                        return
+                    self.__failures[key] = 0
+                    buffer.append(result)
+        finally:
+            _ = self.__filling.pop(key, None)
+            self.__wake.set()
@@ -0,0 +1,132 @@
+import asyncio
+import sys
+import threading
+import time
+import weakref
+
+from collections import Counter
+from contextlib import suppress
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+
+# Root frame of samples taken while the event loop was not running any task
+NO_TASK_LABEL = ("(no task)",)
+
+@dataclass
+class ProfileResult:
+    duration: float
+    # Sample counts keyed by the collapsed stack, root first
+    samples: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def sample_count(self) -> int:
+        """Returns the total amount of samples taken."""
+        return self.samples.total()
+
+    def to_collapsed(self) -> str:
+        """Returns the samples in the collapsed stack format, which flamegraph tools accept."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+class SamplingProfiler:
+    """This class implements a sampling profiler of the event loop thread.
+
+    A helper thread periodically samples the stack of the event loop thread. Samples are attributed
+    to the running task, which can be labelled, for example, with the command or listener it runs."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        super().__init__()
+        self.interval = interval
+        self.__labels: weakref.WeakKeyDictionary[asyncio.Task[object], tuple[str, ...]] = weakref.WeakKeyDictionary()
+        self.__frame_names: dict[CodeType, str] = {}
+        self.__samples: Counter[str] = Counter()
+        self.__loop: asyncio.AbstractEventLoop | None = None
+        self.__loop_thread_id: int | None = None
+        self.__only_task: asyncio.Task[object] | None = None
+        self.__thread: threading.Thread | None = None
+        self.__started_at = 0.0
+        self.__stop_sampling = threading.Event()
+        self.__stop_requested = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        """Returns true if the profiler is currently sampling."""
+        return self.__thread is not None
+
+    def label_current_task(self, *label: str) -> None:
+        """Attributes the samples of the current task to the specified label frames."""
+        if not self.running:
+            return
+        task = asyncio.current_task()
+        if task is not None:
+            self.__labels[task] = label
+
+    def start(self, *, only_task: "asyncio.Task[object] | None" = None) -> None:
+        """Starts sampling the running event loop.
+
+        If a task is specified, only the samples taken while it runs are kept."""
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        self.__loop = asyncio.get_running_loop()
+        self.__loop_thread_id = threading.get_ident()
+        self.__only_task = only_task
+        self.__samples = Counter()
+        self.__stop_sampling.clear()
+        self.__stop_requested.clear()
+        self.__started_at = time.perf_counter()
+        self.__thread = threading.Thread(target=self.__sample, name="pidroid-profiler", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> ProfileResult:
+        """Stops sampling and returns the collected samples."""
+        if self.__thread is None:
+            raise RuntimeError("Profiler is not running")
+        self.__stop_sampling.set()
+        self.__thread.join()
+        self.__thread = None
+        self.__only_task = None
+        self.__labels.clear()
+        return ProfileResult(time.perf_counter() - self.__started_at, self.__samples)
+
+    def request_stop(self) -> None:
+        """Ends a profile started with run before its duration passes."""
+        self.__stop_requested.set()
+
+    async def run(self, duration: float) -> ProfileResult:
+        """Samples the event loop for the specified amount of seconds or until a stop is requested."""
+        self.start()
+        try:
+            with suppress(asyncio.TimeoutError):
+                _ = await asyncio.wait_for(self.__stop_requested.wait(), duration)
+        finally:
+            result = self.stop()
+        return result
+
+    def __get_frame_name(self, code: CodeType, frame: FrameType) -> str:
+        name = self.__frame_names.get(code)
+        if name is None:
+            name = f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+            self.__frame_names[code] = name
+        return name
+
+    def __sample(self) -> None:
+        assert self.__loop is not None and self.__loop_thread_id is not None
+        while not self.__stop_sampling.wait(self.interval):
+            frame = sys._current_frames().get(self.__loop_thread_id) # pyright: ignore[reportPrivateUsage]
+            if frame is None:
+                continue
+            task = asyncio.current_task(self.__loop)
+            if self.__only_task is not None and task is not self.__only_task:
+                continue
+
+            stack: list[str] = []
+            current: FrameType | None = frame
+            while current is not None:
+                stack.append(self.__get_frame_name(current.f_code, current))
+                current = current.f_back
+            del frame, current
+
+            if task is None:
+                label = NO_TASK_LABEL
+            else:
+                label = self.__labels.get(task) or (f"task:{task.get_name()}",)
+            self.__samples[";".join((*label, *reversed(stack)))] += 1
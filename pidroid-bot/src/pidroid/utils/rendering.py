@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Callable
+
+from pidroid.models.exceptions import RenderQueueFull
+from pidroid.utils.file import Resource
+from pidroid.utils.lazy import LazyModule
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageSequence
+else:
+    # Images are only decoded by the worker processes, the bot process does not need PIL
+    Image = LazyModule("PIL.Image")
+    ImageSequence = LazyModule("PIL.ImageSequence")
+
+logger = logging.getLogger("pidroid.utils.rendering")
+
+@dataclass
+class Templates:
+    bonk: Image.Image
+    # Frames of the headpat GIF, already converted to RGBA
+    headpat_frames: list[Image.Image]
+
+# Templates are decoded once per worker process
+_templates: Templates | None = None
+
+def load_templates() -> Templates:
+    """Returns the decoded image templates, decoding them on the first call."""
+    global _templates
+    if _templates is None:
+        with Image.open(Resource('bonk.jpg')) as bonk:
+            bonk.load()
+            bonk_template = bonk.copy()
+        with Image.open(Resource('pat.gif')) as headpat:
+            frames = [frame.convert('RGBA') for frame in ImageSequence.Iterator(headpat)]
+        _templates = Templates(bonk_template, frames)
+    return _templates
+
+def _initialize_worker() -> None:
+    _ = load_templates()
+
+def render_bonk(author_avatar: bytes, member_avatar: bytes) -> bytes:
+    """Returns a JPEG encoded image of the author bonking the member."""
+    canvas_image = load_templates().bonk.copy()
+    with Image.open(BytesIO(author_avatar)) as avatar:
+        canvas_image.paste(avatar, (215, 80))
+    with Image.open(BytesIO(member_avatar)) as avatar:
+        canvas_image.paste(avatar, (546, 290))
+
+    output_stream = BytesIO()
+    canvas_image.save(output_stream, format='jpeg')
+    canvas_image.close()
+    return output_stream.getvalue()
+
+def render_headpat(member_avatar: bytes) -> bytes:
+    """Returns a GIF encoded animation of the member being headpatted."""
+    frames: list[Image.Image] = []
+    with Image.open(BytesIO(member_avatar)) as avatar:
+        for frame in load_templates().headpat_frames:
+            composite_frame = Image.new(avatar.mode, (256, 356))
+            composite_frame.paste(avatar, (0, 100))
+            composite_frame.paste(frame, (0, 0), frame)
+            composite_frame.info['disposal'] = 2
+            frames.append(composite_frame)
+
+    output_stream = BytesIO()
+    frames[0].save(
+        output_stream,
+        format='gif',
+        save_all=True,
+        append_images=frames[1:-1],
+        duration=60,
+        loop=0
+    )
+    return output_stream.getvalue()
+
+def render_memefy(image: bytes, retain_aspect_ratio: bool) -> bytes:
+    """Returns a PNG encoded image, downscaled to comply with the German copyright regulations."""
+    with Image.open(BytesIO(image)) as attachment_image:
+        sizes = (128, 128)
+        if retain_aspect_ratio:
+            orig_w, orig_h = attachment_image.size
+            ratio = 12800 / orig_w
+            sizes = (128, round(ratio * orig_h / 100))
+        resized_image = attachment_image.resize(sizes, Image.LANCZOS)
+
+    output_stream = BytesIO()
+    resized_image.save(output_stream, format='png')
+    resized_image.close()
+    return output_stream.getvalue()
+
+def render_jpeg(image: bytes, quality: int) -> bytes:
+    """Returns a JPEG encoded image of the specified quality."""
+    with Image.open(BytesIO(image)) as attachment_image:
+        converted_image = attachment_image.convert("RGB")
+
+    output_stream = BytesIO()
+    converted_image.save(output_stream, format='JPEG', quality=quality)
+    converted_image.close()
+    return output_stream.getvalue()
+
+class ImageRenderer:
+    """This class implements an image renderer which runs the rendering jobs in a process pool.
+
+    Every worker process decodes the templates once when it is started. Jobs are accepted
+    only while the amount of jobs in progress is below the maximum queue depth."""
+
+    def __init__(self, *, max_workers: int = 2, max_queue_depth: int = 8) -> None:
+        super().__init__()
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.__executor: ProcessPoolExecutor | None = None
+        self.__pending = 0
+
+    @property
+    def pending_jobs(self) -> int:
+        """Returns the amount of jobs which are queued or in progress."""
+        return self.__pending
+
+    def __create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            # Forking a process with running threads is not safe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker
+        )
+
+    async def start(self) -> None:
+        """Starts the worker processes and waits for them to decode the templates."""
+        if self.__executor is not None:
+            return
+        self.__executor = self.__create_executor()
+        loop = asyncio.get_running_loop()
+        _ = await asyncio.gather(*[
+            loop.run_in_executor(self.__executor, _initialize_worker) for _ in range(self.max_workers)
+        ])
+
+    def stop(self) -> None:
+        """Stops the worker processes, cancelling the queued jobs."""
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+
+    async def render(self, func: Callable[..., bytes], *args: Any) -> bytes:
+        """Runs the rendering function in a worker process and returns the encoded image.
+
+        Raises RenderQueueFull if too many jobs are already in progress."""
+        if self.__pending >= self.max_queue_depth:
+            raise RenderQueueFull()
+
+        if self.__executor is None:
+            self.__executor = self.__create_executor()
+
+        self.__pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.__executor, func, *args)
+        except BrokenProcessPool:
+            logger.exception("Image rendering process pool broke, restarting it")
+            self.stop()
+            raise
+        finally:
+            self.__pending -= 1
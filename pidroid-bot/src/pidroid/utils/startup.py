@@ -0,0 +1,167 @@
+import asyncio
+import itertools
+import logging
+import time
+
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+logger = logging.getLogger("pidroid.utils.startup")
+
+@dataclass
+class Timing:
+    name: str
+    duration: float
+    failed: bool = False
+
+class StartupReport:
+    """This class records how long every startup phase, extension load and warm-up took."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__started_at = time.perf_counter()
+        self.phases: list[Timing] = []
+        self.extensions: list[Timing] = []
+        self.warmups: list[Timing] = []
+        # Seconds after the start until commands could be responded to
+        self.ready_after: float | None = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Records the duration of the enclosed startup phase."""
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.phases.append(Timing(name, time.perf_counter() - start, failed))
+
+    def mark_ready(self) -> None:
+        """Records that commands can be responded to, only the first call is recorded."""
+        if self.ready_after is None:
+            self.ready_after = time.perf_counter() - self.__started_at
+
+    def format(self, slowest: int = 10) -> str:
+        """Returns the report as text, listing only the slowest extensions."""
+        lines: list[str] = []
+        if self.ready_after is not None:
+            lines.append(f"Ready to respond to commands after {self.ready_after:.2f}s")
+
+        def add_section(title: str, timings: list[Timing], limit: int | None = None) -> None:
+            if not timings:
+                return
+            lines.append(f"{title}:")
+            for timing in sorted(timings, key=lambda t: t.duration, reverse=True)[:limit]:
+                lines.append(f"  {timing.name}: {timing.duration:.3f}s{' (failed)' if timing.failed else ''}")
+
+        add_section("Phases", self.phases)
+        add_section(f"Extensions, {len(self.extensions)} loaded in total", self.extensions, slowest)
+        add_section("Warm-ups", self.warmups)
+        return "\n".join(lines)
+
+async def load_extensions(
+    load: Callable[[str], Awaitable[None]],
+    extensions: list[str],
+    dependencies: dict[str, set[str]],
+    report: StartupReport,
+    *,
+    after: dict[str, set[str]] | None = None
+) -> None:
+    """Loads the extensions concurrently, each after the extensions it depends on.
+
+    Dependencies which are not in the extension list are ignored. Extensions whose dependencies
+    failed to load are not loaded either. Extensions are also loaded after the extensions listed
+    for them in after, regardless of whether those loaded."""
+    loaded: dict[str, asyncio.Future[bool]] = {
+        name: asyncio.get_running_loop().create_future() for name in extensions
+    }
+
+    async def load_one(name: str) -> None:
+        succeeded = False
+        try:
+            for predecessor in (after or {}).get(name, set()):
+                future = loaded.get(predecessor)
+                if future is not None:
+                    _ = await asyncio.shield(future)
+            for dependency in dependencies.get(name, set()):
+                future = loaded.get(dependency)
+                if future is not None and not await asyncio.shield(future):
+                    logger.error(f"Skipping {name} as {dependency} failed to load.")
+                    return
+            start = time.perf_counter()
+            try:
+                await load(name)
+                succeeded = True
+            except Exception:
+                logger.exception(f"Failed to load {name}.")
+            report.extensions.append(Timing(name, time.perf_counter() - start, not succeeded))
+        finally:
+            loaded[name].set_result(succeeded)
+
+    _ = await asyncio.gather(*(load_one(name) for name in extensions))
+
+Job = Callable[[], Awaitable[None]]
+
+class WarmupScheduler:
+    """This class runs expensive warm-up jobs in the background, in order of priority.
+
+    Jobs with a lower priority value run first. A job is not scheduled again while it is pending
+    or running. The jobs run one at a time by default, so that they do not compete with commands."""
+
+    def __init__(self, report: StartupReport, *, concurrency: int = 1) -> None:
+        super().__init__()
+        self.concurrency = concurrency
+        self.__report = report
+        self.__queue: asyncio.PriorityQueue[tuple[int, int, str, Job]] = asyncio.PriorityQueue()
+        self.__scheduled: set[str] = set()
+        self.__counter = itertools.count()
+        self.__workers: list[asyncio.Task[None]] = []
+
+    @property
+    def pending(self) -> set[str]:
+        """Returns the names of the jobs which are pending or running."""
+        return set(self.__scheduled)
+
+    def schedule(self, name: str, job: Job, *, priority: int = 0) -> bool:
+        """Schedules the job, returns false if it is already pending or running."""
+        if name in self.__scheduled:
+            return False
+        self.__scheduled.add(name)
+        # The counter keeps jobs of the same priority in order of scheduling
+        self.__queue.put_nowait((priority, next(self.__counter), name, job))
+        return True
+
+    def start(self) -> None:
+        """Starts running the scheduled jobs."""
+        if not self.__workers:
+            self.__workers = [asyncio.create_task(self.__run()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Stops running jobs, cancelling the running ones."""
+        for worker in self.__workers:
+            _ = worker.cancel()
+        _ = await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers = []
+
+    async def join(self) -> None:
+        """Waits until every scheduled job has finished."""
+        await self.__queue.join()
+
+    async def __run(self) -> None:
+        while True:
+            _, _, name, job = await self.__queue.get()
+            start = time.perf_counter()
+            failed = False
+            try:
+                await job()
+            except Exception:
+                failed = True
+                logger.exception(f"Warm-up {name} failed")
+            finally:
+                duration = time.perf_counter() - start
+                self.__scheduled.discard(name)
+                self.__queue.task_done()
+            self.__report.warmups.append(Timing(name, duration, failed))
+            logger.info(f"Warm-up {name} finished in {duration:.2f}s")
@@ -17,6 +17,12 @@ class ConfigDict(TypedDict):
     github_owner: str | None
     github_repo: str | None
     rabbitmq_url: str | None
+    gateway_recording_path: str | None
+    cluster_id: int
+    cluster_count: int
+    shard_count: int | None
+    shard_ids: list[int] | None
+    member_cache_policy: str
 
 class VersionInfo(NamedTuple):
     major: int
@@ -0,0 +1,123 @@
+import asyncio
+import datetime
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+
+from pidroid.utils.metrics import EVENT_LOOP_LAG
+
+logger = logging.getLogger("pidroid.utils.watchdog")
+
+@dataclass
+class LagIncident:
+    started_at: datetime.datetime
+    # How long the loop had been blocked when its stack was sampled
+    lag: float
+    # The innermost frame of the sampled stack, the likely culprit
+    frame: str
+    stack: str
+    # How long the loop was blocked in total, known once it recovers
+    duration: float | None = None
+
+class LoopWatchdog:
+    """This class implements an event loop watchdog.
+
+    A heartbeat on the event loop measures how late it is scheduled. A helper thread
+    checks the heartbeat and, if the loop has been blocked for longer than the threshold,
+    samples the stack of the event loop thread, which shows what is blocking it."""
+
+    def __init__(self, *, interval: float = 0.1, threshold: float = 0.5, max_incidents: int = 50) -> None:
+        super().__init__()
+        self.interval = interval
+        self.threshold = threshold
+        self.__incidents: deque[LagIncident] = deque(maxlen=max_incidents)
+        self.__lock = threading.Lock()
+        self.__last_beat = time.perf_counter()
+        self.__current: LagIncident | None = None
+        self.__loop_thread_id: int | None = None
+        self.__task: asyncio.Task[None] | None = None
+        self.__thread: threading.Thread | None = None
+        self.__stopped = threading.Event()
+
+    @property
+    def incidents(self) -> list[LagIncident]:
+        """Returns the recent lag incidents, oldest first."""
+        with self.__lock:
+            return list(self.__incidents)
+
+    def start(self) -> None:
+        """Starts watching the running event loop."""
+        if self.__task is not None:
+            return
+        self.__loop_thread_id = threading.get_ident()
+        self.__last_beat = time.perf_counter()
+        self.__stopped.clear()
+        self.__task = asyncio.create_task(self.__beat())
+        self.__thread = threading.Thread(target=self.__watch, name="pidroid-loop-watchdog", daemon=True)
+        self.__thread.start()
+
+    async def stop(self) -> None:
+        """Stops watching the event loop."""
+        self.__stopped.set()
+        if self.__task is not None:
+            _ = self.__task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+        if self.__thread is not None:
+            await asyncio.to_thread(self.__thread.join)
+            self.__thread = None
+
+    async def __beat(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            EVENT_LOOP_LAG.observe(lag)
+            with self.__lock:
+                self.__last_beat = now
+                incident = self.__current
+                self.__current = None
+            if incident is not None:
+                incident.duration = lag
+                logger.warning(f"Event loop was blocked for {lag:.3f} seconds in total at {incident.frame}")
+
+    def __watch(self) -> None:
+        while not self.__stopped.wait(self.interval):
+            with self.__lock:
+                if self.__current is not None:
+                    continue
+                # The heartbeat is expected once every interval
+                blocked_for = time.perf_counter() - self.__last_beat - self.interval
+                if blocked_for < self.threshold:
+                    continue
+                incident = self.__capture(blocked_for)
+                if incident is None:
+                    continue
+                self.__current = incident
+                self.__incidents.append(incident)
+            logger.warning(
+                f"Event loop has been blocked for {blocked_for:.3f} seconds at {incident.frame}\n{incident.stack}"
+            )
+
+    def __capture(self, lag: float) -> LagIncident | None:
+        assert self.__loop_thread_id is not None
+        frame = sys._current_frames().get(self.__loop_thread_id) # pyright: ignore[reportPrivateUsage]
+        if frame is None:
+            return None
+        summary = traceback.extract_stack(frame)
+        del frame
+        innermost = summary[-1]
+        return LagIncident(
+            started_at=datetime.datetime.now(tz=datetime.UTC) - datetime.timedelta(seconds=lag),
+            lag=lag,
+            frame=f"{innermost.filename}:{innermost.lineno} in {innermost.name}",
+            stack="".join(traceback.format_list(summary))
+        )
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import pytest
+import threading
+
+from pathlib import Path
+
+from pidroid.utils.assets import AssetCache, get_asset_key
+
+AVATAR_URL = "https://cdn.discordapp.com/avatars/1/abc.png?size=128"
+EMOJI_URL = "https://cdn.discordapp.com/emojis/2.png"
+
+def test_asset_cache(tmp_path: Path):
+    calls: list[str] = []
+
+    def create_fetch(url: str, payload: bytes):
+        async def fetch() -> bytes:
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return payload
+        return fetch
+
+    async def run():
+        cache = AssetCache(max_memory_size=4, path=str(tmp_path), max_disk_size=8)
+        # Concurrent downloads of the same asset are deduplicated
+        results = await asyncio.gather(*[cache.get_or_fetch(AVATAR_URL, create_fetch(AVATAR_URL, b"abcd")) for _ in range(3)])
+        assert results == [b"abcd"] * 3
+        assert (tmp_path / get_asset_key(AVATAR_URL)).read_bytes() == b"abcd"
+
+        # The avatar is evicted from memory, but is still served from disk
+        assert await cache.get_or_fetch(EMOJI_URL, create_fetch(EMOJI_URL, b"efgh")) == b"efgh"
+        assert cache.memory_size == 4
+        assert await cache.get_or_fetch(AVATAR_URL, create_fetch(AVATAR_URL, b"abcd")) == b"abcd"
+        assert calls == [AVATAR_URL, EMOJI_URL]
+
+        # The least recently used file is evicted from disk
+        assert await cache.get_or_fetch("third", create_fetch("third", b"ijkl")) == b"ijkl"
+        assert cache.disk_size == 8
+        assert not (tmp_path / get_asset_key(EMOJI_URL)).exists()
+
+    asyncio.run(run())
+
+    async def reload():
+        # The disk tier survives restarts
+        cache = AssetCache(path=str(tmp_path))
+        assert await cache.get(AVATAR_URL) == b"abcd"
+        assert await cache.get(EMOJI_URL) is None
+
+    asyncio.run(reload())
+
+def test_asset_cache_indexes_written_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    written = threading.Event()
+    replace = os.replace
+
+    def slow_replace(source: str, destination: str) -> None:
+        # Holds the write of the asset until the test lets it finish
+        assert written.wait(5)
+        replace(source, destination)
+
+    async def fetch() -> bytes:
+        return b"abcd"
+
+    async def run():
+        cache = AssetCache(path=str(tmp_path))
+        monkeypatch.setattr(os, "replace", slow_replace)
+        task = asyncio.create_task(cache.get_or_fetch(AVATAR_URL, fetch))
+        await asyncio.sleep(0.05)
+        # The asset is not read from disk before its file is written
+        cache.clear_memory()
+        assert await cache.get(AVATAR_URL) is None
+        assert cache.disk_size == 0
+
+        written.set()
+        assert await task == b"abcd"
+        monkeypatch.setattr(os, "replace", replace)
+        cache.clear_memory()
+        assert await cache.get(AVATAR_URL) == b"abcd"
+        assert cache.disk_size == 4
+
+    asyncio.run(run())
+
+    # Files of interrupted writes are not indexed
+    (tmp_path / f".{get_asset_key(EMOJI_URL)}.tmp").write_bytes(b"ef")
+
+    async def reload():
+        cache = AssetCache(path=str(tmp_path))
+        assert await cache.get(AVATAR_URL) == b"abcd"
+        assert cache.disk_size == 4
+
+    asyncio.run(reload())
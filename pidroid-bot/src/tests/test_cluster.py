@@ -0,0 +1,36 @@
+import pytest
+
+from pidroid.utils.cluster import ClusterInfo, get_shard_id, parse_shard_ids, split_shards
+
+def test_split_shards():
+    assert split_shards(4, 1) == [[0, 1, 2, 3]]
+    assert split_shards(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    ranges = split_shards(64, 6)
+    assert [shard_id for shard_ids in ranges for shard_id in shard_ids] == list(range(64))
+
+    with pytest.raises(ValueError):
+        _ = split_shards(2, 3)
+
+def test_parse_shard_ids():
+    assert parse_shard_ids(None) is None
+    assert parse_shard_ids("") is None
+    assert parse_shard_ids("4, 5,6") == [4, 5, 6]
+
+def test_guild_ownership():
+    guild_ids = [365478391719264276, 700465365435678840, 81384788765712384, 1 << 22, 0]
+    clusters = [
+        ClusterInfo(cluster_id, 3, tuple(shard_ids), 8)
+        for cluster_id, shard_ids in enumerate(split_shards(8, 3))
+    ]
+    for guild_id in guild_ids:
+        owners = [cluster for cluster in clusters if cluster.owns_guild(guild_id)]
+        # Every guild is owned by exactly one cluster, the one connecting its shard
+        assert len(owners) == 1
+        assert owners[0].shard_ids is not None and get_shard_id(guild_id, 8) in owners[0].shard_ids
+
+    # Work without a guild belongs to the primary cluster only
+    assert [cluster.cluster_id for cluster in clusters if cluster.owns_guild(None)] == [0]
+
+    # A single process owns everything
+    single = ClusterInfo()
+    assert single.owns_guild(guild_ids[0]) and single.owns_guild(None)
@@ -0,0 +1,123 @@
+import asyncio
+import discord
+import pytest
+
+from discord.ext import commands
+from types import SimpleNamespace
+from typing import Any
+
+from pidroid.models.command_index import CommandIndex
+from pidroid.utils import get_function_decorators
+
+@commands.group(name="tag", aliases=["tags"])
+async def tag_group(ctx: Any):
+    pass
+
+@tag_group.command(name="create", aliases=["add"])
+@commands.guild_only()
+@commands.bot_has_permissions(send_messages=True)
+async def tag_create(ctx: Any):
+    pass
+
+@commands.command(name="ping")
+@commands.cooldown(rate=1, per=1, type=commands.BucketType.user)
+async def ping(ctx: Any):
+    pass
+
+@commands.command(name="secret", hidden=True)
+async def secret(ctx: Any):
+    pass
+
+COMMANDS: list[Any] = [tag_group, tag_create, ping, secret]
+
+def test_get_function_decorators(capsys: pytest.CaptureFixture[str]):
+    decorators = get_function_decorators(tag_create.callback)
+    assert [decorator.func for decorator in decorators] == [
+        ["tag_group", "command"], ["commands", "guild_only"], ["commands", "bot_has_permissions"]
+    ]
+    assert decorators[2].keywords == [("send_messages", True)]
+    assert [decorator.is_a_check() for decorator in decorators] == [False, True, True]
+    # The parsing used to print debugging output
+    assert capsys.readouterr().out == ""
+
+def test_find_commands_by_path_alias_and_name():
+    index = CommandIndex(COMMANDS)
+    assert len(index) == 3
+    for query in ("tag create", "TAGS  add", "create", "add"):
+        found = index.find(query)
+        assert found is not None and found.command is tag_create
+    assert index.find("secret") is None
+    assert index.find("unknown") is None
+    assert index.suggest("tag creat") == ["tag create"]
+    assert index.suggest("png") == ["ping"]
+
+def test_requirements_are_parsed_once():
+    index = CommandIndex(COMMANDS)
+    found = index.find("tag create")
+    assert found is not None
+    assert found.requirements == ("Inside a server", "Bot permissions:\n - send_messages: True")
+    ping_command = index.find("ping")
+    assert ping_command is not None and ping_command.requirements == ()
+
+    rebuilt = CommandIndex(COMMANDS, previous=index)
+    rebuilt_found = rebuilt.find("tag create")
+    assert rebuilt_found is not None and rebuilt_found.requirements is found.requirements
+
+class FakeCommand:
+    name = "ping"
+    aliases: list[str] = []
+    parents: list[Any] = []
+    hidden = False
+    callback = ping.callback
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def can_run(self, ctx: Any) -> bool:
+        self.calls += 1
+        return True
+
+def test_can_run_is_cached():
+    async def run():
+        command = FakeCommand()
+        index = CommandIndex([command]) # pyright: ignore[reportArgumentType]
+        indexed = index.find("ping")
+        assert indexed is not None
+        channel = SimpleNamespace(id=10)
+        first = SimpleNamespace(author=SimpleNamespace(id=1), guild=None, channel=channel)
+        second = SimpleNamespace(author=SimpleNamespace(id=2), guild=None, channel=channel)
+        for ctx in (first, first, second):
+            assert await index.can_run(ctx, indexed) # pyright: ignore[reportArgumentType]
+        assert command.calls == 2
+
+    asyncio.run(run())
+
+def create_member(guild: discord.Guild, role_ids: list[int]) -> discord.Member:
+    data: Any = {
+        "user": {"id": "1", "username": "user", "discriminator": "0", "global_name": None, "avatar": None},
+        "roles": [str(role_id) for role_id in role_ids], "joined_at": None, "deaf": False, "mute": False, "flags": 0
+    }
+    return discord.Member(data=data, guild=guild, state=guild._state) # pyright: ignore[reportPrivateUsage]
+
+def test_can_run_is_cached_per_roles():
+    state = discord.Client(intents=discord.Intents.all())._connection # pyright: ignore[reportPrivateUsage]
+    role = {"name": "role", "color": 0, "hoist": False, "permissions": "0", "managed": False, "mentionable": False}
+    guild = state._add_guild_from_data({ # pyright: ignore[reportPrivateUsage, reportArgumentType]
+        "id": "100", "name": "guild", "owner_id": "2", "members": [], "channels": [],
+        "roles": [{**role, "id": "100", "position": 0}, {**role, "id": "101", "position": 1}, {**role, "id": "102", "position": 2}]
+    })
+    # Roles which grant no permissions change whether a command with a role check can be run
+    channel = SimpleNamespace(id=10, permissions_for=lambda member: discord.Permissions.none())
+
+    async def run():
+        command = FakeCommand()
+        index = CommandIndex([command]) # pyright: ignore[reportArgumentType]
+        indexed = index.find("ping")
+        assert indexed is not None
+        members = [create_member(guild, [101]), create_member(guild, [101]), create_member(guild, [101, 102])]
+        for member in members:
+            ctx = SimpleNamespace(author=member, guild=guild, channel=channel)
+            assert await index.can_run(ctx, indexed) # pyright: ignore[reportArgumentType]
+        assert command.calls == 2
+
+    asyncio.run(run())
@@ -0,0 +1,45 @@
+import asyncio
+import dbm
+
+from pathlib import Path
+
+from pidroid.utils.data import PersistentDataStore
+
+def test_data_store_persistence(tmp_path: Path):
+    path = str(tmp_path / "data.sqlite3")
+
+    async def write():
+        store = PersistentDataStore(path, legacy_path=None)
+        await store.load()
+        store.set("last_plugin_approval_time", "1700000000")
+        store.set("temporary", "value")
+        store.delete("temporary")
+        assert store.get("last_plugin_approval_time") == "1700000000"
+        assert store.get("temporary") is None
+        assert store.pending_writes == 2
+        await store.flush()
+        assert store.pending_writes == 0
+        await store.close()
+
+    async def read():
+        store = PersistentDataStore(path, legacy_path=None)
+        await store.load()
+        assert store.keys() == ["last_plugin_approval_time"]
+        assert store.get("last_plugin_approval_time") == "1700000000"
+        await store.close()
+
+    asyncio.run(write())
+    asyncio.run(read())
+
+def test_data_store_legacy_migration(tmp_path: Path):
+    legacy_path = str(tmp_path / "data.dbm")
+    with dbm.open(legacy_path, "c") as legacy_store:
+        legacy_store["last_plugin_statistic_month"] = "11"
+
+    async def run():
+        store = PersistentDataStore(str(tmp_path / "data.sqlite3"), legacy_path=legacy_path)
+        await store.load()
+        assert store.get("last_plugin_statistic_month") == "11"
+        await store.close()
+
+    asyncio.run(run())
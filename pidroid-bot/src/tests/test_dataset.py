@@ -0,0 +1,23 @@
+import random
+
+from pidroid.dataset import TABLE_LOADS, create_dataset, distribute
+
+def test_distribute():
+    sizes = distribute(100_000, 100, 1.1)
+    assert sizes == sorted(sizes, reverse=True)
+    # A few guilds hold most of the rows, while the long tail is tiny
+    assert sum(sizes[:5]) > sum(sizes) * 0.4
+    assert sizes[-1] < sizes[0] / 100
+    assert abs(sum(sizes) - 100_000) < 100
+
+def test_generated_rows():
+    dataset = create_dataset(0.001, 1.1, 0)
+    for load in TABLE_LOADS:
+        rows = list(load.rows(dataset, random.Random(0)))
+        assert rows, load.table
+        assert all(len(row) == len(load.columns) for row in rows), load.table
+
+    # Members of a guild are distinct users
+    for guild in dataset.guilds:
+        user_ids = {dataset.get_user_id(guild, member) for member in range(guild.members)}
+        assert len(user_ids) == guild.members
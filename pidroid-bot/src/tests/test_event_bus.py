@@ -0,0 +1,38 @@
+import asyncio
+import json
+
+from typing import Any
+
+from pidroid.services.event_bus import EventBus
+
+class FakeBroker:
+    def __init__(self) -> None:
+        self.batches: list[list[dict[str, Any]]] = []
+        self.fail = False
+
+    async def publish(self, message: bytes, **kwargs: Any) -> None:
+        if self.fail:
+            raise ConnectionError("Broker is unavailable")
+        self.batches.append(json.loads(message)["events"])
+
+def test_event_bus():
+    async def run():
+        broker = FakeBroker()
+        bus = EventBus(broker, batch_size=2, max_pending=3) # pyright: ignore[reportArgumentType]
+        for i in range(4):
+            bus.publish({"id": i})
+        # The oldest event is dropped once the buffer is full
+        assert bus.pending_events == 3
+        assert bus.dropped == 1
+
+        # A failed batch is put back in order
+        broker.fail = True
+        await bus.stop()
+        assert bus.pending_events == 3
+
+        broker.fail = False
+        await bus.stop()
+        assert broker.batches == [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+        assert bus.pending_events == 0
+
+    asyncio.run(run())
@@ -0,0 +1,71 @@
+import asyncio
+
+from pathlib import Path
+
+from pidroid.utils.file import ATTACHMENT_RESOURCES, AssetStore, get_resource
+
+def test_asset_store(tmp_path: Path):
+    _ = (tmp_path / "small.png").write_bytes(b"a" * 4)
+    _ = (tmp_path / "medium.png").write_bytes(b"b" * 6)
+    _ = (tmp_path / "large.mp4").write_bytes(b"c" * 16)
+
+    store = AssetStore(str(tmp_path), max_size=10)
+    store.preload()
+    assert store.get("small.png") == b"a" * 4
+    assert store.get("medium.png") == b"b" * 6
+    assert store.get("large.mp4") is None
+
+    # Resident resources are sent from memory
+    file = store.file("small.png")
+    assert file.filename == "small.png"
+    assert file.fp.read() == b"a" * 4
+
+    # Resources that do not fit are sent from disk
+    assert store.file("large.mp4").fp.read() == b"c" * 16
+
+    usage = {u.name: u for u in store.usage()}
+    assert usage["small.png"].memory_sends == 1
+    assert usage["large.mp4"].disk_sends == 1
+    assert not usage["large.mp4"].resident
+    assert store.size == 10
+
+def test_asset_store_loads_in_background(tmp_path: Path):
+    _ = (tmp_path / "small.png").write_bytes(b"a" * 4)
+    _ = (tmp_path / "medium.png").write_bytes(b"b" * 6)
+    _ = (tmp_path / "large.mp4").write_bytes(b"c" * 16)
+    _ = (tmp_path / "template.jpg").write_bytes(b"d" * 2)
+
+    store = AssetStore(str(tmp_path), max_size=10)
+    # Resources which are never sent are not loaded, but their sizes are known
+    store.preload(["small.png", "large.mp4"])
+    assert store.get("small.png") == b"a" * 4
+    assert store.get("template.jpg") is None
+    assert store.size == 4
+
+    async def run():
+        # A resource sent from disk is loaded in the background
+        assert store.file("medium.png").fp.read() == b"b" * 6
+        for _ in range(100):
+            if store.get("medium.png") is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert store.get("medium.png") == b"b" * 6
+        assert store.file("medium.png").fp.read() == b"b" * 6
+
+        # Resources larger than the budget are never read into memory
+        assert store.file("large.mp4").fp.read() == b"c" * 16
+        await asyncio.sleep(0.05)
+        assert store.get("large.mp4") is None
+
+    asyncio.run(run())
+    usage = {u.name: u for u in store.usage()}
+    assert usage["medium.png"].disk_sends == 1
+    assert usage["medium.png"].memory_sends == 1
+    assert usage["large.mp4"].size == 16
+    assert "template.jpg" not in usage
+    assert store.size == 10
+
+def test_attachment_resources_exist():
+    for name in ATTACHMENT_RESOURCES:
+        with open(get_resource(name), "rb"):
+            pass
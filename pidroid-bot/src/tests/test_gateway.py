@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+
+from typing import Any
+
+from pidroid.utils.gateway import GatewayRecorder, anonymize_content, anonymize_payload, hash_text, read_recording
+
+def test_anonymize_payload():
+    data = {
+        "id": "1",
+        "content": "hello there",
+        "author": {"id": "2", "username": "someone", "global_name": "Someone"},
+        "embeds": [{
+            "title": "secret", "fields": [{"name": "a", "value": "b"}],
+            "author": {"name": "writer", "url": "https://a.b"}, "footer": {"text": "footnote"}
+        }],
+        "attachments": [{"id": "4", "filename": "me.png", "url": "https://c.d/me.png", "proxy_url": "https://e.f/me.png"}],
+        "changes": [{"key": "nick", "old_value": "old", "new_value": "new"}, {"key": "$add", "new_value": [{"id": "5", "name": "role"}]}],
+        "mention_roles": [{"id": "3", "name": "role"}]
+    }
+    anonymized = anonymize_payload(data)
+    assert anonymized["id"] == "1"
+    assert anonymized["author"] == {"id": "2", "username": hash_text("someone"), "global_name": hash_text("Someone")}
+    assert anonymized["content"] == f"{hash_text('hello')} {hash_text('there')}"
+    assert anonymized["embeds"][0]["title"] == hash_text("secret")
+    assert anonymized["embeds"][0]["fields"] == [{"name": hash_text("a"), "value": hash_text("b")}]
+    assert anonymized["embeds"][0]["author"] == {"name": hash_text("writer"), "url": hash_text("https://a.b")}
+    assert anonymized["embeds"][0]["footer"] == {"text": hash_text("footnote")}
+    assert anonymized["attachments"] == [{
+        "id": "4", "filename": hash_text("me.png"),
+        "url": hash_text("https://c.d/me.png"), "proxy_url": hash_text("https://e.f/me.png")
+    }]
+    assert anonymized["changes"][0] == {"key": "nick", "old_value": hash_text("old"), "new_value": hash_text("new")}
+    # Changed values which are not text are anonymized like the rest of the payload
+    assert anonymized["changes"][1] == data["changes"][1]
+    # Names outside of embed fields are kept
+    assert anonymized["mention_roles"] == data["mention_roles"]
+    # The same text is always hashed the same way
+    assert anonymize_payload(data) == anonymized
+    # The original payload is left untouched
+    assert data["content"] == "hello there"
+
+def test_anonymize_content():
+    prefixes = ["P", "TT", "<@1> "]
+    # The prefix and the command name are kept, the arguments are hashed word by word
+    assert anonymize_content("Ptag  info secret", prefixes) == f"Ptag  {hash_text('info')} {hash_text('secret')}"
+    assert anonymize_content("TT help", prefixes) == "TT help"
+    assert anonymize_content("<@1> ping me", prefixes) == f"<@1> ping {hash_text('me')}"
+    # Messages which are not commands are hashed completely
+    assert anonymize_content("hello there", prefixes) == f"{hash_text('hello')} {hash_text('there')}"
+    assert anonymize_content("Ptag secret") == hash_text("Ptag") + " " + hash_text("secret")
+    assert anonymize_content("", prefixes) == ""
+
+def test_gateway_recorder():
+    parsed: list[tuple[str, Any]] = []
+    parsers = {
+        "READY": lambda data: parsed.append(("READY", data)),
+        "MESSAGE_CREATE": lambda data: parsed.append(("MESSAGE_CREATE", data)),
+        "TYPING_START": lambda data: parsed.append(("TYPING_START", data)),
+    }
+
+    async def run(path: str):
+        recorder = GatewayRecorder(path, flush_interval=0.01)
+        recorder.install(parsers)
+        recorder.start()
+        parsers["READY"]({"user": {"id": "1"}, "guilds": [{"id": "2"}]})
+        parsers["MESSAGE_CREATE"]({"id": "3", "content": "hi"})
+        parsers["TYPING_START"]({"channel_id": "4"})
+        await asyncio.sleep(0.05)
+        await recorder.close()
+        return recorder.recorded
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "recording.jsonl.gz")
+        assert asyncio.run(run(path)) == 2
+        events = list(read_recording(path))
+
+    # Parsers still receive the original payloads
+    assert [event for event, _ in parsed] == ["READY", "MESSAGE_CREATE", "TYPING_START"]
+    assert parsed[1][1]["content"] == "hi"
+
+    assert [event.type for event in events] == ["READY", "MESSAGE_CREATE"]
+    assert events[0].data == {"user": {"id": "1"}}
+    assert events[1].data == {"id": "3", "content": hash_text("hi")}
+    assert events[0].offset <= events[1].offset
+
+def test_gateway_recorder_keeps_commands():
+    parsers = {"MESSAGE_CREATE": lambda data: None}
+
+    def get_prefixes(guild_id: int | None) -> list[str]:
+        return ["!"] if guild_id == 2 else ["P"]
+
+    async def run(path: str):
+        recorder = GatewayRecorder(path, get_prefixes=get_prefixes, flush_interval=0.01)
+        recorder.install(parsers)
+        recorder.start()
+        parsers["MESSAGE_CREATE"]({"id": "1", "guild_id": "2", "content": "!tag info secret"})
+        parsers["MESSAGE_CREATE"]({"id": "3", "content": "Phelp tag"})
+        await recorder.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "recording.jsonl.gz")
+        asyncio.run(run(path))
+        contents = [event.data["content"] for event in read_recording(path)]
+
+    assert contents == [f"!tag {hash_text('info')} {hash_text('secret')}", f"Phelp {hash_text('tag')}"]
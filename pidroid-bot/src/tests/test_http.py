@@ -0,0 +1,199 @@
+import asyncio
+
+from aiohttp import ClientPayloadError
+from types import SimpleNamespace
+from typing import Any
+
+from pidroid.utils.cache import AsyncCache, SingleFlight, TTLCache, cached, get_caches
+from pidroid.utils.http import HTTP, CircuitBreaker, CircuitState, Route, get_backoff_delay
+
+def test_ttl_cache():
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1
+
+    # "b" is the least recently used entry now
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+    # Expired entries are not returned
+    cache.set("d", 4, ttl=0)
+    assert cache.get("d") is None
+
+def test_single_flight():
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def run():
+        flight: SingleFlight[str] = SingleFlight()
+        results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+        assert results == [42] * 5
+        assert len(flight) == 0
+
+    asyncio.run(run())
+    assert calls == 1
+
+def test_single_flight_cancelled_caller():
+    async def fetch() -> int:
+        await asyncio.sleep(0.02)
+        return 42
+
+    async def run():
+        flight: SingleFlight[str] = SingleFlight()
+        first = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0.005)
+        # Cancelling the caller which started the call does not cancel it for the others
+        _ = first.cancel()
+        assert await second == 42
+        assert first.cancelled()
+        assert len(flight) == 0
+
+    asyncio.run(run())
+
+def test_async_cache():
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def run():
+        cache: AsyncCache[str, int] = AsyncCache("test", ttl=60, stale_ttl=60)
+        assert await cache.get_or_fetch("key", fetch) == 1
+        assert await cache.get_or_fetch("key", fetch) == 1
+
+        # Stale values are returned while they are refreshed in the background
+        cache.ttl = 0
+        assert await cache.get_or_fetch("key", fetch) == 1
+        # Lets the background refresh finish
+        await asyncio.sleep(0.01)
+        cache.ttl = 60
+        assert await cache.get_or_fetch("key", fetch) == 2
+
+        cache.invalidate("key")
+        assert await cache.get_or_fetch("key", fetch) == 3
+        assert cache.statistics.hits == 2
+        assert cache.statistics.stale_hits == 1
+        assert cache.statistics.misses == 2
+
+    asyncio.run(run())
+
+def test_cached_decorator():
+    calls: list[str] = []
+
+    @cached("test_decorator", ttl=60, key=lambda client, query: query.lower())
+    async def lookup(client: object, query: str) -> str | None:
+        calls.append(query)
+        if query == "missing":
+            return None
+        return query.upper()
+
+    async def run():
+        assert await lookup(None, "Pidroid") == "PIDROID"
+        assert await lookup(None, "pidroid") == "PIDROID"
+        # None values are not cached
+        assert await lookup(None, "missing") is None
+        assert await lookup(None, "missing") is None
+
+    asyncio.run(run())
+    assert calls == ["Pidroid", "missing", "missing"]
+    assert get_caches()["test_decorator"] is lookup.cache
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    # After reset timeout, a single trial request is allowed
+    breaker.reset_timeout = 0
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+class FailingSession:
+    """Session whose requests fail with the specified exception, or wait until cancelled."""
+
+    def __init__(self, exception: BaseException | None) -> None:
+        super().__init__()
+        self.exception = exception
+
+    def request(self, *args: Any, **kwargs: Any) -> "FailingSession":
+        return self
+
+    async def __aenter__(self) -> None:
+        if self.exception is None:
+            await asyncio.sleep(60)
+        else:
+            raise self.exception
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+def open_half_way(http: HTTP) -> None:
+    breaker = http.circuit_breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.reset_timeout = 0
+    assert breaker.state == CircuitState.HALF_OPEN
+
+def test_circuit_breaker_failed_trial():
+    session = FailingSession(ClientPayloadError("Response payload is not completed"))
+    http = HTTP(SimpleNamespace(config={}, session=session), max_retries=0) # pyright: ignore[reportArgumentType]
+    open_half_way(http)
+
+    async def run():
+        try:
+            _ = await http.request("POST", Route("/test"))
+        except ClientPayloadError:
+            pass
+        else:
+            raise AssertionError("Request should have failed")
+
+    asyncio.run(run())
+    # The failed trial opens the circuit again instead of keeping it half open
+    http.circuit_breaker.reset_timeout = 60
+    assert http.circuit_breaker.state == CircuitState.OPEN
+
+def test_circuit_breaker_cancelled_trial():
+    http = HTTP(SimpleNamespace(config={}, session=FailingSession(None)), max_retries=0) # pyright: ignore[reportArgumentType]
+    open_half_way(http)
+
+    async def run():
+        task = asyncio.create_task(http.request("POST", Route("/test")))
+        await asyncio.sleep(0.01)
+        assert not http.circuit_breaker.allow_request()
+        _ = task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+    # Another trial request is let through after the cancelled one
+    assert http.circuit_breaker.state == CircuitState.HALF_OPEN
+    assert http.circuit_breaker.allow_request()
+
+def test_backoff_delay():
+    for attempt in range(10):
+        assert 0 <= get_backoff_delay(attempt, base=0.5, cap=4) <= min(4, 0.5 * 2 ** attempt)
+
+def test_route():
+    assert Route("/game/plugin/find").url == "https://ja.theotown.com/api/v3/game/plugin/find"
+    assert Route("/game/plugin/find", {"id": 5}).url == "https://ja.theotown.com/api/v3/game/plugin/find?id=5"
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+# Dependencies which every part of the bot needs. They are imported before the bot,
+# so that the time they take is the baseline which the import of the bot is compared to.
+# aiohttp goes first, as the others import it.
+BASELINE = ["aiohttp", "discord.ext.commands", "faststream.rabbit", "sqlalchemy.ext.asyncio"]
+
+# Time which importing the bot may take on top of the baseline, as a fraction of the baseline, measured by
+# python -X importtime. Both are measured in the same process, which evens out the speed of the machine.
+# The bot took 7 to 8% of the baseline when the budget was set.
+IMPORT_BUDGET = float(os.environ.get("PIDROID_IMPORT_BUDGET", 0.1))
+
+# The import is measured this many times and the fastest one is compared to the budget, which evens out noise
+IMPORT_RUNS = 3
+
+# Modules which use the deferred dependencies
+MODULES = [
+    "pidroid.main",
+    "pidroid.commands.bot",
+    "pidroid.commands.economy",
+    "pidroid.commands.image",
+    "pidroid.modules.github.api",
+    "pidroid.services.error_handler",
+    "pidroid.services.theotown.chat_translator",
+]
+
+# Dependencies which must only be imported once they are used
+DEFERRED = ["PIL", "alembic", "cryptography", "dill", "emoji", "jishaku", "jwt", "psutil"]
+
+def run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.join(os.path.dirname(__file__), "..")
+    )
+
+def get_cumulative_import_time(stderr: str, module: str) -> float:
+    """Returns the seconds it took to import the module, including its dependencies."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1_000_000
+    raise AssertionError(f"{module} was not imported")
+
+def test_heavy_dependencies_are_deferred():
+    script = f"import sys; {'; '.join(f'import {m}' for m in MODULES)}; print(','.join(sorted(sys.modules)))"
+    imported = set(run_python("-c", script).stdout.strip().split(","))
+    eager = [name for name in DEFERRED if name in imported]
+    assert not eager, f"{', '.join(eager)} should only be imported on first use"
+
+def test_import_time_budget():
+    script = f"import {', '.join(BASELINE)}; import pidroid.main"
+    # Compile the bytecode first, so that the first measured import is not slowed down by it
+    _ = run_python("-c", script)
+    fractions: list[float] = []
+    for _ in range(IMPORT_RUNS):
+        stderr = run_python("-X", "importtime", "-c", script).stderr
+        baseline = sum(get_cumulative_import_time(stderr, module) for module in BASELINE)
+        fractions.append(get_cumulative_import_time(stderr, "pidroid.main") / baseline)
+    fraction = min(fractions)
+    assert fraction <= IMPORT_BUDGET, (
+        f"Importing the bot took {fraction:.1%} of the time its baseline dependencies took, the budget is {IMPORT_BUDGET:.1%}"
+    )
@@ -0,0 +1,96 @@
+import asyncio
+
+from pidroid.utils.cache import AsyncCache
+from pidroid.utils.invalidation import CacheScope, Invalidation, InvalidationBus
+
+def test_invalidation_round_trip():
+    invalidation = Invalidation(CacheScope.translations, None, "Hello", 10, "origin")
+    assert Invalidation.from_dict(invalidation.to_dict()) == invalidation
+
+def test_bus_applies_duplicate_and_reordered_invalidations():
+    async def run():
+        bus = InvalidationBus()
+        applied: list[int] = []
+        bus.add_handler(lambda invalidation: applied.append(invalidation.version))
+
+        await bus.apply(Invalidation(CacheScope.tags, 1, None, 20, "other"))
+        # The same write, delivered twice
+        await bus.apply(Invalidation(CacheScope.tags, 1, None, 20, "other"))
+        # A write with an earlier version, which committed after the later one
+        await bus.apply(Invalidation(CacheScope.tags, 1, None, 10, "other"))
+        await bus.apply(Invalidation(CacheScope.tags, 2, None, 10, "other"))
+        await bus.invalidate(CacheScope.tags, 1, 30)
+
+        assert applied == [20, 20, 10, 10, 30]
+        # Other targets are counted separately
+        assert bus.get_generation((CacheScope.tags, 1, None)) == 4
+        assert bus.get_generation((CacheScope.tags, 2, None)) == 1
+        assert bus.get_generation((CacheScope.tags, 3, None)) == 0
+
+    asyncio.run(run())
+
+def test_bus_evicts_data_filled_after_a_later_version():
+    async def run():
+        bus = InvalidationBus()
+        cache: AsyncCache[int, str] = AsyncCache("test_invalidation_order", ttl=60)
+        bus.add_handler(lambda invalidation: cache.invalidate(invalidation.guild_id or 0))
+
+        await bus.apply(Invalidation(CacheScope.tags, 1, None, 20, "other"))
+
+        async def fetch_first() -> str:
+            return "first"
+        assert await cache.get_or_fetch(1, fetch_first) == "first"
+
+        # A write which does not conflict with the previous one may commit after it with an earlier version
+        await bus.apply(Invalidation(CacheScope.tags, 1, None, 10, "other"))
+
+        async def fetch_second() -> str:
+            return "second"
+        assert await cache.get_or_fetch(1, fetch_second) == "second"
+
+    asyncio.run(run())
+
+def test_bus_runs_async_handlers_and_survives_failures():
+    async def run():
+        bus = InvalidationBus()
+        evicted: list[int | None] = []
+
+        def failing(invalidation: Invalidation) -> None:
+            raise RuntimeError("handler failed")
+
+        async def evict(invalidation: Invalidation) -> None:
+            evicted.append(invalidation.guild_id)
+
+        bus.add_handler(failing)
+        bus.add_handler(evict)
+        await bus.invalidate(CacheScope.level_rewards, 5, 1)
+        assert evicted == [5]
+
+    asyncio.run(run())
+
+def test_cache_does_not_store_data_fetched_before_invalidation():
+    async def run():
+        cache: AsyncCache[int, str] = AsyncCache("test_invalidation", ttl=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def fetch_stale() -> str:
+            started.set()
+            _ = await release.wait()
+            return "stale"
+
+        task = asyncio.create_task(cache.get_or_fetch(1, fetch_stale))
+        _ = await started.wait()
+        # The data is written while it is being fetched
+        cache.invalidate(1)
+
+        async def fetch_fresh() -> str:
+            return "fresh"
+
+        # A read after the write must not wait for the fetch which started before it
+        assert await cache.get_or_fetch(1, fetch_fresh) == "fresh"
+        release.set()
+        assert await task == "stale"
+        assert await cache.get_or_fetch(1, fetch_stale) == "fresh"
+
+    asyncio.run(run())
@@ -0,0 +1,99 @@
+import asyncio
+
+from types import SimpleNamespace
+from typing import Any
+
+from pidroid.utils.leader import LeaderElection, singleton_job
+
+class FakeDatabase:
+    def __init__(self) -> None:
+        super().__init__()
+        self.locks: dict[int, "FakeConnection"] = {}
+
+class FakeResult:
+    def __init__(self, value: Any) -> None:
+        super().__init__()
+        self.value = value
+
+    def scalar(self) -> Any:
+        return self.value
+
+class FakeConnection:
+    """Holds advisory locks like a PostgreSQL session, until it is closed."""
+
+    def __init__(self, database: FakeDatabase) -> None:
+        super().__init__()
+        self.database = database
+        self.failing = False
+
+    async def execution_options(self, **options: Any) -> "FakeConnection":
+        return self
+
+    async def execute(self, statement: Any, parameters: dict[str, Any] | None = None) -> FakeResult:
+        if self.failing:
+            raise ConnectionError("The connection was lost")
+        if "pg_try_advisory_lock" in str(statement):
+            assert parameters is not None
+            holder = self.database.locks.setdefault(parameters["key"], self)
+            return FakeResult(holder is self)
+        return FakeResult(1)
+
+    async def invalidate(self) -> None:
+        self.database.locks = {key: holder for key, holder in self.database.locks.items() if holder is not self}
+
+    async def close(self) -> None:
+        await self.invalidate()
+
+def create_election(database: FakeDatabase, connections: list[FakeConnection]) -> LeaderElection:
+    async def connect() -> Any:
+        connection = FakeConnection(database)
+        connections.append(connection)
+        return connection
+    return LeaderElection(connect, 1, renew_interval=0.01, renew_timeout=0.05, retry_interval=0.01)
+
+def test_leader_election_failover():
+    async def run():
+        database = FakeDatabase()
+        first_connections: list[FakeConnection] = []
+        second_connections: list[FakeConnection] = []
+        first = create_election(database, first_connections)
+        second = create_election(database, second_connections)
+
+        first.start()
+        await asyncio.wait_for(first.wait_until_leader(), 1)
+        second.start()
+        await asyncio.sleep(0.05)
+        assert first.is_leader and not second.is_leader
+
+        # A stopped leader hands over to the follower
+        await first.stop()
+        await asyncio.wait_for(second.wait_until_leader(), 1)
+        first.start()
+
+        # A leader which cannot renew its lease steps down
+        second_connections[-1].failing = True
+        await asyncio.wait_for(first.wait_until_leader(), 1)
+        assert not second.is_leader
+        assert second.terms == 1 and first.terms == 2
+
+        await first.stop()
+        await second.stop()
+        assert database.locks == {}
+
+    asyncio.run(run())
+
+def test_singleton_job():
+    calls: list[int] = []
+
+    class Cog:
+        def __init__(self, is_leader: bool) -> None:
+            super().__init__()
+            self.client = SimpleNamespace(leader=SimpleNamespace(is_leader=is_leader))
+
+        @singleton_job
+        async def job(self, value: int) -> None:
+            calls.append(value)
+
+    asyncio.run(Cog(False).job(1))
+    asyncio.run(Cog(True).job(2))
+    assert calls == [2]
@@ -0,0 +1,72 @@
+import asyncio
+import tracemalloc
+
+from types import SimpleNamespace
+from typing import Any
+
+from pidroid.utils.members import MemberCachePolicy, MemberChunker
+from pidroid.utils.memory import MemoryTracer
+
+def test_memory_report_shows_growing_allocation_sites():
+    async def run():
+        tracer = MemoryTracer()
+        retained: list[bytes] = []
+
+        async def allocate() -> None:
+            # Wait for the tracer to take the first snapshot
+            await asyncio.sleep(0.5)
+            for _ in range(100):
+                retained.append(bytes(10_000))
+                await asyncio.sleep(0)
+            tracer.request_stop()
+
+        task = asyncio.create_task(allocate())
+        report = await tracer.run(10)
+        await task
+
+        assert not tracer.running
+        assert not tracemalloc.is_tracing()
+        assert report.duration < 10
+        assert report.growth >= 100 * 10_000
+        assert __file__ in report.to_text()
+
+    asyncio.run(run())
+
+class FakeGuild:
+    def __init__(self) -> None:
+        super().__init__()
+        self.id = 1
+        self.member_count = 3
+        self.members: list[Any] = []
+        self.chunks = 0
+
+    @property
+    def chunked(self) -> bool:
+        return len(self.members) == self.member_count
+
+    async def chunk(self, *, cache: bool = True) -> list[Any]:
+        self.chunks += 1
+        await asyncio.sleep(0.01)
+        self.members = [object()] * self.member_count
+        return self.members
+
+def test_member_chunker_chunks_once_on_demand():
+    async def run():
+        chunker = MemberChunker(MemberCachePolicy.lazy)
+        guild = FakeGuild()
+        _ = await asyncio.gather(*(chunker.ensure_chunked(guild) for _ in range(5))) # pyright: ignore[reportArgumentType]
+        await chunker.ensure_chunked(guild) # pyright: ignore[reportArgumentType]
+        assert guild.chunks == 1
+        assert chunker.get_statistics([guild]) == (1, 3, 3) # pyright: ignore[reportArgumentType]
+
+    asyncio.run(run())
+
+def test_member_cache_policy():
+    leveling = SimpleNamespace(xp_system_active=True, jail_role_id=None)
+    unused = SimpleNamespace(xp_system_active=False, jail_role_id=None)
+    configured = MemberChunker(MemberCachePolicy.configured)
+    assert not configured.chunk_at_startup
+    assert configured.should_chunk_after_startup(leveling) # pyright: ignore[reportArgumentType]
+    assert not configured.should_chunk_after_startup(unused) # pyright: ignore[reportArgumentType]
+    assert MemberChunker(MemberCachePolicy.all).chunk_at_startup
+    assert not MemberChunker(MemberCachePolicy.lazy).should_chunk_after_startup(leveling) # pyright: ignore[reportArgumentType]
@@ -0,0 +1,57 @@
+import pytest
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from pidroid.utils.api import _after_cursor_execute, _before_cursor_execute # pyright: ignore[reportPrivateUsage]
+from pidroid.utils.metrics import DATABASE_QUERY_LATENCY, Metric, MetricsRegistry
+
+def test_metrics_registry():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_requests", "Requests", ("route",))
+    gauge = registry.gauge("test_depth", "Depth")
+    histogram = registry.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    counter.inc(route="a")
+    counter.inc(2, route="a")
+    assert counter.get(route="a") == 3
+    with pytest.raises(ValueError):
+        counter.inc(route="a", other="b")
+
+    # Registering the same metric again returns the existing one
+    assert registry.counter("test_requests", "Requests", ("route",)) is counter
+    with pytest.raises(ValueError):
+        _ = registry.gauge("test_requests", "Requests")
+
+    registry.add_collector(lambda: gauge.set(5))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    metrics = {metric["name"]: metric for metric in registry.collect()}
+    assert metrics["test_requests"]["samples"] == [{"name": "test_requests_total", "labels": {"route": "a"}, "value": 3}]
+    assert metrics["test_depth"]["samples"][0]["value"] == 5
+    buckets = [
+        (sample["labels"].get("le"), sample["value"])
+        for sample in metrics["test_latency_seconds"]["samples"]
+    ]
+    assert buckets == [("0.1", 1), ("1.0", 2), ("+Inf", 3), (None, 5.55), (None, 3)]
+
+def test_metric_is_abstract():
+    with pytest.raises(TypeError):
+        _ = Metric("test_abstract", "Abstract") # pyright: ignore[reportAbstractUsage]
+
+def test_query_latency():
+    engine = create_engine("sqlite://")
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    before = DATABASE_QUERY_LATENCY.get_count(operation="SELECT")
+
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            _ = connection.execute(text("SELECT * FROM missing"))
+        _ = connection.execute(text("SELECT 1"))
+        # Failed statements leave nothing behind on the connection
+        assert connection.info == {}
+
+    assert DATABASE_QUERY_LATENCY.get_count(operation="SELECT") == before + 1
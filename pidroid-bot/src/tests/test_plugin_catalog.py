@@ -0,0 +1,107 @@
+import asyncio
+
+from typing import Any, override
+
+from pidroid.models.plugins import NewPlugin, Plugin
+from pidroid.modules.plugin_store.catalog import PluginCatalog, tokenize
+from pidroid.utils.api import API
+from pidroid.utils.http import APIResponse, Route
+
+def create_plugin_data(plugin_id: int, revision_id: int, name: str, author: str, description: str = "") -> dict[str, Any]:
+    return {
+        "plugin_id": plugin_id, "revision_id": revision_id, "version": 1,
+        "author_id": 1, "username": author,
+        "name": name, "description": description,
+        "price": 0, "demonetized": 0, "min_version": 0, "category": 0,
+        "submission_time": 0, "approval_time": 1,
+        "preview_file": "", "platforms": 7, "downloads": 10,
+    }
+
+def create_plugin(plugin_id: int, revision_id: int, name: str, author: str, description: str = "") -> NewPlugin:
+    return NewPlugin(create_plugin_data(plugin_id, revision_id, name, author, description))
+
+def create_catalog() -> PluginCatalog:
+    catalog = PluginCatalog()
+    catalog.load([
+        create_plugin(1, 1, "Indonesia transport pack", "Budi", "Buses and trains"),
+        create_plugin(2, 2, "Road pack", "Lobby", "More roads for your city"),
+        create_plugin(3, 3, "Railway stations", "Budi", "Stations [lt]Stotys"),
+    ])
+    return catalog
+
+def test_tokenize():
+    assert tokenize("Indonesia Transport-Pack v2") == ["indonesia", "transport", "pack", "v2"]
+
+def test_catalog_search():
+    catalog = create_catalog()
+    assert catalog.is_loaded
+    assert len(catalog) == 3
+
+    # Name matches rank above description matches
+    assert [p.plugin_id for p in catalog.search("road")] == [2]
+    assert [p.plugin_id for p in catalog.search("pack")] == [2, 1]
+
+    # Prefix, author and fuzzy matches
+    assert [p.plugin_id for p in catalog.search("indo")] == [1]
+    assert {p.plugin_id for p in catalog.search("budi")} == {1, 3}
+    assert [p.plugin_id for p in catalog.search("railwya")] == [3]
+
+    # Entries only keep what is needed to suggest the plugins
+    entry = catalog.get(3)
+    assert entry is not None and entry.name == "Railway stations" and entry.author == "Budi"
+
+    # Every query token must match
+    assert catalog.search("road stations") == []
+    assert catalog.search("") == []
+
+def test_catalog_update():
+    catalog = create_catalog()
+    catalog.update([create_plugin(2, 5, "Highway pack", "Lobby")])
+    assert catalog.search("road") == []
+    assert [p.plugin_id for p in catalog.search("highway")] == [2]
+
+    # Older revisions do not replace newer ones
+    catalog.update([create_plugin(2, 4, "Road pack", "Lobby")])
+    plugin = catalog.get(2)
+    assert plugin is not None and plugin.revision_id == 5
+
+    catalog.remove(2)
+    assert catalog.get(2) is None
+    assert catalog.search("highway") == []
+
+class FakeAPI(API):
+    """Stands in for the TheoTown API, which finds plugins by exact name matches only."""
+
+    def __init__(self, catalog: PluginCatalog, plugins: list[dict[str, Any]]) -> None:
+        self.plugin_catalog = catalog
+        self.plugins = plugins
+
+    @override
+    async def get(self, route: Route, *, timeout: float = 0, cache_ttl: float | None = None) -> APIResponse:
+        query: dict[str, Any] = route._query # pyright: ignore[reportPrivateUsage]
+        if "id" in query:
+            return APIResponse(200, [p for p in self.plugins if p["plugin_id"] == query["id"]]) # pyright: ignore[reportArgumentType]
+        return APIResponse(200, [p for p in self.plugins if query["query"] in p["name"].lower()]) # pyright: ignore[reportArgumentType]
+
+def test_search_plugins():
+    catalog = create_catalog()
+    api = FakeAPI(catalog, [
+        create_plugin_data(4, 4, "Transport pack extras", "Budi"),
+        create_plugin_data(1, 1, "Indonesia transport pack", "Budi", "Buses and trains"),
+        create_plugin_data(2, 2, "Road pack", "Lobby", "More roads for your city"),
+    ])
+
+    async def run():
+        # Plugins are fetched from the API, ranked by the catalog, and plugins it does not know are kept
+        plugins = await api.search_plugins("pack")
+        assert [p.plugin_id for p in plugins] == [2, 1, 4]
+        assert all(isinstance(p, Plugin) for p in plugins)
+
+        # Catalog matches the API does not find are fetched by their ID
+        assert [p.plugin_id for p in await api.search_plugins("indo")] == [1]
+
+        # Plugins which are no longer in the store are removed from the catalog
+        assert await api.search_plugins("railway") == []
+        assert catalog.get(3) is None
+
+    asyncio.run(run())
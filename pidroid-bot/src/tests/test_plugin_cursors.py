@@ -0,0 +1,52 @@
+import asyncio
+
+from types import SimpleNamespace
+
+from pidroid.modules.plugin_store.cursors import PluginStoreCursors
+
+class FakeAPI:
+    """Stands in for the database which is shared by every process."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.values: dict[str, str] = {}
+
+    async def fetch_shared_value(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def set_shared_value(self, key: str, value: str) -> None:
+        self.values[key] = value
+
+def create_cursors(api: FakeAPI, local_data: dict[str, str] | None = None) -> PluginStoreCursors:
+    client = SimpleNamespace(api=api, data_store=local_data or {})
+    return PluginStoreCursors(client) # pyright: ignore[reportArgumentType]
+
+def test_cursors_survive_failover():
+    api = FakeAPI()
+    leader = create_cursors(api)
+    follower = create_cursors(api)
+
+    async def run():
+        # The leader announces plugins up to 100, while the follower only keeps its catalog up to date
+        assert await leader.get("last_plugin_approval_time", shared=True) == -1
+        await leader.set("last_plugin_approval_time", 100, shared=True)
+        assert await follower.get("last_plugin_approval_time", shared=False) == -1
+        await follower.set("last_plugin_approval_time", 150, shared=False)
+
+        # The follower is promoted after the leader fails and continues from the cursor of the old leader,
+        # neither announcing the plugins up to 100 again nor skipping the ones after them
+        assert await follower.get("last_plugin_approval_time", shared=True) == 100
+        await follower.set("last_plugin_approval_time", 200, shared=True)
+        assert api.values["last_plugin_approval_time"] == "200"
+
+    asyncio.run(run())
+
+def test_cursors_fall_back_to_local_data_store():
+    api = FakeAPI()
+    cursors = create_cursors(api, {"last_plugin_revision_query_time": "42"})
+
+    async def run():
+        assert await cursors.get("last_plugin_revision_query_time", shared=True) == 42
+        assert await cursors.get("last_plugin_revision_query_time", shared=False) == -1
+
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+import asyncio
+
+from pidroid.utils.prefetch import PrefetchBuffer
+
+def test_prefetch_buffer():
+    calls: list[str] = []
+
+    async def fetch(key: str) -> str:
+        calls.append(key)
+        if key == "broken":
+            raise ValueError("Failed to fetch")
+        return f"{key}-{len(calls)}"
+
+    async def settle():
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    async def run():
+        buffer: PrefetchBuffer[str] = PrefetchBuffer("test", fetch, ["a", "b", "broken"], size=2, backoff_base=60)
+        # Nothing is buffered until the buffer is started
+        assert buffer.pop("a") is None
+
+        buffer.start()
+        await settle()
+        # Only requested keys are prefetched for, one result for every recent request
+        assert buffer.buffered("a") == 1
+        assert buffer.buffered("b") == 0
+        assert "b" not in calls
+
+        assert (await buffer.get("a")).startswith("a-")
+        await settle()
+        assert buffer.buffered("a") == 2
+
+        assert await buffer.get("b") == f"b-{len(calls)}"
+        await settle()
+        assert buffer.buffered("b") == 1
+
+        # Failing keys are backed off from instead of being retried in a loop
+        assert buffer.pop("broken") is None
+        await settle()
+        assert buffer.buffered("broken") == 0
+        assert calls.count("broken") == 1
+
+        # Keys which were not requested within the demand window are no longer refilled
+        buffer.demand_window = 0
+        assert buffer.target_size("a") == 0
+        await buffer.stop()
+
+    asyncio.run(run())
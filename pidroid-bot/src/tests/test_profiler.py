@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from pidroid.utils.profiler import SamplingProfiler
+
+def spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+async def busy_command(profiler: SamplingProfiler) -> None:
+    profiler.label_current_task("TestCog", "command:busy")
+    for _ in range(4):
+        spin(0.05)
+        await asyncio.sleep(0)
+
+def test_sampling_profiler():
+    async def run():
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.start()
+        await asyncio.create_task(busy_command(profiler))
+        result = profiler.stop()
+        assert not profiler.running
+
+        assert result.sample_count > 0
+        busy = sum(count for stack, count in result.samples.items() if stack.startswith("TestCog;command:busy;"))
+        assert busy > 0
+        assert any("busy_command;tests.test_profiler:spin" in stack for stack in result.samples)
+        line = result.to_collapsed().splitlines()[0]
+        assert line.rsplit(" ", 1)[1].isdigit()
+
+        # Profiling a single task ignores every other task
+        task = asyncio.create_task(busy_command(profiler))
+        profiler.start(only_task=task) # pyright: ignore[reportArgumentType]
+        await task
+        result = profiler.stop()
+        assert all(stack.startswith("TestCog;command:busy;") for stack in result.samples)
+
+    asyncio.run(run())
@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+
+from io import BytesIO
+from PIL import Image
+
+from pidroid.models.exceptions import RenderQueueFull
+from pidroid.utils.rendering import ImageRenderer, render_bonk, render_headpat, render_jpeg, render_memefy
+
+def create_image(size: tuple[int, int], format: str = "png") -> bytes:
+    output_stream = BytesIO()
+    Image.new("RGBA", size, (255, 0, 0, 255)).save(output_stream, format=format)
+    return output_stream.getvalue()
+
+def test_render_bonk():
+    avatar = create_image((128, 128))
+    with Image.open(BytesIO(render_bonk(avatar, avatar))) as image:
+        assert image.format == "JPEG"
+
+def test_render_headpat():
+    with Image.open(BytesIO(render_headpat(create_image((256, 256))))) as image:
+        assert image.format == "GIF"
+        assert image.size == (256, 356)
+        assert image.n_frames > 1
+
+def test_render_memefy():
+    image = create_image((512, 256))
+    with Image.open(BytesIO(render_memefy(image, False))) as rendered:
+        assert rendered.size == (128, 128)
+    with Image.open(BytesIO(render_memefy(image, True))) as rendered:
+        assert rendered.size == (128, 64)
+
+def test_render_jpeg():
+    with Image.open(BytesIO(render_jpeg(create_image((64, 64)), 1))) as image:
+        assert image.format == "JPEG"
+
+def test_renderer_queue_depth():
+    async def run():
+        renderer = ImageRenderer(max_queue_depth=0)
+        with pytest.raises(RenderQueueFull):
+            _ = await renderer.render(render_jpeg, create_image((64, 64)), 1)
+        renderer.stop()
+
+    asyncio.run(run())
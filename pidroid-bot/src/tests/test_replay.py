@@ -0,0 +1,56 @@
+import asyncio
+
+from discord.http import Route
+from types import SimpleNamespace
+
+from pidroid.replay import FakeDiscordHTTP, LatencySummary, get_cog_latencies
+from pidroid.utils.metrics import LISTENER_LATENCY
+
+def test_fake_discord_http():
+    client = SimpleNamespace(
+        http=SimpleNamespace(),
+        user=SimpleNamespace(id=1, name="Pidroid", discriminator="0")
+    )
+    rest = FakeDiscordHTTP(client) # pyright: ignore[reportArgumentType]
+    rest.install()
+
+    async def run():
+        send = Route("POST", "/channels/{channel_id}/messages", channel_id=2)
+        first = await client.http.request(send, json={"content": "hi"})
+        second = await client.http.request(send, json={"embeds": [{"title": "embed"}]})
+        reaction = await client.http.request(
+            Route("PUT", "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me", channel_id=2, message_id=3, emoji="a")
+        )
+        return first, second, reaction
+
+    first, second, reaction = asyncio.run(run())
+    # Sent messages are synthesized, every other request is answered with nothing
+    assert first["channel_id"] == "2" and first["content"] == "hi"
+    assert first["author"]["id"] == "1" and first["author"]["bot"]
+    assert second["content"] == "" and second["embeds"] == [{"title": "embed"}]
+    assert first["id"] != second["id"]
+    assert reaction is None
+    assert rest.requests == {
+        "POST /channels/{channel_id}/messages": 2,
+        "PUT /channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me": 1
+    }
+
+def test_latency_summary():
+    summary = LatencySummary(count=20, total=2.0)
+    summary.buckets.update({0.05: 10, 0.1: 18, 0.5: 19, float("inf"): 20})
+    assert summary.mean == 0.1
+    # 19 of the 20 samples took at most 0.5 seconds
+    assert summary.p95 == 0.5
+    assert LatencySummary().mean == 0.0
+
+def test_get_cog_latencies():
+    client = SimpleNamespace(get_command=lambda name: None)
+    LISTENER_LATENCY.observe(0.002, event="message", listener="ReplayTestService.on_message")
+    LISTENER_LATENCY.observe(0.004, event="message_edit", listener="ReplayTestService.on_message_edit")
+
+    latencies = get_cog_latencies(client) # pyright: ignore[reportArgumentType]
+    # Listeners are grouped by the cog they belong to
+    summary = latencies["ReplayTestService"]
+    assert summary.count == 2
+    assert abs(summary.mean - 0.003) < 1e-9
+    assert summary.p95 == 0.005
@@ -0,0 +1,90 @@
+import asyncio
+
+from pidroid.utils.startup import StartupReport, WarmupScheduler, load_extensions
+
+def test_load_extensions_respects_dependencies():
+    async def run():
+        report = StartupReport()
+        events: list[str] = []
+
+        async def load(name: str) -> None:
+            events.append(f"start {name}")
+            await asyncio.sleep(0.01)
+            if name == "broken":
+                raise RuntimeError("failed to load")
+            events.append(f"end {name}")
+
+        await load_extensions(
+            load,
+            ["a", "b", "broken", "last", "skipped"],
+            {"last": {"a", "b", "missing"}, "skipped": {"broken"}},
+            report
+        )
+
+        # Independent extensions are loaded at the same time
+        assert events[:3] == ["start a", "start b", "start broken"]
+        assert events.index("start last") > max(events.index("end a"), events.index("end b"))
+        assert "start skipped" not in events
+        failed = {timing.name for timing in report.extensions if timing.failed}
+        assert failed == {"broken"}
+        assert len(report.extensions) == 4
+
+    asyncio.run(run())
+
+def test_load_extensions_after_failed_extensions():
+    async def run():
+        report = StartupReport()
+        events: list[str] = []
+
+        async def load(name: str) -> None:
+            await asyncio.sleep(0.01)
+            if name == "broken":
+                raise RuntimeError("failed to load")
+            events.append(name)
+
+        await load_extensions(
+            load,
+            ["error_handler", "broken", "a", "b"],
+            {"a": {"broken"}},
+            report,
+            after={"error_handler": {"broken", "a", "b", "missing"}}
+        )
+
+        # The error handler is loaded last, even though some of the extensions before it failed or were skipped
+        assert events == ["b", "error_handler"]
+        assert {timing.name for timing in report.extensions if timing.failed} == {"broken"}
+
+    asyncio.run(run())
+
+def test_warmups_run_in_priority_order_once():
+    async def run():
+        report = StartupReport()
+        scheduler = WarmupScheduler(report)
+        order: list[str] = []
+
+        def job(name: str):
+            async def run_job() -> None:
+                order.append(name)
+            return run_job
+
+        assert scheduler.schedule("slow", job("slow"), priority=10)
+        assert scheduler.schedule("important", job("important"), priority=0)
+        assert not scheduler.schedule("slow", job("duplicate"), priority=0)
+        scheduler.start()
+        await asyncio.wait_for(scheduler.join(), 1)
+        await scheduler.stop()
+
+        assert order == ["important", "slow"]
+        assert [timing.name for timing in report.warmups] == ["important", "slow"]
+        assert not scheduler.pending
+
+    asyncio.run(run())
+
+def test_report_format():
+    report = StartupReport()
+    with report.phase("database"):
+        pass
+    report.mark_ready()
+    text = report.format()
+    assert text.startswith("Ready to respond to commands after")
+    assert "database" in text
@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+from pidroid.utils.watchdog import LoopWatchdog
+
+def block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+def test_loop_watchdog():
+    async def run():
+        watchdog = LoopWatchdog(interval=0.01, threshold=0.1)
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        assert watchdog.incidents == []
+
+        block_the_loop(0.4)
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+
+        incidents = watchdog.incidents
+        assert len(incidents) == 1
+        assert "block_the_loop" in incidents[0].frame
+        assert "test_loop_watchdog" in incidents[0].stack
+        assert incidents[0].duration is not None and incidents[0].duration >= 0.3
+
+    asyncio.run(run())